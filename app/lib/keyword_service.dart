@@ -1,5 +1,7 @@
 import 'package:shared_preferences/shared_preferences.dart';
 
+import 'topic_service.dart';
+
 class KeywordService {
   static const String _keywordsKeyPrefix = 'saved_keywords_';
 
@@ -92,7 +94,11 @@ class KeywordService {
       if (success) {
         // 저장 성공 확인
         final saved = prefs.getString(key);
-        return saved == keywordsString;
+        if (saved != keywordsString) return false;
+
+        // 키워드에 맞춰 알림 토픽 구독 변경
+        await TopicService.syncSubscriptions();
+        return true;
       }
       return false;
     } catch (e) {
@@ -106,7 +112,11 @@ class KeywordService {
     try {
       final prefs = await SharedPreferences.getInstance();
       final key = _getKeyForSource(source);
-      return await prefs.remove(key);
+      final success = await prefs.remove(key);
+      if (success) {
+        await TopicService.syncSubscriptions();
+      }
+      return success;
     } catch (e) {
       print('키워드 전체 삭제 오류: $e');
       return false;
@@ -4,6 +4,7 @@ import 'package:firebase_messaging/firebase_messaging.dart';
 import 'package:flutter_local_notifications/flutter_local_notifications.dart';
 import 'package:google_fonts/google_fonts.dart';
 import 'notice_list_page.dart';
+import 'topic_service.dart';
 
 // 로컬 알림 플러그인 초기화
 final FlutterLocalNotificationsPlugin flutterLocalNotificationsPlugin =
@@ -93,13 +94,8 @@ void main() async {
   if (settings.authorizationStatus == AuthorizationStatus.authorized) {
     print('✅ 알림 권한 허용됨');
 
-    // 'lh_notice' 토픽 구독
-    try {
-      await messaging.subscribeToTopic('lh_notice');
-      print('✅ lh_notice 토픽 구독 완료');
-    } catch (e) {
-      print('❌ 토픽 구독 실패: $e');
-    }
+    // 소스/키워드 토픽 구독 (키워드를 등록한 소스는 키워드 토픽만)
+    await TopicService.syncSubscriptions();
 
     // FCM 토큰 가져오기 (디버깅용)
     try {
@@ -110,8 +106,7 @@ void main() async {
     }
   } else if (settings.authorizationStatus == AuthorizationStatus.provisional) {
     print('⚠️ 알림 권한 임시 허용됨');
-    await messaging.subscribeToTopic('lh_notice');
-    print('✅ lh_notice 토픽 구독 완료 (임시 권한)');
+    await TopicService.syncSubscriptions();
   } else {
     print('❌ 알림 권한 거부됨: ${settings.authorizationStatus}');
   }
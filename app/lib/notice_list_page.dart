@@ -310,9 +310,11 @@ class _NoticeListPageState extends State<NoticeListPage> {
             ),
             // 공고 리스트
             Expanded(
-              child: StreamBuilder<QuerySnapshot>(
+              // 크롤러가 관리하는 소스별 피드 문서 하나만 구독 (최신 글이 정렬되어 있음)
+              child: StreamBuilder<DocumentSnapshot>(
                 stream: FirebaseFirestore.instance
-                    .collection('notices')
+                    .collection('feeds')
+                    .doc(widget.source)
                     .snapshots(),
                 builder: (context, snapshot) {
                   if (snapshot.connectionState == ConnectionState.waiting) {
@@ -331,7 +333,11 @@ class _NoticeListPageState extends State<NoticeListPage> {
                     );
                   }
 
-                  if (!snapshot.hasData || snapshot.data!.docs.isEmpty) {
+                  final feed = snapshot.data?.data() as Map<String, dynamic>?;
+                  final items = List<Map<String, dynamic>>.from(
+                      (feed?['items'] as List<dynamic>?) ?? []);
+
+                  if (items.isEmpty) {
                     return Center(
                       child: Text(
                         '등록된 공고가 없습니다.\n크롤러를 실행해주세요.',
@@ -345,33 +351,14 @@ class _NoticeListPageState extends State<NoticeListPage> {
                     );
                   }
 
-                  final docs = snapshot.data!.docs;
-
-                  // 소스 필터링 (클라이언트 측에서)
-                  final sourceFilteredDocs = docs.where((doc) {
-                    final data = doc.data() as Map<String, dynamic>;
-                    final source = data['source'] ?? 'LH';
-                    return source == widget.source;
-                  }).toList();
-
-                  // 날짜로 정렬 (클라이언트 측에서)
-                  sourceFilteredDocs.sort((a, b) {
-                    final dateA =
-                        (a.data() as Map<String, dynamic>)['date'] ?? '';
-                    final dateB =
-                        (b.data() as Map<String, dynamic>)['date'] ?? '';
-                    return dateB.compareTo(dateA); // 내림차순
-                  });
-
                   // 숨김 아이템 필터링
-                  final visibleDocs = sourceFilteredDocs.where((doc) {
-                    return !_hiddenItemIds.contains(doc.id);
+                  final visibleDocs = items.where((item) {
+                    return !_hiddenItemIds.contains(item['id']);
                   }).toList();
 
                   // 키워드 및 검색 필터링
-                  final filteredDocs = visibleDocs.where((doc) {
-                    final data = doc.data() as Map<String, dynamic>;
-                    final title = data['title'] ?? '';
+                  final filteredDocs = visibleDocs.where((item) {
+                    final title = item['title'] ?? '';
                     // return _matchesKeywords(title) && _matchesSearch(title);
                     return _matchesSearch(title);
                   }).toList();
@@ -421,8 +408,8 @@ class _NoticeListPageState extends State<NoticeListPage> {
                     ),
                     itemCount: filteredDocs.length,
                     itemBuilder: (context, index) {
-                      final doc = filteredDocs[index];
-                      final data = doc.data() as Map<String, dynamic>;
+                      final data = filteredDocs[index];
+                      final String docId = data['id'] ?? '';
                       final title = data['title'] ?? '제목 없음';
                       String date = data['date'] ?? '날짜 없음';
                       final link = data['link'] ?? '';
@@ -460,7 +447,7 @@ class _NoticeListPageState extends State<NoticeListPage> {
                       }
 
                       return Dismissible(
-                        key: Key(doc.id),
+                        key: Key(docId),
                         direction: DismissDirection.endToStart,
                         background: Container(
                           alignment: Alignment.centerRight,
@@ -476,7 +463,7 @@ class _NoticeListPageState extends State<NoticeListPage> {
                           ),
                         ),
                         onDismissed: (direction) {
-                          _hideItem(doc.id);
+                          _hideItem(docId);
                         },
                         child: Card(
                           elevation: 0,
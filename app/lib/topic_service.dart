@@ -0,0 +1,106 @@
+import 'dart:convert';
+
+import 'package:cloud_firestore/cloud_firestore.dart';
+import 'package:firebase_messaging/firebase_messaging.dart';
+import 'package:shared_preferences/shared_preferences.dart';
+
+import 'keyword_service.dart';
+
+// FCM 토픽 구독 관리
+// 키워드를 등록한 소스는 키워드 토픽만, 등록하지 않은 소스는 소스 전체 토픽을 구독합니다.
+// 토픽 이름 규칙은 크롤러(crawler/keyword_matcher.py)와 같아야 합니다.
+class TopicService {
+  static const String _subscribedTopicsKey = 'subscribed_topics';
+  static const String _legacyRemovedKey = 'legacy_topic_removed';
+  static const String _legacyTopic = 'lh_notice';
+  static const String _keywordCollection = 'keyword_topics';
+  static const List<String> sources = ['LH', 'KAMS', 'Seoul', 'SeoulPublicArt'];
+
+  static final RegExp _topicSafeChar = RegExp(r'[A-Za-z0-9\-_.~]');
+
+  // 소스의 모든 새 글 토픽
+  static String sourceTopic(String source) {
+    return 'notice_$source';
+  }
+
+  // 소스별 키워드 토픽 (키워드는 UTF-8 퍼센트 인코딩)
+  static String keywordTopic(String source, String keyword) {
+    final buffer = StringBuffer('kw_${source}_');
+    for (final byte in utf8.encode(keyword.trim())) {
+      final char = String.fromCharCode(byte);
+      if (byte < 128 && _topicSafeChar.hasMatch(char)) {
+        buffer.write(char);
+      } else {
+        buffer.write('%${byte.toRadixString(16).toUpperCase().padLeft(2, '0')}');
+      }
+    }
+    return buffer.toString();
+  }
+
+  // 저장된 키워드에 맞춰 토픽 구독/해지
+  static Future<void> syncSubscriptions() async {
+    try {
+      final prefs = await SharedPreferences.getInstance();
+      final messaging = FirebaseMessaging.instance;
+      final subscribed =
+          (prefs.getStringList(_subscribedTopicsKey) ?? []).toSet();
+
+      // 구독해야 할 토픽 (키워드 토픽은 크롤러에 등록할 소스/키워드도 함께)
+      final wanted = <String, Map<String, String>?>{};
+      for (final source in sources) {
+        final keywords = await KeywordService.getKeywords(source: source);
+        if (keywords.isEmpty) {
+          wanted[sourceTopic(source)] = null;
+        } else {
+          for (final keyword in keywords) {
+            wanted[keywordTopic(source, keyword)] = {
+              'source': source,
+              'keyword': keyword,
+            };
+          }
+        }
+      }
+
+      // 한 토픽씩 처리하고 바로 저장 (중간에 실패해도 구독자 수가 두 번 바뀌지 않도록)
+      for (final topic in wanted.keys.toSet().difference(subscribed)) {
+        await messaging.subscribeToTopic(topic);
+        final keyword = wanted[topic];
+        if (keyword != null) {
+          await _changeSubscribers(topic, 1, keyword);
+        }
+        subscribed.add(topic);
+        await prefs.setStringList(_subscribedTopicsKey, subscribed.toList());
+      }
+
+      for (final topic in subscribed.difference(wanted.keys.toSet())) {
+        await messaging.unsubscribeFromTopic(topic);
+        if (topic.startsWith('kw_')) {
+          await _changeSubscribers(topic, -1, null);
+        }
+        subscribed.remove(topic);
+        await prefs.setStringList(_subscribedTopicsKey, subscribed.toList());
+      }
+
+      // 이전 버전의 전체 알림 토픽은 한 번만 해지
+      if (!(prefs.getBool(_legacyRemovedKey) ?? false)) {
+        await messaging.unsubscribeFromTopic(_legacyTopic);
+        await prefs.setBool(_legacyRemovedKey, true);
+      }
+      print('✅ 토픽 구독 동기화 완료: ${subscribed.length}개');
+    } catch (e) {
+      print('❌ 토픽 구독 동기화 실패: $e');
+    }
+  }
+
+  // 크롤러가 읽는 키워드 목록의 구독자 수 변경
+  static Future<void> _changeSubscribers(
+      String topic, int delta, Map<String, String>? keyword) async {
+    await FirebaseFirestore.instance
+        .collection(_keywordCollection)
+        .doc(topic)
+        .set({
+      ...?keyword,
+      'subscribers': FieldValue.increment(delta),
+    }, SetOptions(merge: true));
+  }
+}
@@ -0,0 +1,71 @@
+import time
+
+import main
+
+# 행 수를 늘려가며 목록 추출 함수의 행당 처리 시간을 잽니다.
+# 행당 시간이 행 수와 관계없이 비슷하면 추출 비용이 선형(O(n))입니다.
+ROW_COUNTS = [100, 1000, 5000]
+REPEAT = 3
+
+def make_lh_page(n):
+    rows = []
+    for i in range(n):
+        list_no = 700000 + i
+        rows.append(
+            f"<tr><td>{list_no}</td><td class='tit'><a href='#none' "
+            f"onclick=\"goView3('{list_no}','/board.es?mid=a10601020000&bid=0034&act=view&list_no={list_no}&tag=&nPage=1');\">"
+            f"공모 안내 {list_no}</a></td><td>파일</td><td>2025.12.08</td><td>{i}</td></tr>"
+        )
+    return f"<html><body><table><tbody>{''.join(rows)}</tbody></table></body></html>"
+
+def make_kams_page(n):
+    rows = []
+    for i in range(n):
+        rows.append(
+            f"<tr><td>{i}</td><td><a href='event_view.aspx?idx={i}'>지원사업 공모 {i} [new]</a></td>"
+            f"<td>KAMS</td><td>2025-12-08 ~ 12-20</td><td>{i}</td></tr>"
+        )
+    return f"<html><body><table><tbody>{''.join(rows)}</tbody></table></body></html>"
+
+def make_seoul_page(n, duplicate_every=4):
+    # 썸네일 링크처럼 같은 글의 링크가 두 번 나오는 경우를 섞어 중복 제거 비용도 함께 측정
+    items = []
+    for i in range(n):
+        href = f"/culture/archives/{500000 + i}"
+        items.append(f"<li><a href='{href}'>공공미술 소식 {i} 안내드립니다</a><p>등록일 : 2025-12-08</p></li>")
+        if i % duplicate_every == 0:
+            items.append(f"<li><a href='{href}'>공공미술 소식 {i} 안내드립니다</a></li>")
+    return f"<html><body><ul>{''.join(items)}</ul></body></html>"
+
+# (소스 키, 페이지 생성 함수)
+CASES = [
+    ('LH', make_lh_page),
+    ('KAMS', make_kams_page),
+    ('Seoul', make_seoul_page),
+    ('SeoulPublicArt', make_seoul_page),
+]
+
+def bench_case(name, make_page):
+    print(f"\n[{name}] 파서: {main.HTML_PARSER}")
+    per_row = []
+    for n in ROW_COUNTS:
+        html = make_page(n)
+        best = None
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            results = main.parse_listing(name, html)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        us_per_row = best / n * 1e6
+        per_row.append(us_per_row)
+        print(f"  {n:>6}행: {best * 1000:8.1f}ms  행당 {us_per_row:7.1f}µs  (추출 {len(results)}건)")
+
+    # 가장 작은 페이지 대비 가장 큰 페이지의 행당 시간 비율 (1에 가까울수록 선형)
+    ratio = per_row[-1] / per_row[0]
+    print(f"  행당 시간 비율 ({ROW_COUNTS[-1]}행 / {ROW_COUNTS[0]}행): {ratio:.2f}")
+    return ratio
+
+if __name__ == "__main__":
+    print("=== 목록 추출 마이크로 벤치마크 ===")
+    for name, make_page in CASES:
+        bench_case(name, make_page)
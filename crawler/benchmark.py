@@ -0,0 +1,129 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+# 실제 크롤러 상태(seen 인덱스, 알림 대기열)를 건드리지 않도록 항상 임시 상태 폴더를 사용
+# (CRAWLER_STATE_DIR이 이미 설정된 CI/데몬 환경에서도 덮어씀, state_store를 import하기 전에 정해야 함)
+_STATE_DIR = tempfile.mkdtemp(prefix='crawler-bench-')
+os.environ['CRAWLER_STATE_DIR'] = _STATE_DIR
+os.environ['CRAWLER_SQLITE_PATH'] = os.path.join(_STATE_DIR, 'notices.sqlite3')
+os.environ['CRAWLER_METRICS_FILE'] = ''
+os.environ['CRAWLER_PROMETHEUS_FILE'] = ''
+
+import main
+import state_store
+from fakes import FakeFirestore, FakeMessaging
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# 소스 키 → 픽스처 파일
+FIXTURES = {
+    'LH': 'lh_list.html',
+    'KAMS': 'kams_list.html',
+    'Seoul': 'seoul_design_list.html',
+    'SeoulPublicArt': 'seoul_public_art_list.html',
+}
+
+def record_fixtures():
+    """실제 사이트의 목록 페이지를 내려받아 픽스처로 저장 (네트워크 필요)"""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for source, filename in FIXTURES.items():
+        url = main.SOURCES[source]['url']
+        response = main.http_get(url)
+        response.encoding = response.apparent_encoding or 'utf-8'
+        path = os.path.join(FIXTURE_DIR, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"💾 [{source}] {url} → {path} ({len(response.content):,} bytes)")
+
+def load_fixture(filename):
+    with open(os.path.join(FIXTURE_DIR, filename), encoding='utf-8') as f:
+        return f.read()
+
+def bench_parse(source, html, iterations):
+    """파싱 단계: 평균 시간, 초당 행 수, 메모리 할당량"""
+    results = main.parse_listing(source, html)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(iterations):
+        results = main.parse_listing(source, html)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    main.parse_listing(source, html)
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+
+    rows = len(results)
+    parse_ms = elapsed / iterations * 1000
+    rows_per_sec = rows * iterations / elapsed if elapsed else 0
+    print(f"  파싱: {parse_ms:7.2f}ms/페이지  {rows_per_sec:10,.0f}행/초  "
+          f"할당 최대 {peak / 1024:8.1f}KiB (블록 {blocks:,}개)  [{rows}행, {len(html):,}자]")
+    return results
+
+def bench_storage(source, results, db):
+    """저장 단계: 신규(cold) / 모두 중복(warm) 실행 시간과 Firestore RPC 수"""
+    state_store.seen_clear()
+    state_store.fingerprints_clear()
+    for label in ('신규', '중복'):
+        before = dict(db.rpc_counts)
+        start = time.perf_counter()
+        new_count = main.check_and_save_batch(db, results, source=source)
+        elapsed = (time.perf_counter() - start) * 1000
+        rpcs = {k: v - before.get(k, 0) for k, v in db.rpc_counts.items() if v - before.get(k, 0)}
+        print(f"  저장({label}): {elapsed:7.2f}ms  신규 {new_count}건  RPC {rpcs or '없음'}")
+
+def bench_notify(fake_messaging):
+    """알림 단계: 대기열 발송 시간과 send_each 호출 수"""
+    main.set_fcm_transport(fake_messaging)
+    try:
+        start = time.perf_counter()
+        sent, failed = main.flush_notifications()
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        main.set_fcm_transport(None)
+    print(f"\n[알림] {elapsed:.2f}ms  메시지 {sent}건 (실패 {failed})  send_each 호출 {fake_messaging.calls}회")
+
+def run(iterations, db_latency, fcm_latency):
+    print(f"=== 오프라인 벤치마크 (파서: {main.HTML_PARSER}, 반복 {iterations}회) ===")
+    db = FakeFirestore(latency=db_latency)
+    fake_messaging = FakeMessaging(latency=fcm_latency)
+    main.init_firebase = lambda: db
+
+    import contextlib
+    import io
+    for source, filename in FIXTURES.items():
+        print(f"\n[{source}] {filename}")
+        html = load_fixture(filename)
+        results = bench_parse(source, html, iterations)
+        # 저장 단계의 건별 로그는 숨김
+        with contextlib.redirect_stdout(io.StringIO()) as log:
+            bench_storage(source, results, db)
+        for line in log.getvalue().splitlines():
+            if line.startswith('  저장('):
+                print(line)
+
+    with contextlib.redirect_stdout(io.StringIO()) as log:
+        bench_notify(fake_messaging)
+    print(log.getvalue().splitlines()[-1])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='저장된 HTML 픽스처로 크롤러 단계별 성능 측정 (네트워크/Firebase 불필요)')
+    parser.add_argument('--iterations', type=int, default=50, help='파싱 반복 횟수')
+    parser.add_argument('--db-latency', type=float, default=0.0, help='가짜 Firestore RPC 지연(초)')
+    parser.add_argument('--fcm-latency', type=float, default=0.0, help='가짜 FCM send_each 지연(초)')
+    parser.add_argument('--record', action='store_true', help='실제 사이트에서 픽스처를 다시 내려받기')
+    args = parser.parse_args()
+
+    try:
+        if args.record:
+            record_fixtures()
+        else:
+            run(args.iterations, args.db_latency, args.fcm_latency)
+    finally:
+        state_store.close()
+        shutil.rmtree(_STATE_DIR, ignore_errors=True)
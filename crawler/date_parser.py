@@ -0,0 +1,69 @@
+"""게시판 날짜 문자열 정규화
+
+소스마다 날짜 칸 형식이 다릅니다.
+  LH:    '2025.12.08'
+  KAMS:  '2025-12-08', '2025-12-16 ~ 01-11' (끝 날짜는 연도 생략, 해를 넘길 수 있음)
+  서울시: '2025-12-08', '등록일 : 2025-12-08'
+  없음:  '날짜 없음', ''
+문자열 정렬 대신 쓸 수 있도록 시작/끝 날짜를 한국 시간 자정의 datetime으로 바꿉니다.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+# 연도가 있는 날짜 (YYYY.MM.DD, YYYY-MM-DD, YYYY/MM/DD, 구분자 뒤 공백 허용)
+FULL_DATE_RE = re.compile(r'(?<!\d)(\d{4})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})(?!\d)')
+# 두 자리 연도 (YY.MM.DD)
+SHORT_YEAR_DATE_RE = re.compile(r'(?<!\d)(\d{2})\.(\d{1,2})\.(\d{1,2})(?!\d)')
+# 기간의 끝 날짜 ('~' 뒤, 연도 생략 가능)
+RANGE_END_RE = re.compile(r'~\s*(?:(\d{4})\s*[.\-/]\s*)?(\d{1,2})\s*[.\-/]\s*(\d{1,2})(?!\d)')
+
+def _make_date(year, month, day):
+    try:
+        return datetime(int(year), int(month), int(day), tzinfo=KST)
+    except ValueError:
+        return None
+
+def parse_date_range(text):
+    """날짜 문자열 → (시작, 끝) datetime (한국 시간 자정). 알 수 없으면 (None, None)
+
+    기간이 아닌 날짜는 시작과 끝이 같습니다.
+    """
+    text = text or ''
+    match = FULL_DATE_RE.search(text)
+    if match:
+        start = _make_date(*match.groups())
+    else:
+        match = SHORT_YEAR_DATE_RE.search(text)
+        start = _make_date(2000 + int(match.group(1)), match.group(2), match.group(3)) if match else None
+    if start is None:
+        return None, None
+
+    end = start
+    end_match = RANGE_END_RE.search(text, match.end())
+    if end_match:
+        year, month, day = end_match.groups()
+        if year:
+            end = _make_date(year, month, day)
+        else:
+            # 연도가 생략되면 시작과 같은 해, 시작보다 앞서면 다음 해
+            end = _make_date(start.year, month, day)
+            if end is not None and end < start:
+                end = _make_date(start.year + 1, month, day)
+        if end is None or end < start:
+            end = start
+    return start, end
+
+def date_fields(text, fallback=None):
+    """Firestore에 함께 저장할 정규화 날짜 필드
+
+    date_at: 정렬용 날짜 (날짜를 알 수 없으면 fallback, 보통 수집 시각)
+    date_start / date_end: 게시/접수 기간 (알 수 없으면 None)
+    """
+    start, end = parse_date_range(text)
+    return {
+        'date_at': start or fallback,
+        'date_start': start,
+        'date_end': end,
+    }
@@ -0,0 +1,95 @@
+"""같은 글 판별용 지문 (정규화 URL, 제목 MinHash)
+
+doc ID는 md5(link)라서 링크 모양만 달라도 다른 글이 됩니다.
+  - LH: onclick 링크(…&tag=&nPage=1)와 list_no로 만든 대체 링크
+  - 서울시: 디자인 뉴스/공공미술 소식 카테고리에 같은 기사가 다른 글 번호로 다시 올라옴
+정규화 URL이 같거나, 다른 소스의 글과 제목이 거의 같고(문자 3-gram Jaccard 유사도) 제목 속 숫자가
+모두 같으면 같은 글로 봅니다. 제목 비교 후보는 MinHash LSH 밴드로 좁힙니다.
+LH 제목은 길고 블록/필지 번호만 다른 공고가 많아('…3블록…', '…4블록…') 유사도만으로는 구분되지 않습니다.
+"""
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 같은 글인데 값이 바뀌는 쿼리 파라미터 (페이지 번호, 검색어, 추적용)
+VOLATILE_PARAMS = {'npage', 'page', 'pageindex', 'tag', 'searchwrd', 'searchcnd', 'searchkeyword', 'fbclid'}
+VOLATILE_PREFIXES = ('utm_',)
+
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # 밴드당 4행 → 유사도 약 0.5 이상이면 후보로 잡힘 (최종 판단은 Jaccard로)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# 실행마다 같은 값이 나오도록 고정된 순열 계수
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f'a{i}'.encode(), digest_size=8).digest(), 'big') % _MERSENNE_PRIME | 1,
+        int.from_bytes(hashlib.blake2b(f'b{i}'.encode(), digest_size=8).digest(), 'big') % _MERSENNE_PRIME,
+    )
+    for i in range(MINHASH_PERMUTATIONS)
+]
+_TITLE_NOISE_RE = re.compile(r'[\W_]+')
+_DIGITS_RE = re.compile(r'\d+')
+# 앞머리 분류 태그 ('[공모]', '【안내】', '(재공고)' 등): 같은 글을 다른 게시판에 올리며 바뀌는 경우가 많음
+_TITLE_TAG_RE = re.compile(r'^(?:\s*[\[【<(（][^\]】>)）]{1,10}[\]】>)）])+')
+
+def canonical_url(link):
+    """비교용 정규화 URL (scheme/host 소문자, https 통일, 변동 파라미터/빈 값/fragment 제거, 파라미터 정렬)"""
+    parts = urlsplit(link.strip())
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+    params = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if value and key.lower() not in VOLATILE_PARAMS and not key.lower().startswith(VOLATILE_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(params), ''))
+
+def normalize_title(title):
+    """앞머리 분류 태그와 공백/문장부호를 뺀 소문자 제목"""
+    text = (title or '').casefold()
+    return _TITLE_NOISE_RE.sub('', _TITLE_TAG_RE.sub('', text) or text)
+
+def title_numbers(title):
+    """제목 속 숫자 목록 (블록/필지 번호, 차수, 연도 등. 다르면 제목이 비슷해도 다른 글)"""
+    return _DIGITS_RE.findall(normalize_title(title))
+
+def title_shingles(title):
+    """제목의 문자 3-gram 집합"""
+    text = normalize_title(title)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def minhash(shingles):
+    """shingle 집합의 MinHash 서명 (MINHASH_PERMUTATIONS개 정수)"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for shingle in shingles
+    ]
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+def lsh_bands(signature):
+    """MinHash 서명 → LSH 밴드 키 목록 (밴드 하나라도 같으면 비교 후보)"""
+    rows = len(signature) // LSH_BANDS
+    return [
+        f"{band}:" + hashlib.blake2b(
+            ','.join(map(str, signature[band * rows:(band + 1) * rows])).encode(), digest_size=8
+        ).hexdigest()
+        for band in range(LSH_BANDS)
+    ]
+
+def title_bands(title):
+    """제목 → (shingle 집합, LSH 밴드 키 목록)"""
+    shingles = title_shingles(title)
+    return shingles, (lsh_bands(minhash(shingles)) if shingles else [])
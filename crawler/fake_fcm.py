@@ -0,0 +1,142 @@
+"""로컬 HTTP 가짜 FCM (서버와 main.py용 클라이언트)
+
+실제 기기에 알림을 보내지 않고 네트워크를 거친 발송 경로(지연, 요청 실패, 메시지별 오류)를 재현합니다.
+
+  python fake_fcm.py --port 8089 --latency 0.05 --error-rate 0.1
+  CRAWLER_FCM_TRANSPORT=http://127.0.0.1:8089 python main.py
+
+POST /send_each  {"messages": [...]}
+  → 200 {"responses": [{"name": "..."} | {"error": {"status": "UNAVAILABLE", "message": "..."}}]}
+  → 503 {"error": {"status": "UNAVAILABLE", ...}}  (요청 전체 실패)
+GET /stats       받은 요청 수, 발송 건수, 오류 코드별 건수
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from fakes import FakeBatchResponse, FakeMessaging, FakeSendResponse, fcm_error
+
+def message_to_dict(message):
+    """messaging.Message → 가짜 서버로 보낼 JSON (대상, 알림 제목/본문, data)"""
+    notification = getattr(message, 'notification', None)
+    return {
+        'topic': getattr(message, 'topic', None),
+        'condition': getattr(message, 'condition', None),
+        'token': getattr(message, 'token', None),
+        'notification': {
+            'title': notification.title,
+            'body': notification.body,
+        } if notification else None,
+        'data': getattr(message, 'data', None),
+    }
+
+class HttpMessaging:
+    """가짜 FCM 서버로 보내는 messaging 호환 클라이언트 (send_each, send)"""
+
+    def __init__(self, url, timeout=30):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def send_each(self, messages, dry_run=False):
+        try:
+            response = self._session.post(
+                f'{self.url}/send_each',
+                json={'messages': [message_to_dict(m) for m in messages], 'dry_run': dry_run},
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            raise fcm_error('UNAVAILABLE', f'가짜 FCM 서버 연결 실패: {e}')
+        body = response.json() if response.content else {}
+        if response.status_code != 200:
+            error = body.get('error', {})
+            raise fcm_error(error.get('status', 'UNKNOWN'), error.get('message', f'HTTP {response.status_code}'))
+
+        results = []
+        for result in body.get('responses', []):
+            if 'error' in result:
+                results.append(FakeSendResponse(exception=fcm_error(result['error']['status'], result['error']['message'])))
+            else:
+                results.append(FakeSendResponse(message_id=result['name']))
+        return FakeBatchResponse(results)
+
+    def send(self, message, dry_run=False):
+        response = self.send_each([message], dry_run).responses[0]
+        if not response.success:
+            raise response.exception
+        return response.message_id
+
+# --- 서버 ---
+
+def make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, body):
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            if self.path != '/send_each':
+                return self._reply(404, {'error': {'status': 'NOT_FOUND', 'message': self.path}})
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            try:
+                batch = fake.send_each(request.get('messages', []), request.get('dry_run', False))
+            except ValueError as e:
+                return self._reply(400, {'error': {'status': 'INVALID_ARGUMENT', 'message': str(e)}})
+            except Exception as e:
+                return self._reply(503, {'error': {'status': getattr(e, 'code', 'UNAVAILABLE'), 'message': str(e)}})
+            self._reply(200, {'responses': [
+                {'name': r.message_id} if r.success
+                else {'error': {'status': r.exception.code, 'message': str(r.exception)}}
+                for r in batch.responses
+            ]})
+
+        def do_GET(self):
+            if self.path != '/stats':
+                return self._reply(404, {'error': {'status': 'NOT_FOUND', 'message': self.path}})
+            self._reply(200, {'calls': fake.calls, 'sent': len(fake.sent), 'errors': fake.errors})
+
+        def log_message(self, format, *args):
+            pass  # 요청마다 로그를 찍지 않음
+
+    return Handler
+
+def start_server(fake=None, host='127.0.0.1', port=0):
+    """가짜 FCM 서버를 백그라운드 스레드로 시작 → (server, url). port=0이면 빈 포트 사용"""
+    fake = fake or FakeMessaging()
+    server = ThreadingHTTPServer((host, port), make_handler(fake))
+    server.daemon_threads = True
+    server.fake = fake
+    threading.Thread(target=server.serve_forever, name='fake-fcm', daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='로컬 HTTP 가짜 FCM 서버 (지연/오류 주입)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.0, help='send_each 요청마다 지연(초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='지연에 더할 무작위 시간 최대값(초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='메시지별 일시적 오류 비율')
+    parser.add_argument('--fatal-rate', type=float, default=0.0, help='메시지별 영구 오류 비율')
+    parser.add_argument('--request-error-rate', type=float, default=0.0, help='요청 전체 실패 비율')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    fake = FakeMessaging(args.latency, args.jitter, args.error_rate, args.fatal_rate, args.request_error_rate, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(fake))
+    server.daemon_threads = True
+    print(f"📡 가짜 FCM 서버: http://{args.host}:{args.port} (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"=== 받은 요청 {fake.calls}회, 발송 {len(fake.sent)}건, 오류 {fake.errors} ===")
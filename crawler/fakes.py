@@ -0,0 +1,326 @@
+"""오프라인 벤치마크/점검용 가짜 Firestore, FCM
+
+실제 Firebase 프로젝트 없이 check_and_save_batch, flush_notifications, maintenance.py를 실행할 수 있도록
+main.py가 사용하는 최소한의 API만 흉내 냅니다. 호출 횟수(RPC 수)를 함께 셉니다.
+"""
+import random
+import threading
+import time
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data, reference=None, update_time=None):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+        self.reference = reference
+        self.update_time = update_time
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+class FakeDocumentRef:
+    def __init__(self, db, collection, doc_id):
+        self._db = db
+        self._collection = collection
+        self.id = doc_id
+
+    def get(self):
+        self._db.count('get')
+        return self._db.read(self._collection, self.id)
+
+    def set(self, data, merge=False):
+        self._db.count('set')
+        self._db.write(self._collection, self.id, data, merge)
+
+    def delete(self):
+        self._db.count('delete')
+        self._db.remove(self._collection, self.id)
+
+class FakeCollection:
+    def __init__(self, db, name):
+        self._db = db
+        self._name = name
+
+    def document(self, doc_id):
+        return FakeDocumentRef(self._db, self._name, doc_id)
+
+    def stream(self):
+        self._db.count('stream')
+        for doc_id, data in list(self._db.collections.get(self._name, {}).items()):
+            yield FakeSnapshot(doc_id, data, self.document(doc_id))
+
+    def select(self, field_paths):
+        return self
+
+class FakeQuery(FakeCollection):
+    """문서 ID 순서로 [start, end) 구간만 읽는 쿼리 (파티션 쿼리용)"""
+
+    def __init__(self, db, name, start=None, end=None):
+        super().__init__(db, name)
+        self._start = start
+        self._end = end
+
+    def stream(self):
+        self._db.count('stream')
+        for doc_id, data in sorted(self._db.collections.get(self._name, {}).items()):
+            if (self._start is None or doc_id >= self._start) and (self._end is None or doc_id < self._end):
+                yield FakeSnapshot(doc_id, data, self.document(doc_id))
+
+class FakePartition:
+    def __init__(self, db, name, start, end):
+        self._args = (db, name, start, end)
+
+    def query(self):
+        return FakeQuery(*self._args)
+
+class FakeCollectionGroup:
+    def __init__(self, db, name):
+        self._db = db
+        self._name = name
+
+    def get_partitions(self, partition_count):
+        self._db.count('partition_query')
+        doc_ids = sorted(self._db.collections.get(self._name, {}))
+        size = max(1, -(-len(doc_ids) // partition_count))
+        cursors = doc_ids[size::size]
+        bounds = [None] + cursors + [None]
+        for start, end in zip(bounds, bounds[1:]):
+            yield FakePartition(self._db, self._name, start, end)
+
+class FakeWriteOption:
+    def __init__(self, last_update_time=None):
+        self.last_update_time = last_update_time
+
+class FakeWriteBatch:
+    """쓰기를 모았다가 한 번에 반영 (조건이 하나라도 맞지 않으면 아무것도 쓰지 않음)"""
+
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, ref, data, merge=False):
+        self._writes.append((ref, data, merge, None))
+
+    def create(self, ref, data):
+        self._writes.append((ref, data, False, 'create'))
+
+    def update(self, ref, data, option=None):
+        self._writes.append((ref, data, True, option or 'exists'))
+
+    def commit(self):
+        self._db.count('commit')
+        self._db.sleep()
+        self._db.apply(self._writes)
+
+class FakeBulkWriter:
+    """BulkWriter 대신 쓰기를 바로 반영 (쓰기 500건마다 RPC 1회로 셈)"""
+
+    def __init__(self, db):
+        self._db = db
+        self._pending = 0
+        self._success_callback = None
+
+    def _write(self, ref):
+        self._pending += 1
+        if self._pending >= 500:
+            self.flush()
+        if self._success_callback:
+            self._success_callback(ref, None, self)
+
+    def set(self, ref, data, merge=False):
+        self._db.write(ref._collection, ref.id, data, merge)
+        self._write(ref)
+
+    def delete(self, ref):
+        self._db.remove(ref._collection, ref.id)
+        self._write(ref)
+
+    def on_write_result(self, callback):
+        self._success_callback = callback
+
+    def on_write_error(self, callback):
+        pass
+
+    def flush(self):
+        if self._pending:
+            self._db.count('batch_write')
+            self._db.sleep()
+            self._pending = 0
+
+    def close(self):
+        self.flush()
+
+class FakeFirestore:
+    """메모리 Firestore (latency: RPC 한 번마다 더할 지연 시간, 초)"""
+
+    def __init__(self, latency=0.0):
+        self.collections = {}
+        self.rpc_counts = {}
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._update_times = {}  # (컬렉션, 문서 ID) → 마지막으로 쓴 순번
+        self._version = 0
+
+    def count(self, name):
+        with self._lock:
+            self.rpc_counts[name] = self.rpc_counts.get(name, 0) + 1
+
+    def sleep(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def read(self, collection, doc_id):
+        with self._lock:
+            return FakeSnapshot(doc_id, self.collections.get(collection, {}).get(doc_id),
+                                update_time=self._update_times.get((collection, doc_id)))
+
+    def write(self, collection, doc_id, data, merge=False):
+        with self._lock:
+            self._write(collection, doc_id, data, merge)
+
+    def _write(self, collection, doc_id, data, merge):
+        docs = self.collections.setdefault(collection, {})
+        if merge and doc_id in docs:
+            docs[doc_id].update(data)
+        else:
+            docs[doc_id] = dict(data)
+        self._version += 1
+        self._update_times[(collection, doc_id)] = self._version
+
+    def apply(self, writes):
+        """batch 쓰기 반영 (create: 없어야 함, update: 있어야 하고 조건의 update_time과 같아야 함)"""
+        from google.api_core import exceptions
+
+        with self._lock:
+            for ref, _, _, condition in writes:
+                key = (ref._collection, ref.id)
+                exists = ref.id in self.collections.get(ref._collection, {})
+                if condition == 'create' and exists:
+                    raise exceptions.AlreadyExists(f"이미 있는 문서: {ref._collection}/{ref.id}")
+                if condition == 'exists' and not exists:
+                    raise exceptions.NotFound(f"없는 문서: {ref._collection}/{ref.id}")
+                if isinstance(condition, FakeWriteOption) and (
+                        not exists or self._update_times.get(key) != condition.last_update_time):
+                    raise exceptions.FailedPrecondition(f"update_time 불일치: {ref._collection}/{ref.id}")
+            for ref, data, merge, _ in writes:
+                self._write(ref._collection, ref.id, data, merge)
+
+    def remove(self, collection, doc_id):
+        with self._lock:
+            self.collections.get(collection, {}).pop(doc_id, None)
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def collection_group(self, name):
+        return FakeCollectionGroup(self, name)
+
+    def bulk_writer(self):
+        return FakeBulkWriter(self)
+
+    def get_all(self, refs, field_paths=None):
+        self.count('get_all')
+        self.sleep()
+        return [self.read(ref._collection, ref.id) for ref in refs]
+
+    def batch(self):
+        return FakeWriteBatch(self)
+
+    def write_option(self, last_update_time=None):
+        return FakeWriteOption(last_update_time)
+
+class FakeSendResponse:
+    def __init__(self, message_id=None, exception=None):
+        self.message_id = message_id
+        self.exception = exception
+        self.success = exception is None
+
+class FakeBatchResponse:
+    def __init__(self, responses):
+        self.responses = responses
+        self.success_count = sum(1 for r in responses if r.success)
+        self.failure_count = len(responses) - self.success_count
+
+FCM_SEND_EACH_LIMIT = 500  # 실제 send_each와 같이 한 번에 500건을 넘으면 거부
+
+def fcm_error(code, message):
+    """FCM 오류 코드('UNAVAILABLE' 등) → firebase_admin 예외"""
+    from firebase_admin import exceptions
+
+    error_classes = {
+        'INVALID_ARGUMENT': exceptions.InvalidArgumentError,
+        'NOT_FOUND': exceptions.NotFoundError,
+        'PERMISSION_DENIED': exceptions.PermissionDeniedError,
+        'UNAUTHENTICATED': exceptions.UnauthenticatedError,
+        'RESOURCE_EXHAUSTED': exceptions.ResourceExhaustedError,
+        'DEADLINE_EXCEEDED': exceptions.DeadlineExceededError,
+        'INTERNAL': exceptions.InternalError,
+        'UNAVAILABLE': exceptions.UnavailableError,
+    }
+    return error_classes.get(code, exceptions.UnknownError)(message)
+
+class FakeMessaging:
+    """messaging.send_each/send를 대신하는 가짜 FCM (보낸 메시지를 메모리에 보관)
+
+    지연과 오류를 주입할 수 있습니다.
+      latency, jitter       send_each 호출마다 latency + 0~jitter초 대기
+      error_rate            메시지별 일시적 오류(UNAVAILABLE) 비율 → 재시도 대상
+      fatal_rate            메시지별 영구 오류(INVALID_ARGUMENT) 비율 → 재시도하지 않음
+      request_error_rate    send_each 요청 전체가 실패(UNAVAILABLE 예외)하는 비율
+    여러 스레드에서 동시에 호출해도 됩니다.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, fatal_rate=0.0, request_error_rate=0.0, seed=None):
+        self.sent = []
+        self.calls = 0
+        self.batch_sizes = []
+        self.errors = {}  # 오류 코드 → 건수
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.fatal_rate = fatal_rate
+        self.request_error_rate = request_error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _count_error(self, code):
+        self.errors[code] = self.errors.get(code, 0) + 1
+
+    def send_each(self, messages, dry_run=False):
+        messages = list(messages)
+        if len(messages) > FCM_SEND_EACH_LIMIT:
+            raise ValueError(f"send_each에는 최대 {FCM_SEND_EACH_LIMIT}건까지 보낼 수 있습니다: {len(messages)}건")
+        with self._lock:
+            self.calls += 1
+            self.batch_sizes.append(len(messages))
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            request_failed = self._random.random() < self.request_error_rate
+        if delay:
+            time.sleep(delay)
+        if request_failed:
+            with self._lock:
+                self._count_error('REQUEST_UNAVAILABLE')
+            raise fcm_error('UNAVAILABLE', '가짜 FCM: 요청 실패')
+
+        responses = []
+        with self._lock:
+            for message in messages:
+                roll = self._random.random()
+                if roll < self.error_rate:
+                    self._count_error('UNAVAILABLE')
+                    responses.append(FakeSendResponse(exception=fcm_error('UNAVAILABLE', '가짜 FCM: 일시적 오류')))
+                elif roll < self.error_rate + self.fatal_rate:
+                    self._count_error('INVALID_ARGUMENT')
+                    responses.append(FakeSendResponse(exception=fcm_error('INVALID_ARGUMENT', '가짜 FCM: 잘못된 메시지')))
+                else:
+                    responses.append(FakeSendResponse(message_id=f"fake-{len(self.sent)}"))
+                    if not dry_run:
+                        self.sent.append(message)
+        return FakeBatchResponse(responses)
+
+    def send(self, message, dry_run=False):
+        """메시지 한 건 발송 (실패하면 예외)"""
+        response = self.send_each([message], dry_run).responses[0]
+        if not response.success:
+            raise response.exception
+        return response.message_id
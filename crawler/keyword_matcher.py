@@ -0,0 +1,79 @@
+"""여러 키워드를 제목에서 한 번에 찾는 매처 (Aho-Corasick)
+
+키워드 수와 관계없이 제목 길이에 비례하는 시간으로 일치하는 키워드를 모두 찾습니다.
+대소문자는 구분하지 않습니다.
+"""
+from collections import deque
+from urllib.parse import quote
+
+def normalize_keyword(keyword):
+    """비교용 키워드/제목 정규화 (앞뒤 공백 제거, 대소문자 무시)"""
+    return keyword.strip().casefold()
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        # 상태 0이 루트. goto[state]: 문자 → 다음 상태
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]  # 상태에서 끝나는 키워드 목록 (실패 링크로 이어진 것 포함)
+        self.keywords = []
+
+        for keyword in keywords:
+            normalized = normalize_keyword(keyword)
+            if normalized and keyword not in self.keywords:
+                self.keywords.append(keyword)
+                self._add(normalized, keyword)
+        self._build()
+
+    def _add(self, normalized, keyword):
+        state = 0
+        for char in normalized:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(keyword)
+
+    def _build(self):
+        # 너비 우선으로 실패 링크 계산
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """text에 들어 있는 키워드 목록 (등록 순서, 중복 없음)"""
+        found = set()
+        state = 0
+        for char in normalize_keyword(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                found.update(self._output[state])
+        return [keyword for keyword in self.keywords if keyword in found]
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+# --- FCM 토픽 이름 ---
+# 토픽 이름에는 [a-zA-Z0-9-_.~%]만 쓸 수 있어 키워드는 UTF-8 퍼센트 인코딩합니다.
+# 앱(topic_service.dart)도 같은 규칙으로 토픽 이름을 만듭니다.
+
+def source_topic(source):
+    """소스의 모든 새 글을 받는 토픽 (키워드를 등록하지 않은 기기용)"""
+    return f"notice_{source}"
+
+def keyword_topic(source, keyword):
+    """소스별 키워드 토픽"""
+    return f"kw_{source}_{quote(keyword.strip(), safe='')}"
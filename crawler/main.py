@@ -1,64 +1,427 @@
+import time
+
+_IMPORT_START = time.perf_counter()
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-import firebase_admin
-from firebase_admin import credentials, firestore, messaging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urljoin, urlparse
 import os
 import hashlib
+import importlib
+import importlib.util
+import queue
+import random
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+
+import metrics
+import state_store
+import storage
+from date_parser import KST, date_fields, parse_date_range
+from dedup import canonical_url, jaccard, title_bands, title_numbers, title_shingles
+from keyword_matcher import KeywordMatcher, keyword_topic, source_topic
+
+# --- 지연 import ---
+# firebase_admin(grpc, google-cloud 포함)과 bs4는 불러오는 데 시간이 오래 걸립니다.
+# 실제로 저장/알림/파싱할 게 있을 때 처음 속성에 접근하는 순간 import합니다.
+# 목록이 바뀌지 않은 실행은 이 모듈들을 전혀 불러오지 않고 끝납니다.
+IMPORT_TIMES = {'requests 외 (시작 시)': time.perf_counter() - _IMPORT_START}
+
+class _LazyModule:
+    """처음 속성에 접근할 때 import되는 모듈 대리 객체 (걸린 시간은 IMPORT_TIMES에 기록)"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self._name)
+            self.__dict__['_module'] = module
+            IMPORT_TIMES.setdefault(self._name, time.perf_counter() - start)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._load(), attr)
+
+bs4 = _LazyModule('bs4')
+firebase_admin = _LazyModule('firebase_admin')
+credentials = _LazyModule('firebase_admin.credentials')
+firestore = _LazyModule('firebase_admin.firestore')
+messaging = _LazyModule('firebase_admin.messaging')
+firebase_exceptions = _LazyModule('firebase_admin.exceptions')
+
+def print_import_report():
+    """모듈 import에 걸린 시간 출력 (지연 import는 실제로 불러온 것만)"""
+    print("=== import 시간 ===")
+    for name, seconds in IMPORT_TIMES.items():
+        print(f"  - {name}: {seconds * 1000:.0f}ms")
+    skipped = [
+        proxy._name for proxy in (bs4, firebase_admin, credentials, firestore, messaging, firebase_exceptions)
+        if proxy._name not in IMPORT_TIMES
+    ]
+    if skipped:
+        print(f"  - 불러오지 않음: {', '.join(skipped)}")
 
 # --- 설정값 ---
 LH_BASE_URL = "https://www.lh.or.kr"
 BOARD_MID = "a10601020000"
 BOARD_BID = "0034"
 
+# --- 스케줄러 설정 ---
+# 동시에 크롤링할 최대 소스 수 / 소스별 최대 실행 시간(초)
+MAX_CONCURRENT_SOURCES = int(os.environ.get('CRAWLER_MAX_WORKERS', '4'))
+SOURCE_TIMEOUT = float(os.environ.get('CRAWLER_SOURCE_TIMEOUT', '120'))
+
+# --- HTTP 설정 ---
+# 모든 크롤러가 하나의 세션(연결 풀)을 공유해 같은 호스트의 TCP/TLS 연결을 재사용합니다.
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+HTTP_TIMEOUT = 15
+HTTP_RETRIES = 3            # 연결 오류/5xx/429 재시도 횟수
+HTTP_BACKOFF = 0.5          # 지수 백오프 기본값(초): 0.5, 1, 2 ...
+HTTP_BACKOFF_JITTER = 0.5   # 백오프에 더할 무작위 지연(초)
+HTTP_POOL_SIZE = 10         # 호스트별 유지할 keep-alive 연결 수
+HOST_CONCURRENCY = int(os.environ.get('CRAWLER_HOST_CONCURRENCY', '2'))  # 호스트별 동시 요청 수
+
+# --- HTML 파싱 설정 ---
+# CRAWLER_HTML_PARSER로 BeautifulSoup 파서를 고를 수 있습니다 (lxml / html.parser).
+# 지정하지 않으면 lxml이 설치되어 있을 때 lxml을 사용합니다.
+def _default_html_parser():
+    # 설치 여부만 확인 (import는 실제 파싱할 때)
+    return 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+HTML_PARSER = os.environ.get('CRAWLER_HTML_PARSER') or _default_html_parser()
+
+# 페이지 전체 대신 필요한 부분만 트리로 만듭니다.
+# LH/KAMS는 게시판 테이블, 서울시는 게시물 목록 항목(li/article)만 파싱합니다.
+BOARD_TABLE_TAGS = ('table',)
+ARCHIVE_LIST_TAGS = ('li', 'article')
+ARCHIVE_HREF_RE = re.compile(r'/archives/')
+
+# True면 저장된 ETag/Last-Modified/본문 해시를 무시하고 항상 새로 파싱
+FORCE_FETCH = os.environ.get('CRAWLER_FORCE_FETCH', '').lower() in ('1', 'true', 'yes')
+
+# Firestore batch 쓰기/조회 한 번에 담을 수 있는 최대 문서 수
+FIRESTORE_BATCH_LIMIT = storage.FIRESTORE_BATCH_LIMIT
+
+# --- 소스별 최신 글 피드 ---
+# feeds/{source} 문서 하나에 최신 글 FEED_SIZE건을 정렬해 담아 둡니다.
+# 앱은 notices 전체 대신 이 문서 하나만 읽습니다.
+FEED_COLLECTION = storage.FEED_COLLECTION
+FEED_SIZE = int(os.environ.get('CRAWLER_FEED_SIZE', '100'))
+
+# --- FCM 설정 ---
+FCM_TOPIC = 'lh_notice'
+FCM_BATCH_LIMIT = 500        # messaging.send_each 한 번에 보낼 수 있는 최대 메시지 수
+FCM_SEND_ATTEMPTS = 3        # 한 실행 안에서 일시적 오류 재시도 횟수
+FCM_MAX_ATTEMPTS = 10        # 여러 실행에 걸친 최대 시도 횟수 (넘으면 대기열에서 제거)
+FCM_RETRY_BACKOFF = 1.0      # 재시도 백오프 기본값(초)
+
+# --- 토픽/키워드 설정 ---
+# 새 글은 소스 토픽(notice_LH 등)으로, 등록된 키워드가 제목에 들어 있으면 키워드 토픽(kw_LH_...)으로도 보냅니다.
+# 앱은 키워드를 등록한 소스는 키워드 토픽만, 아니면 소스 토픽을 구독합니다.
+# 이전 버전 앱이 구독하는 lh_notice에도 계속 보내며, CRAWLER_FCM_LEGACY_TOPIC=''로 끌 수 있습니다.
+FCM_LEGACY_TOPIC = os.environ.get('CRAWLER_FCM_LEGACY_TOPIC', FCM_TOPIC)
+FCM_CONDITION_TOPIC_LIMIT = 5  # FCM condition 하나에 넣을 수 있는 최대 토픽 수
+KEYWORD_COLLECTION = storage.KEYWORD_COLLECTION  # 앱이 등록한 키워드 (문서 ID = 키워드 토픽)
+KEYWORD_REFRESH_INTERVAL = float(os.environ.get('CRAWLER_KEYWORD_REFRESH', '600'))  # 키워드 목록 캐시 유지 시간(초)
+
+# --- 요약(digest) 알림 설정 ---
+# 한 번에 발송할 신규 글이 소스별 기준 건수를 넘으면 건별 알림 대신 요약 알림 1건을 보냅니다.
+# CRAWLER_DIGEST_THRESHOLDS="LH=10,KAMS=3" 형식으로 소스별 기준을 따로 지정할 수 있습니다.
+DIGEST_THRESHOLD = int(os.environ.get('CRAWLER_DIGEST_THRESHOLD', '5'))
+DIGEST_THRESHOLDS = {
+    key.strip(): int(value)
+    for key, _, value in (
+        item.partition('=') for item in os.environ.get('CRAWLER_DIGEST_THRESHOLDS', '').split(',')
+    )
+    if key.strip() and value.strip()
+}
+DIGEST_MAX_IDS = 80          # data payload(4KB 제한)에 넣을 최대 doc ID 수
+
+def _is_retryable_fcm_error(error):
+    """재시도하면 성공할 수 있는 FCM 오류인지"""
+    return isinstance(error, (
+        firebase_exceptions.UnavailableError,
+        firebase_exceptions.InternalError,
+        firebase_exceptions.DeadlineExceededError,
+        firebase_exceptions.ResourceExhaustedError,
+    ))
+
+# 여러 스레드에서 동시에 initialize_app이 호출되지 않도록 보호
+_firebase_lock = threading.Lock()
+
 def init_firebase():
     """Firebase 초기화"""
-    if not firebase_admin._apps:
-        # 현재 파일과 같은 폴더에 serviceAccountKey.json이 있어야 합니다.
-        cred_path = os.path.join(os.path.dirname(__file__), 'serviceAccountKey.json')
-        if not os.path.exists(cred_path):
-            raise FileNotFoundError(f"키 파일 없음: {cred_path}")
-        
-        cred = credentials.Certificate(cred_path)
-        firebase_admin.initialize_app(cred)
+    with _firebase_lock:
+        if not firebase_admin._apps:
+            # 현재 파일과 같은 폴더에 serviceAccountKey.json이 있어야 합니다.
+            cred_path = os.path.join(os.path.dirname(__file__), 'serviceAccountKey.json')
+            if not os.path.exists(cred_path):
+                raise FileNotFoundError(f"키 파일 없음: {cred_path}")
+            
+            cred = credentials.Certificate(cred_path)
+            firebase_admin.initialize_app(cred)
     return firestore.client()
 
+# 공고 저장소 (CRAWLER_STORAGE: firestore 기본, sqlite면 Firebase 없이 로컬 파일)
+_storage = None
+_storage_lock = threading.Lock()
+
+def get_storage():
+    """설정된 공고 저장소 (프로세스 전체에서 하나를 공유)"""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            if storage.STORAGE_BACKEND == 'sqlite':
+                _storage = storage.SQLiteStorage()
+            elif storage.STORAGE_BACKEND == 'firestore':
+                _storage = storage.FirestoreStorage(init_firebase())
+                if storage.STORAGE_MIRROR:
+                    _storage = storage.MirrorStorage(_storage, storage.SQLiteStorage())
+            else:
+                raise ValueError(f"알 수 없는 저장소: {storage.STORAGE_BACKEND} (firestore 또는 sqlite)")
+        return _storage
+
+# FCM 발송 방식 (CRAWLER_FCM_TRANSPORT)
+#   firebase          실제 FCM (기본)
+#   fake              메모리 안의 가짜 FCM (fakes.FakeMessaging, 실제 기기에 보내지 않음)
+#   http://host:port  로컬 HTTP 가짜 FCM 서버 (fake_fcm.py)
+FCM_TRANSPORT = os.environ.get('CRAWLER_FCM_TRANSPORT', 'firebase')
+_fcm_transport = None
+_fcm_transport_lock = threading.Lock()
+
+def get_fcm_transport():
+    """알림 발송 객체 (send_each/send를 가진 messaging 호환 객체, 프로세스 전체에서 하나를 공유)"""
+    global _fcm_transport
+    with _fcm_transport_lock:
+        if _fcm_transport is None:
+            if FCM_TRANSPORT == 'firebase':
+                init_firebase()
+                _fcm_transport = messaging
+            elif FCM_TRANSPORT == 'fake':
+                import fakes
+                _fcm_transport = fakes.FakeMessaging()
+            elif FCM_TRANSPORT.startswith(('http://', 'https://')):
+                import fake_fcm
+                _fcm_transport = fake_fcm.HttpMessaging(FCM_TRANSPORT)
+            else:
+                raise ValueError(f"알 수 없는 FCM 발송 방식: {FCM_TRANSPORT} (firebase, fake 또는 http://...)")
+        return _fcm_transport
+
+def set_fcm_transport(transport):
+    """알림 발송 객체 교체 (부하 테스트/벤치마크용, None이면 설정값으로 다시 만듦)"""
+    global _fcm_transport
+    with _fcm_transport_lock:
+        _fcm_transport = transport
+
+def as_storage(store=None):
+    """저장소 객체 그대로, Firestore 클라이언트는 저장소로 감싸고, None이면 설정된 저장소"""
+    if store is None:
+        return get_storage()
+    if isinstance(store, storage.Storage):
+        return store
+    return storage.FirestoreStorage(store)
+
+def get_source_name(source):
+    """소스별 알림 제목 (소스 레지스트리의 name)"""
+    return SOURCES.get(source, {}).get('name') or '공모 알림'
+
+def _android_config():
+    # 알림 우선순위 설정 (높은 우선순위로 즉시 전달)
+    return messaging.AndroidConfig(
+        priority='high',
+        notification=messaging.AndroidNotification(
+            priority='high',
+            sound='default',
+            channel_id='lh_notice_channel'
+        )
+    )
+
+def broadcast_topics(source):
+    """소스의 모든 새 글을 받는 토픽 목록 (이전 버전 앱 토픽 포함)"""
+    topics = [source_topic(source)]
+    if FCM_LEGACY_TOPIC:
+        topics.insert(0, FCM_LEGACY_TOPIC)
+    return topics
+
+def _topic_target(topics):
+    """토픽 목록 → Message의 topic/condition 인자 (condition이면 여러 토픽을 구독한 기기도 한 번만 받음)"""
+    if len(topics) == 1:
+        return {'topic': topics[0]}
+    return {'condition': ' || '.join(f"'{topic}' in topics" for topic in topics)}
+
+def build_fcm_message(title, link, source='LH', topics=None, keywords=None):
+    """소스별 알림 메시지 구성 (topics 기본값: 소스 전체 토픽, keywords: 일치한 키워드)"""
+    source_name = get_source_name(source)
+    data = {
+        'link': link, # 앱에서 클릭 시 이동할 링크
+        'source': source, # 소스 정보 추가
+        'click_action': 'FLUTTER_NOTIFICATION_CLICK'
+    }
+    if keywords:
+        data['keywords'] = ','.join(keywords)
+
+    return messaging.Message(
+        notification=messaging.Notification(
+            title=f"[{source_name}]",
+            body=title,
+        ),
+        data=data,
+        android=_android_config(),
+        **_topic_target(topics or broadcast_topics(source)),
+    )
+
+def build_digest_message(notifications, source='LH', topics=None, keywords=None):
+    """같은 소스의 신규 글 여러 건을 요약 알림 1건으로 구성 (keywords: 키워드 토픽 요약이면 그 키워드)"""
+    count = len(notifications)
+    # 목록 페이지 순서대로 쌓이므로 첫 번째 글이 가장 최근 글
+    latest = notifications[0]
+    doc_ids = [n['doc_id'] for n in notifications]
+    data = {
+        'type': 'digest',
+        'link': latest['link'], # 가장 최근 글 링크
+        'source': source,
+        'count': str(count),
+        'ids': ','.join(doc_ids[:DIGEST_MAX_IDS]),
+        'ids_truncated': '1' if count > DIGEST_MAX_IDS else '0',
+        'click_action': 'FLUTTER_NOTIFICATION_CLICK'
+    }
+    if keywords:
+        data['keywords'] = ','.join(keywords)
+    return messaging.Message(
+        notification=messaging.Notification(
+            title=f"[{get_source_name(source)}]",
+            body=f"새 공지 {count}건: {latest['title']} 외 {count - 1}건",
+        ),
+        data=data,
+        android=_android_config(),
+        **_topic_target(topics or broadcast_topics(source)),
+    )
+
+_keyword_cache = {'matchers': None, 'loaded_at': 0.0}
+_keyword_lock = threading.Lock()
+
+def get_keyword_matchers():
+    """소스별 키워드 매처 {source: KeywordMatcher} (KEYWORD_REFRESH_INTERVAL 동안 캐시)
+
+    다시 읽다가 실패하면 이전 목록을 그대로 씁니다. 한 번도 읽지 못했으면 예외를 그대로 올려
+    키워드 토픽 구독 기기가 알림을 놓치지 않도록 대기열에 남깁니다.
+    """
+    with _keyword_lock:
+        now = time.monotonic()
+        if _keyword_cache['matchers'] is not None and now - _keyword_cache['loaded_at'] < KEYWORD_REFRESH_INTERVAL:
+            return _keyword_cache['matchers']
+        try:
+            keywords = {}
+            for data in get_storage().keyword_topics():
+                if data.get('keyword') and data.get('source') and data.get('subscribers', 1) > 0:
+                    keywords.setdefault(data['source'], []).append(data['keyword'])
+        except Exception as e:
+            if _keyword_cache['matchers'] is None:
+                raise
+            print(f"  ⚠️ 키워드 목록 갱신 실패 (이전 목록 사용): {e}")
+            return _keyword_cache['matchers']
+        _keyword_cache['matchers'] = {source: KeywordMatcher(words) for source, words in keywords.items()}
+        _keyword_cache['loaded_at'] = now
+        return _keyword_cache['matchers']
+
+# 발송 대상 이름: 소스 전체 토픽(과 이전 버전 토픽)으로 보내는 알림. 키워드 토픽 알림은 토픽 이름을 그대로 씀
+BROADCAST_TARGET = 'source'
+
+def digest_threshold(source):
+    """소스의 요약 알림 기준 건수 (환경 변수 → 소스 레지스트리 → 공통 기준 순)"""
+    threshold = DIGEST_THRESHOLDS.get(source)
+    if threshold is None:
+        threshold = SOURCES.get(source, {}).get('digest_threshold')
+    return DIGEST_THRESHOLD if threshold is None else threshold
+
+def coalesce_notifications(pending):
+    """대기 알림을 발송 단위로 묶기
+
+    소스 토픽과 키워드 토픽 모두, 토픽별 건수가 기준(DIGEST_THRESHOLD)을 넘으면 요약 알림 1건으로,
+    기준 이하이면 건별 알림으로 만듭니다. 키워드 토픽 알림은 제목에 등록 키워드가 들어 있는 글만 보냅니다.
+    각 단위는 포함된 글, 발송 대상 목록 targets [(doc_id, 대상)]과 메시지를 가집니다.
+    이미 발송을 끝낸 대상(n['sent'])은 다시 만들지 않습니다.
+    """
+    by_source = {}
+    for notification in pending:
+        if BROADCAST_TARGET not in notification['sent']:
+            by_source.setdefault(notification['source'], []).append(notification)
+
+    units = []
+    for source, notifications in by_source.items():
+        if len(notifications) > digest_threshold(source):
+            print(f"  📦 [{source}] 신규 {len(notifications)}건 → 요약 알림 1건으로 발송")
+            units.append({
+                'notifications': notifications,
+                'targets': [(n['doc_id'], BROADCAST_TARGET) for n in notifications],
+                'label': f"{source} 요약 {len(notifications)}건",
+                'message': build_digest_message(notifications, source),
+            })
+        else:
+            for n in notifications:
+                units.append({
+                    'notifications': [n],
+                    'targets': [(n['doc_id'], BROADCAST_TARGET)],
+                    'label': n['title'],
+                    'message': build_fcm_message(n['title'], n['link'], n['source']),
+                })
+
+    # 키워드 토픽도 토픽별 건수가 기준을 넘으면 요약 알림 1건으로
+    matchers = get_keyword_matchers()
+    by_topic = {}  # (source, keyword) → 글 목록
+    for n in pending:
+        matcher = matchers.get(n['source'])
+        for keyword in (matcher.find(n['title']) if matcher else []):
+            if keyword_topic(n['source'], keyword) not in n['sent']:
+                by_topic.setdefault((n['source'], keyword), []).append(n)
+
+    single_keywords = {}  # doc_id → 건별로 보낼 키워드 목록
+    for (source, keyword), notifications in by_topic.items():
+        if len(notifications) > digest_threshold(source):
+            topic = keyword_topic(source, keyword)
+            print(f"  📦 [{source}] 키워드 '{keyword}' 신규 {len(notifications)}건 → 요약 알림 1건으로 발송")
+            units.append({
+                'notifications': notifications,
+                'targets': [(n['doc_id'], topic) for n in notifications],
+                'label': f"{source} 키워드 '{keyword}' 요약 {len(notifications)}건",
+                'message': build_digest_message(notifications, source, topics=[topic], keywords=[keyword]),
+            })
+        else:
+            for n in notifications:
+                single_keywords.setdefault(n['doc_id'], []).append(keyword)
+
+    # 건별 키워드 알림 (한 글에 여러 키워드가 맞아도 condition으로 묶어 기기마다 한 번만)
+    for n in pending:
+        for chunk in _chunks(single_keywords.get(n['doc_id'], []), FCM_CONDITION_TOPIC_LIMIT):
+            topics = [keyword_topic(n['source'], keyword) for keyword in chunk]
+            units.append({
+                'notifications': [n],
+                'targets': [(n['doc_id'], topic) for topic in topics],
+                'label': f"{n['title']} (키워드: {', '.join(chunk)})",
+                'message': build_fcm_message(n['title'], n['link'], n['source'], topics=topics, keywords=chunk),
+            })
+    return units
+
 def send_fcm_notification(title, link, source='LH'):
-    """FCM 알림 발송 함수 - 신뢰성 개선"""
+    """FCM 알림 발송 함수 - 신뢰성 개선 (단건 즉시 발송)"""
     try:
-        # 소스별 알림 제목 설정
-        source_names = {
-            'LH': 'LH 공모 알림',
-            'KAMS': '예술경영지원센터 알림',
-            'Seoul': '서울 공공디자인 알림',
-            'SeoulPublicArt': '서울 공공미술 공모 알림'
-        }
-        source_name = source_names.get(source, '공모 알림')
-        
-        # 'lh_notice'라는 주제(Topic)를 구독한 앱들에게 알림을 쏩니다.
-        message = messaging.Message(
-            notification=messaging.Notification(
-                title=f"[{source_name}]",
-                body=title,
-            ),
-            data={
-                'link': link, # 앱에서 클릭 시 이동할 링크
-                'source': source, # 소스 정보 추가
-                'click_action': 'FLUTTER_NOTIFICATION_CLICK'
-            },
-            topic='lh_notice',
-            # 알림 우선순위 설정 (높은 우선순위로 즉시 전달)
-            android=messaging.AndroidConfig(
-                priority='high',
-                notification=messaging.AndroidNotification(
-                    priority='high',
-                    sound='default',
-                    channel_id='lh_notice_channel'
-                )
-            ),
-        )
-        response = messaging.send(message)
+        message = build_fcm_message(title, link, source)
+        response = get_fcm_transport().send(message)
         print(f"  📢 [알림 발송 성공] Message ID: {response} | Source: {source}")
         return True
     except Exception as e:
@@ -67,426 +430,1549 @@ def send_fcm_notification(title, link, source='LH'):
         traceback.print_exc()
         return False
 
-def check_and_save(db, data, source='LH'):
-    """저장 및 알림 트리거 - source 필드 추가"""
-    link = data.get('link', '').strip()
-    if not link or link == '#': return False
-    
-    doc_id = hashlib.md5(link.encode('utf-8')).hexdigest()
-    
+def queue_notification(doc_id, title, link, source='LH'):
+    """알림을 발송 대기열에 추가 (flush_notifications에서 한 번에 발송)
+
+    대기열은 로컬 상태 DB에 저장되므로, 발송 전에 프로세스가 죽어도
+    다음 실행에서 이어서 발송합니다.
+    """
+    state_store.outbox_add([(doc_id, title, link, source)])
+
+def _send_each(messages):
+    """메시지 목록을 send_each로 발송하고 각 메시지의 예외(성공이면 None) 목록 반환"""
     try:
-        notices_ref = db.collection('notices')
-        doc_ref = notices_ref.document(doc_id)
-        
-        # 1. 이미 저장된 글인지 확인
-        if doc_ref.get().exists:
-            # print(f"  [중복] {data['title']}") # 너무 시끄러우면 주석 처리
-            return False 
-        
-        # 2. 신규 저장 (source 필드 추가)
-        doc_ref.set({
-            'number': data.get('number', ''),
-            'title': data.get('title', ''),
-            'date': data.get('date', ''),
-            'link': link,
-            'source': source,  # 소스 필드 추가
-            'created_at': firestore.SERVER_TIMESTAMP
-        })
-        
-        # 3. [중요] 저장 성공 시 알림 발송 함수 호출!
-        print(f"  💾 [신규 저장 완료] {data['title']} | Source: {source}")
-        notification_sent = send_fcm_notification(data['title'], link, source)
-        
-        if not notification_sent:
-            print(f"  ⚠️ 알림 발송 실패했지만 데이터는 저장되었습니다.")
-        
-        return True
+        batch_response = get_fcm_transport().send_each(messages)
     except Exception as e:
-        print(f"  DB 에러: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        # 요청 자체가 실패하면 모든 메시지를 같은 오류로 처리
+        return [e] * len(messages)
+    return [None if r.success else r.exception for r in batch_response.responses]
 
-def crawl_lh_notice():
-    list_url = f"{LH_BASE_URL}/board.es?mid={BOARD_MID}&bid={BOARD_BID}"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    
-    print(f"--- 크롤링 시작: {list_url} ---")
-    
-    try:
-        response = requests.get(list_url, headers=headers, timeout=15)
-        response.encoding = response.apparent_encoding
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        rows = soup.select('table tbody tr')
-        
-        if not rows:
-            print("❌ 게시물을 찾을 수 없습니다.")
-            return
+# 여러 스레드에서 같은 대기열을 동시에 발송하지 않도록 보호
+_flush_lock = threading.Lock()
 
-        results = []
-        for row in rows:
-            # ... (데이터 추출 로직은 아까 검증된 코드와 동일) ...
-            cells = row.find_all(['td', 'th'])
-            if len(cells) < 3: continue
-            
-            number = cells[0].get_text(strip=True)
-            link_tag = row.find('a')
-            if not link_tag: continue
+def flush_notifications(hold=False):
+    """대기열의 알림을 send_each로 최대 500건씩 묶어 발송
 
-            title = link_tag.get_text(strip=True).replace('새글', '').strip()
-            
-            link_path = link_tag.get('href', '').strip()
-            onclick = link_tag.get('onclick', '')
-            final_link = ""
-
-            if link_path and not link_path.startswith('java') and link_path != '#' and link_path != '#none':
-                 final_link = urljoin(LH_BASE_URL, link_path)
-            elif onclick:
-                # onclick에서 실제 링크 경로 추출
-                # 예: goView3('729895','/board.es?mid=a10601020000&bid=0034&act=view&list_no=729895&tag=&nPage=1');
-                match = re.search(r"['\"](/board\.es\?[^'\"]+)['\"]", onclick)
-                if match:
-                    # onclick에서 전체 경로 추출
-                    path = match.group(1)
-                    final_link = urljoin(LH_BASE_URL, path)
+    소스별로 많이 쌓인 알림은 요약 알림으로 합칩니다(coalesce_notifications).
+    일시적 오류는 백오프 후 재시도하고, 그래도 실패한 알림은 대기열에 남겨
+    다음 실행에서 다시 보냅니다. (성공 메시지 수, 실패 메시지 수)를 반환합니다.
+    hold=True이면 아직 크롤링 중인 소스의 알림은 남겨 둡니다(held_sources).
+    """
+    with _flush_lock:
+        return _flush_notifications(hold)
+
+def _flush_notifications(hold):
+    pending = state_store.outbox_pending()
+    if hold:
+        held = held_sources(pending)
+        pending = [n for n in pending if n['source'] not in held]
+        # 크롤링 중인 소스는 첫 알림을 보냈으니 나머지는 크롤링이 끝날 때까지 모아 둠
+        with _crawling_lock:
+            _first_flushed.update(n['source'] for n in pending if _crawling_sources.get(n['source']))
+    if not pending:
+        return 0, 0
+
+    get_fcm_transport()
+    print(f"--- 알림 {len(pending)}건 발송 시작 ---")
+    units = coalesce_notifications(pending)
+
+    # 한 글이 여러 발송 단위(소스 토픽, 키워드 토픽)에 들어갈 수 있으므로 결과는 (글, 대상)마다 기록합니다.
+    # 소스 토픽 알림은 성공하고 키워드 토픽 알림만 실패한 글은 대기열에 남기되,
+    # 다음 발송에서는 실패한 대상만 다시 보냅니다 (이미 받은 기기에 중복 발송하지 않음).
+    delivered = []    # 성공했거나 포기한 (doc_id, 대상)
+    retry_later = {}  # 다음 실행에서 다시 보낼 글 doc_id → 오류
+    dropped = set()   # 최대 시도 횟수를 넘겨 대기열에서 뺄 글
+    sent = 0
+    failed = 0
+    for chunk in _chunks(units, FCM_BATCH_LIMIT):
+        remaining = chunk
+        for attempt in range(FCM_SEND_ATTEMPTS):
+            if attempt:
+                time.sleep(FCM_RETRY_BACKOFF * (2 ** (attempt - 1)) + random.uniform(0, FCM_RETRY_BACKOFF))
+
+            with metrics.timer('notify'):
+                errors = _send_each([unit['message'] for unit in remaining])
+            metrics.count('fcm_messages', value=len(remaining))
+
+            retry = []
+            for unit, error in zip(remaining, errors):
+                if error is None:
+                    delivered.extend(unit['targets'])
+                    sent += 1
+                elif _is_retryable_fcm_error(error) and attempt < FCM_SEND_ATTEMPTS - 1:
+                    retry.append(unit)
                 else:
-                    # 폴백: list_no만 추출해서 링크 생성
-                    match = re.search(r"['\"]?(\d{4,})['\"]?", onclick) 
-                    if match:
-                        list_no = match.group(1)
-                        final_link = f"{LH_BASE_URL}/board.es?mid={BOARD_MID}&bid={BOARD_BID}&act=view&list_no={list_no}&tag=&nPage=1"
-            
-            if not final_link: continue
-
-            # 날짜 추출
-            date_text = cells[-2].get_text(strip=True)
-            if not re.search(r'\d{4}[.-]\d{2}[.-]\d{2}', date_text):
-                for cell in cells:
-                    if re.search(r'\d{4}[.-]\d{2}[.-]\d{2}', cell.get_text(strip=True)):
-                        date_text = cell.get_text(strip=True)
-                        break
-
-            # 모든 게시글 저장 (키워드 필터링 제거)
-            results.append({
-                'number': number,
-                'title': title,
-                'date': date_text,
-                'link': final_link
-            })
+                    failed += 1
+                    outcome = _record_fcm_failure(unit, error)
+                    if outcome == 'retry':
+                        retry_later.update((n['doc_id'], error) for n in unit['notifications'])
+                    elif outcome == 'skip':
+                        delivered.extend(unit['targets'])
+                    else:
+                        dropped.update(n['doc_id'] for n in unit['notifications'])
 
-        # DB 저장 및 알림 시도
-        if results:
-            print(f"총 {len(results)}건의 게시물을 처리합니다...")
-            db = init_firebase()
-            new_count = 0
-            for item in results:
-                if check_and_save(db, item, source='LH'):
-                    new_count += 1
-            print(f"\n=== LH 실행 완료: {new_count}건 신규 저장 및 알림 전송 ===")
-        else:
-            print("\nLH 게시물이 없습니다.")
+            remaining = retry
+            if not remaining:
+                break
 
-    except Exception as e:
-        print(f"에러 발생: {e}")
+    state_store.outbox_mark_sent(delivered)
+    state_store.outbox_mark_failed(retry_later.items())
+    state_store.outbox_remove(({n['doc_id'] for n in pending} - set(retry_later)) | dropped)
+    metrics.count('notifications_sent', value=sent)
+    metrics.count('notifications_failed', value=failed)
 
-def crawl_kams_notice():
-    """KAMS 예술경영지원센터 크롤링"""
-    list_url = "https://gokams.or.kr/01_news/event_list.aspx"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    print(f"  📢 [알림 발송 완료] 성공 {sent}건 / 실패 {failed}건")
+    return sent, failed
+
+# 크롤링 중인 소스 → 진행 중인 크롤링 수 (crawl_source가 시작/끝에 표시)
+_crawling_sources = {}
+# 이번 크롤링에서 첫 알림을 이미 보낸 소스 (이후 알림은 크롤링이 끝날 때까지 모아 둠)
+_first_flushed = set()
+_crawling_lock = threading.Lock()
+
+def hold_notifications(source):
+    """소스 크롤링 시작: 첫 알림은 바로 보내고, 그 뒤 알림은 끝날 때까지 모아 둠"""
+    with _crawling_lock:
+        if not _crawling_sources.get(source):
+            _first_flushed.discard(source)
+        _crawling_sources[source] = _crawling_sources.get(source, 0) + 1
+
+def release_notifications(source):
+    """소스 크롤링 종료: 모아 둔 알림을 발송하도록 발송 스레드를 깨움"""
+    with _crawling_lock:
+        _crawling_sources[source] = max(_crawling_sources.get(source, 0) - 1, 0)
+    wake_notification_dispatcher()
+
+def held_sources(pending, now=None):
+    """알림을 아직 보내지 않고 모아 둘 소스 → 더 기다리지 않을 시각
+
+    크롤링 중인 소스의 첫 알림(첫 발송에 함께 들어온 글)은 뒤에 행이 얼마나 남았든 바로 보내고,
+    그 뒤의 신규 글은 여러 번 나눠 발송되지 않도록 크롤링이 끝날 때까지 모아 한 번에 묶습니다.
+    가장 오래된 알림이 NOTIFY_MAX_HOLD초를 넘으면 더 기다리지 않습니다.
+    """
+    now = now or time.time()
+    with _crawling_lock:
+        crawling = {source for source, count in _crawling_sources.items() if count and source in _first_flushed}
+    oldest = {}
+    for n in pending:
+        if n['source'] in crawling:
+            oldest[n['source']] = min(oldest.get(n['source'], n['created_at']), n['created_at'])
+    return {
+        source: created_at + NOTIFY_MAX_HOLD
+        for source, created_at in oldest.items()
+        if created_at + NOTIFY_MAX_HOLD > now
     }
-    
-    print(f"--- KAMS 크롤링 시작: {list_url} ---")
-    
-    try:
-        response = requests.get(list_url, headers=headers, timeout=15)
-        response.encoding = response.apparent_encoding or 'utf-8'
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # KAMS 사이트 구조: table tr 형태
-        rows = soup.select('table tbody tr, table tr')
-        
-        if not rows:
-            print("❌ KAMS 게시물을 찾을 수 없습니다.")
-            return
 
-        results = []
-        base_url = "https://gokams.or.kr/01_news/"
-        
-        for row in rows:
-            try:
-                cells = row.find_all('td')
-                if len(cells) < 4:  # 최소 4개 셀 필요
-                    continue
-                
-                # 제목과 링크 추출
-                link_tag = row.find('a')
-                if not link_tag:
-                    continue
-                
-                title = link_tag.get_text(strip=True)
-                # "new" 이미지 텍스트 제거
-                title = re.sub(r'\s*\[new\]\s*', '', title, flags=re.IGNORECASE)
-                if not title:
+class NotificationDispatcher:
+    """알림 발송 전담 스레드
+
+    저장 단계가 신규 글을 대기열에 넣거나 소스 크롤링이 끝나 wake()가 호출되면,
+    NOTIFY_LINGER초 동안 함께 들어오는 알림을 모았다가 발송합니다.
+    크롤링 중인 소스는 첫 발송 뒤의 알림을 그 소스가 끝날 때까지(최대 NOTIFY_MAX_HOLD초) 모아 두었다가
+    한 번에 묶어 보냅니다.
+    """
+
+    def __init__(self, linger=None):
+        self.linger = NOTIFY_LINGER if linger is None else linger
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._hold_until = None  # 모아 둔 알림을 더 기다리지 않을 가장 이른 시각
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name='notify', daemon=True)
+        self._thread.start()
+        return self
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            if not self._wakeup.wait(timeout=0.5):
+                if self._hold_until is None or time.time() < self._hold_until:
                     continue
-                
-                # 링크 추출
-                href = link_tag.get('href', '')
-                if not href or href == '#':
+            # 같이 들어올 알림을 잠깐 모아서 (요약 알림 판단에도 사용) 한 번에 발송
+            self._stop.wait(self.linger)
+            self._wakeup.clear()
+            self._flush(hold=True)
+
+    def _flush(self, hold=False):
+        try:
+            flush_notifications(hold)
+            held = held_sources(state_store.outbox_pending()) if hold else {}
+            self._hold_until = min(held.values()) if held else None
+        except Exception as e:
+            print(f"⚠️ 알림 발송 중 에러 (대기열에 남아 다음에 재시도): {e}")
+
+    def close(self):
+        """스레드를 멈추고 남은 알림을 (크롤링이 끝나지 않은 소스 것까지) 마지막으로 발송"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._flush()
+
+_dispatcher = None
+
+def wake_notification_dispatcher():
+    """실행 중인 알림 발송 스레드가 있으면 깨우기 (없으면 실행 끝에 한 번에 발송)"""
+    if _dispatcher is not None:
+        _dispatcher.wake()
+
+def _record_fcm_failure(unit, error):
+    """발송 실패 처리 → 'retry'(다음 실행에서 이 대상만 다시 보냄), 'skip'(이 대상 포기), 'drop'(글 포기)"""
+    notifications = unit['notifications']
+    attempts = max(n['attempts'] for n in notifications) + 1
+    if not _is_retryable_fcm_error(error):
+        print(f"  ❌ [알림 발송 포기] {unit['label']} | {error}")
+        return 'skip'
+    if attempts < FCM_MAX_ATTEMPTS:
+        print(f"  ⚠️ [알림 발송 실패 - 다음 실행에서 재시도] {unit['label']} | {error}")
+        return 'retry'
+    print(f"  ❌ [알림 발송 포기 - {attempts}회 실패] {unit['label']} | {error}")
+    return 'drop'
+
+_http_session = None
+_http_lock = threading.Lock()
+_host_semaphores = {}
+
+def get_http_session():
+    """공유 HTTP 세션 (연결 풀, keep-alive, 재시도/백오프 포함)"""
+    global _http_session
+    with _http_lock:
+        if _http_session is None:
+            retry = Retry(
+                total=HTTP_RETRIES,
+                backoff_factor=HTTP_BACKOFF,
+                backoff_jitter=HTTP_BACKOFF_JITTER,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['GET', 'HEAD']),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _http_session = session
+        return _http_session
+
+def _host_semaphore(url):
+    """호스트별 동시 요청 수 제한용 세마포어"""
+    host = urlparse(url).hostname or ''
+    with _http_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(HOST_CONCURRENCY)
+        return _host_semaphores[host]
+
+def http_get(url, headers=None, timeout=HTTP_TIMEOUT, source='', **kwargs):
+    """공유 세션으로 GET 요청 (호스트별 동시 요청 수 제한, 소스별 fetch 지표 기록)"""
+    session = get_http_session()
+    with _host_semaphore(url), metrics.timer('fetch', source):
+        response = session.get(url, headers=headers, timeout=timeout, **kwargs)
+    metrics.count('http_requests', source, status=response.status_code)
+    metrics.count('bytes_downloaded', source, value=len(response.content))
+    return response
+
+def fetch_page(url, timeout=HTTP_TIMEOUT, fallback_encoding=None, conditional=True, source=''):
+    """조건부 요청으로 목록 페이지 가져오기
+
+    (html, validators)를 반환합니다. 이전 실행 이후 페이지가 바뀌지 않았으면
+    (304 응답 또는 본문 해시 동일) html은 None입니다.
+    validators는 저장까지 끝난 뒤 remember_page()로 기록합니다.
+    conditional=False이면 항상 새로 받고 검증값도 남기지 않습니다 (2페이지 이후 등).
+    """
+    saved = None if (FORCE_FETCH or not conditional) else state_store.get_validators(url)
+
+    request_headers = {}
+    if saved:
+        if saved['etag']:
+            request_headers['If-None-Match'] = saved['etag']
+        if saved['last_modified']:
+            request_headers['If-Modified-Since'] = saved['last_modified']
+
+    response = http_get(url, headers=request_headers, timeout=timeout, source=source)
+    if response.status_code == 304 and saved:
+        return None, None
+
+    response.encoding = response.apparent_encoding or fallback_encoding
+
+    # 정상 응답만 검증값을 남김 (에러 페이지로 다음 실행을 건너뛰지 않도록)
+    if response.status_code != 200:
+        return response.text, None
+
+    if not conditional:
+        return response.text, None
+
+    body_hash = hashlib.sha256(response.content).hexdigest()
+    if saved and saved['body_hash'] == body_hash:
+        return None, None
+
+    validators = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'body_hash': body_hash,
+    }
+    return response.text, validators
+
+def remember_page(url, validators):
+    """처리가 끝난 페이지의 검증값 저장 (다음 실행에서 변경 여부 판단용)"""
+    if validators:
+        state_store.save_validators(url, validators['etag'], validators['last_modified'], validators['body_hash'])
+
+@lru_cache(maxsize=None)
+def _strainer(tags):
+    return bs4.SoupStrainer(list(tags))
+
+def make_soup(html, only_tags=None):
+    """설정된 파서로 BeautifulSoup 생성 (only_tags로 필요한 태그만 파싱)"""
+    parse_only = _strainer(only_tags) if only_tags else None
+    return bs4.BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+def find_archive_links(html):
+    """서울시 목록에서 archives 링크 찾기
+
+    목록 항목만 먼저 파싱하고, 구조가 달라 못 찾으면 전체 페이지를 다시 파싱합니다.
+    """
+    soup = make_soup(html, ARCHIVE_LIST_TAGS)
+    links = soup.find_all('a', href=ARCHIVE_HREF_RE)
+    if not links:
+        soup = make_soup(html)
+        links = soup.find_all('a', href=ARCHIVE_HREF_RE)
+    return links
+
+def notice_doc_id(link):
+    """링크 기반 문서 ID (md5)"""
+    return hashlib.md5(link.encode('utf-8')).hexdigest()
+
+def _chunks(seq, size):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+# 같은 글 판별 (정규화 URL이 같거나, 기간 안에 본 다른 소스 글과 제목 유사도가 기준 이상이고 숫자가 같음)
+NEAR_DUP_THRESHOLD = float(os.environ.get('CRAWLER_NEAR_DUP_THRESHOLD', '0.9'))  # 0이면 제목 비교 안 함
+NEAR_DUP_WINDOW = float(os.environ.get('CRAWLER_NEAR_DUP_WINDOW_DAYS', '14')) * 86400
+
+def find_duplicates(source, doc_ids, candidates, now=None):
+    """신규 후보 중 이미 본 글과 같은 글 찾기
+
+    정규화 URL이 같은 글(같은 batch 안의 후보 포함)은 중복입니다.
+    제목은 NEAR_DUP_WINDOW 안에 본 다른 소스의 글과만 비교해, 유사도가 NEAR_DUP_THRESHOLD 이상이고
+    제목 속 숫자가 모두 같을 때만 중복으로 봅니다. 같은 소스 안에서는 블록/차수만 다른
+    비슷한 제목의 공고가 많아 제목으로 판단하지 않습니다.
+    반환: (남길 doc ID 목록, {중복 doc ID: (원본 doc ID, 이유)}, 저장 후 기록할 지문 목록)
+    이유는 'URL' 또는 '제목 (원본 소스)'입니다.
+    """
+    now = now or time.time()
+    since = now - NEAR_DUP_WINDOW
+    kept = []
+    duplicates = {}
+    fingerprints = []
+    batch_urls = {}
+    for doc_id in doc_ids:
+        link, data = candidates[doc_id]
+        title = data.get('title', '')
+        canonical = canonical_url(link)
+        original = batch_urls.get(canonical) or state_store.fingerprint_by_url(canonical)
+        if original and original != doc_id:
+            duplicates[doc_id] = (original, 'URL')
+            continue
+
+        shingles, bands = title_bands(title) if NEAR_DUP_THRESHOLD > 0 else (set(), [])
+        if bands:
+            numbers = title_numbers(title)
+            match = None
+            for other_id, other_source, other_title in state_store.fingerprint_candidates(bands, since):
+                if other_id == doc_id or other_source == source or title_numbers(other_title) != numbers:
                     continue
-                
-                # 절대 URL로 변환
-                if href.startswith('/'):
-                    final_link = urljoin('https://gokams.or.kr', href)
-                elif href.startswith('http'):
-                    final_link = href
-                else:
-                    final_link = urljoin(base_url, href)
-                
-                # 날짜 추출 (일반적으로 4번째 또는 5번째 셀)
-                date_text = ''
-                for cell in cells:
-                    cell_text = cell.get_text(strip=True)
-                    # 날짜 패턴 찾기 (YYYY-MM-DD 또는 YYYY-MM-DD ~ MM-DD)
-                    date_match = re.search(r'(\d{4}[.-]\d{2}[.-]\d{2})', cell_text)
-                    if date_match:
-                        date_text = cell_text
-                        break
-                
-                if not date_text:
-                    date_text = '날짜 없음'
-                
-                # 번호 추출 (첫 번째 셀)
-                number = cells[0].get_text(strip=True) if cells else ''
-                
-                results.append({
-                    'number': number,
-                    'title': title,
-                    'date': date_text,
-                    'link': final_link
-                })
-            except Exception as e:
-                print(f"  ⚠️ 항목 파싱 오류: {e}")
+                if jaccard(shingles, title_shingles(other_title)) >= NEAR_DUP_THRESHOLD:
+                    match = (other_id, other_source)
+                    break
+            if match:
+                duplicates[doc_id] = (match[0], f'제목 ({match[1]})')
                 continue
 
-        # DB 저장 및 알림 시도
-        if results:
-            print(f"총 {len(results)}건의 KAMS 게시물을 처리합니다...")
-            db = init_firebase()
-            new_count = 0
-            for item in results:
-                if check_and_save(db, item, source='KAMS'):
-                    new_count += 1
-            print(f"\n=== KAMS 실행 완료: {new_count}건 신규 저장 및 알림 전송 ===")
-        else:
-            print("\nKAMS 게시물이 없습니다.")
+        batch_urls[canonical] = doc_id
+        kept.append(doc_id)
+        fingerprints.append((doc_id, source, canonical, title, now, bands))
+    return kept, duplicates, fingerprints
+
+def check_and_save_batch(store, items, source='LH'):
+    """여러 건을 한 번에 중복 확인 후 저장 및 알림 트리거
+
+    로컬 seen 인덱스에 있는 글은 저장소에 묻지 않고 건너뛰며, 모두 아는 글이면 저장소를 열지도 않습니다.
+    나머지 doc ID만 exists_many 한 번으로 존재 여부를 확인하고,
+    링크 모양만 다르거나 다른 소스에 다시 올라온 같은 글(find_duplicates)을 빼고
+    신규 글만 put_many로 저장합니다. store는 저장소(storage.Storage), Firestore 클라이언트 또는
+    None(설정된 저장소를 필요할 때 엶)입니다.
+    신규 저장 건수를 반환하며, DB 에러가 나면 None을 반환합니다.
+    """
+    # 1. 유효한 링크만 doc ID 계산 (같은 페이지 안의 중복 링크도 제거)
+    candidates = {}
+    for data in items:
+        link = data.get('link', '').strip()
+        if not link or link == '#':
+            continue
+        doc_id = notice_doc_id(link)
+        if doc_id not in candidates:
+            candidates[doc_id] = (link, data)
+
+    if not candidates:
+        return 0
+
+    try:
+        with metrics.timer('dedup', source):
+            # 2. 로컬 인덱스로 이미 아는 글 제외
+            # 모두 아는 글이면 저장소를 열지 않음 (Firebase 초기화/SDK import 없이 끝남)
+            doc_ids = state_store.seen_unknown(candidates)
+            if not doc_ids:
+                return 0
+            # 3. 이미 저장된 글과 같은 글 제외
+            store = as_storage(store)
+            new_ids, fingerprints = _unsaved_candidates(store, source, candidates, doc_ids)
+        if not new_ids:
+            return 0
+        fingerprints_by_id = {fingerprint[0]: fingerprint for fingerprint in fingerprints}
+
+        # 4. (선택) 신규 글만 상세 페이지에서 본문/마감일/첨부파일 보강
+        details = {}
+        if ENRICH_ENABLED:
+            with metrics.timer('enrich', source):
+                details = enrich_items(source, [candidates[doc_id][0] for doc_id in new_ids])
+
+        # 5. 소스 피드에 합칠 신규 글 (저장할 때 현재 피드를 읽어 합침, 다른 실행과 동시에 써도 빠지지 않음)
+        now = datetime.now(timezone.utc)
+        new_feed_items = []
+        for doc_id in new_ids:
+            link, data = candidates[doc_id]
+            new_feed_items.append(feed_item(doc_id, link, {**data, **details.get(link, {})}, now))
 
+        # 6. 신규 글만 저장 (source 필드 포함, created_at은 저장소가 채움)
+        notices = {}
+        for doc_id in new_ids:
+            link, data = candidates[doc_id]
+            notices[doc_id] = {
+                'number': data.get('number', ''),
+                'title': data.get('title', ''),
+                'date': data.get('date', ''),
+                'link': link,
+                'canonical_url': fingerprints_by_id[doc_id][2],
+                'source': source,  # 소스 필드 추가
+                # 정렬/기간 조회용 정규화 날짜 (date_at, date_start, date_end)
+                **date_fields(data.get('date', ''), now),
+                **details.get(link, {}),
+            }
+        with metrics.timer('write', source):
+            store.put_many(source, notices, partial(merge_feed, new_items=new_feed_items))
+        state_store.seen_add(new_ids, source)
+        state_store.fingerprints_add(fingerprints)
     except Exception as e:
-        print(f"KAMS 크롤링 에러 발생: {e}")
+        print(f"  DB 에러: {e}")
         import traceback
         traceback.print_exc()
+        return None
 
-def crawl_seoul_notice():
-    """서울 공공디자인 크롤링 (디자인 뉴스)"""
-    list_url = "https://news.seoul.go.kr/culture/archives/category/design-news_c1/business_design_c1/news_design-news-n1"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    metrics.count('new', source, value=len(new_ids))
+
+    # 7. [중요] 저장 성공 시 알림 대기열에 추가 (실행 마지막에 묶어서 발송)
+    for doc_id in new_ids:
+        link, data = candidates[doc_id]
+        print(f"  💾 [신규 저장 완료] {data['title']} | Source: {source}")
+        queue_notification(doc_id, data['title'], link, source)
+
+    return len(new_ids)
+
+def _unsaved_candidates(store, source, candidates, doc_ids):
+    """로컬 seen 인덱스에 없던 후보 doc_ids 중 저장해야 할 글 → (doc ID 목록, 저장 후 기록할 지문 목록)
+
+    exists_many로 존재 여부를 한 번에 확인한 뒤 링크만 바뀐 같은 글을 뺍니다.
+    """
+    # 이미 저장된 글인지 한 번에 확인
+    existing = store.exists_many(doc_ids, source)
+
+    # 저장소에는 있는데 로컬 인덱스에 없던 글은 다음 실행부터 바로 건너뜀
+    state_store.seen_add(existing, source)
+
+    new_ids = [doc_id for doc_id in doc_ids if doc_id not in existing]
+    if not new_ids:
+        return [], []
+
+    # 같은 글이 링크만 바꾸거나 다른 소스에 다시 올라온 경우는 저장/알림 없이 건너뛰고 seen에 이유와 함께 기록
+    # (제목 비교 기간이 지나 지문이 지워진 뒤 목록에 남아 있는 글을 다시 저장/발송하지 않고,
+    # 다음 실행부터 저장소에 묻지도 않음)
+    new_ids, duplicates, fingerprints = find_duplicates(source, new_ids, candidates)
+    by_reason = {}
+    for doc_id, (original, reason) in duplicates.items():
+        print(f"  🔁 [중복 건너뜀] {candidates[doc_id][1].get('title', '')} | {reason} = {original}")
+        by_reason.setdefault(reason, []).append(doc_id)
+    for reason, doc_ids in by_reason.items():
+        state_store.seen_add(doc_ids, source, reason)
+    metrics.count('duplicates', source, value=len(duplicates))
+    return new_ids, fingerprints
+
+def feed_item(doc_id, link, data, created_at):
+    """피드 문서에 넣을 글 요약"""
+    return {
+        'id': doc_id,
+        'number': data.get('number', ''),
+        'title': data.get('title', ''),
+        'date': data.get('date', ''),
+        'link': link,
+        'created_at': created_at,
+        'date_at': date_fields(data.get('date', ''), created_at)['date_at'],
+        'deadline': data.get('deadline'),
     }
-    
-    print(f"--- Seoul 크롤링 시작: {list_url} ---")
-    
-    try:
-        response = requests.get(list_url, headers=headers, timeout=15)
-        response.encoding = response.apparent_encoding or 'utf-8'
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 서울시 사이트는 archives/숫자 형태의 링크를 직접 찾아야 함
-        all_links = soup.find_all('a', href=True)
-        archive_items = []
-        
-        for link in all_links:
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
-            
-            # archives/숫자 형태의 링크 찾기
-            if '/archives/' in href:
-                # URL에서 숫자 ID 추출
-                parts = href.split('/archives/')
-                if len(parts) > 1:
-                    id_part = parts[1].split('?')[0].split('/')[0]
-                    if id_part.isdigit() and text and len(text) > 5:
-                        # 의미있는 텍스트가 있는 링크만
-                        archive_items.append({
-                            'link': link,
-                            'href': href,
-                            'text': text
-                        })
-        
-        if not archive_items:
-            print("❌ Seoul 게시물을 찾을 수 없습니다.")
-            return
 
-        results = []
-        for item_data in archive_items:
+def _feed_sort_key(item):
+    # 정규화된 날짜(date_at) 기준, 없으면(피드 도입 초기 항목) 원본 날짜의 숫자만 사용
+    if item.get('date_at'):
+        return item['date_at'].astimezone(KST).strftime('%Y%m%d')
+    return re.sub(r'\D', '', item.get('date') or '')[:8]
+
+def merge_feed(items, new_items, size=None):
+    """기존 피드에 새 글을 합쳐 날짜 내림차순으로 size건만 남김 (같은 날짜는 새 글 먼저)"""
+    merged = {}
+    for item in list(new_items) + list(items):
+        merged.setdefault(item['id'], item)
+    ordered = sorted(merged.values(), key=_feed_sort_key, reverse=True)
+    return ordered[:size or FEED_SIZE]
+
+def check_and_save(store, data, source='LH'):
+    """저장 및 알림 트리거 - source 필드 추가 (단건용)"""
+    return bool(check_and_save_batch(store, [data], source))
+
+# --- 상세 페이지 보강 (선택) ---
+# CRAWLER_ENRICH=1(또는 --enrich)이면 신규 글만 상세 페이지를 받아 본문, 마감일, 첨부파일 링크를 함께 저장합니다.
+# 상세 페이지는 URL과 본문 해시로 state_store에 캐시해 다시 받지 않습니다.
+ENRICH_ENABLED = os.environ.get('CRAWLER_ENRICH', '').lower() in ('1', 'true', 'yes')
+ENRICH_WORKERS = int(os.environ.get('CRAWLER_ENRICH_WORKERS', '4'))
+ENRICH_TIMEOUT = float(os.environ.get('CRAWLER_ENRICH_TIMEOUT', '30'))  # 한 batch의 상세 페이지를 기다릴 최대 시간(초)
+DETAIL_BODY_LIMIT = 5000  # 저장할 본문 최대 글자 수
+DETAIL_ATTACHMENT_LIMIT = 20
+DETAIL_DEFAULT_BODY = 'article, main, #content, #contents'
+DETAIL_STRIP_TAGS = ['script', 'style', 'noscript', 'header', 'footer', 'nav']
+# '접수기간 : 2025.12.01 ~ 2025.12.20', '마감일 2025-12-20' 등 (기간이면 끝 날짜가 마감일)
+DEADLINE_RE = re.compile(
+    r'(?:마감|접수\s*기간|신청\s*기간|모집\s*기간|공모\s*기간|제출\s*기한|기한)[^\n\d]{0,20}'
+    r'(\d{4}\s*[.\-/]\s*\d{1,2}\s*[.\-/]\s*\d{1,2}'
+    r'(?:[^\n~\d]{0,20}~\s*(?:\d{4}\s*[.\-/]\s*)?\d{1,2}\s*[.\-/]\s*\d{1,2})?)'
+)
+ATTACHMENT_HREF_RE = re.compile(
+    r'\.(?:pdf|hwp|hwpx|docx?|xlsx?|pptx?|zip)(?:$|[?#])|download|filedown|file_down|attach', re.IGNORECASE
+)
+
+def extract_detail(source, html, url):
+    """상세 페이지에서 본문, 마감일, 첨부파일 링크 추출 (캐시할 수 있도록 JSON 형태로 반환)"""
+    soup = make_soup(html)
+    for tag in soup(DETAIL_STRIP_TAGS):
+        tag.decompose()
+
+    # 소스별 본문 선택자를 순서대로 시도하고, 없으면 페이지 전체
+    container = None
+    selectors = SOURCES.get(source, {}).get('detail_body') or DETAIL_DEFAULT_BODY
+    for selector in selectors.split(','):
+        container = soup.select_one(selector.strip())
+        if container:
+            break
+    container = container or soup
+
+    body = '\n'.join(line.strip() for line in container.get_text('\n').splitlines() if line.strip())
+
+    deadline = None
+    match = DEADLINE_RE.search(body)
+    if match:
+        _, deadline = parse_date_range(match.group(1))
+
+    # 첨부파일은 본문 밖(별도 첨부 영역)에 있는 경우가 많아 페이지 전체에서 찾음
+    attachments = []
+    seen = set()
+    for link_tag in soup.find_all('a', href=True):
+        href = link_tag['href'].strip()
+        name = link_tag.get_text(strip=True)
+        if href.startswith(('javascript:', '#', 'mailto:')):
+            continue
+        if not (ATTACHMENT_HREF_RE.search(href) or ATTACHMENT_HREF_RE.search(name)):
+            continue
+        file_url = urljoin(url, href)
+        if file_url in seen:
+            continue
+        seen.add(file_url)
+        attachments.append({'name': name or file_url.rsplit('/', 1)[-1], 'url': file_url})
+        if len(attachments) >= DETAIL_ATTACHMENT_LIMIT:
+            break
+
+    return {
+        'body': body[:DETAIL_BODY_LIMIT],
+        'deadline': deadline.isoformat() if deadline else None,
+        'attachments': attachments,
+    }
+
+def fetch_detail(source, url):
+    """상세 페이지 추출 결과 (URL 캐시 → 다운로드 → 같은 본문 해시 캐시 → 추출 순)"""
+    cached = state_store.detail_get(url)
+    if cached is not None:
+        return cached
+
+    response = http_get(url, source=source)
+    if response.status_code != 200:
+        return None
+    response.encoding = response.apparent_encoding or SOURCES.get(source, {}).get('fallback_encoding')
+    content_hash = hashlib.sha256(response.content).hexdigest()
+    extracted = state_store.detail_get_by_hash(content_hash)
+    if extracted is None:
+        extracted = extract_detail(source, response.text, url)
+    state_store.detail_put(url, content_hash, extracted)
+    return extracted
+
+def detail_fields(extracted):
+    """상세 추출 결과 → Firestore에 저장할 필드"""
+    deadline = extracted.get('deadline')
+    return {
+        'body': extracted.get('body', ''),
+        'deadline': datetime.fromisoformat(deadline) if deadline else None,
+        'attachments': extracted.get('attachments', []),
+    }
+
+_enrich_executor = None
+
+def _enrich_pool():
+    global _enrich_executor
+    with _http_lock:
+        if _enrich_executor is None:
+            _enrich_executor = ThreadPoolExecutor(max_workers=ENRICH_WORKERS, thread_name_prefix='enrich')
+        return _enrich_executor
+
+def enrich_items(source, links):
+    """신규 글 링크들의 상세 정보를 작업자 풀에서 동시에 가져오기 {link: 필드}
+
+    ENRICH_TIMEOUT 안에 끝나지 않거나 실패한 글은 상세 정보 없이 저장됩니다.
+    """
+    futures = {_enrich_pool().submit(fetch_detail, source, link): link for link in links}
+    done, not_done = wait(futures, timeout=ENRICH_TIMEOUT)
+
+    details = {}
+    for future in done:
+        link = futures[future]
+        try:
+            extracted = future.result()
+        except Exception as e:
+            print(f"  ⚠️ [상세 페이지 실패] {link} | {e}")
+            continue
+        if extracted:
+            details[link] = detail_fields(extracted)
+    for future in not_done:
+        future.cancel()
+    if not_done:
+        print(f"  ⏱️ [상세 페이지] {len(not_done)}건은 {ENRICH_TIMEOUT:.0f}초 안에 끝나지 않아 건너뜁니다.")
+    return details
+
+# --- 목록 페이지 추출 ---
+# 행마다 다시 컴파일하지 않도록 정규식은 모듈 로드 시 한 번만 컴파일합니다.
+DATE_RE = re.compile(r'\d{4}[.-]\d{2}[.-]\d{2}')
+REG_DATE_RE = re.compile(r'등록일\s*:\s*(\d{4}[.-]\d{2}[.-]\d{2})')
+# 예: goView3('729895','/board.es?mid=a10601020000&bid=0034&act=view&list_no=729895&tag=&nPage=1');
+LH_ONCLICK_PATH_RE = re.compile(r"['\"](/board\.es\?[^'\"]+)['\"]")
+LH_ONCLICK_LIST_NO_RE = re.compile(r"['\"]?(\d{4,})['\"]?")
+KAMS_NEW_RE = re.compile(r'\s*\[new\]\s*', re.IGNORECASE)
+# archives/숫자 형태의 게시물 링크 (카테고리 링크 제외)
+ARCHIVE_ID_RE = re.compile(r'/archives/(\d+)(?:[/?]|$)')
+SEOUL_DATE_SELECTOR = '.date, .post-date, time, [class*="date"], [datetime]'
+
+SEOUL_BASE_URL = "https://news.seoul.go.kr"
+KAMS_BASE_URL = "https://gokams.or.kr"
+KAMS_LIST_BASE_URL = "https://gokams.or.kr/01_news/"
+
+def _find_date_text(texts, default=''):
+    """셀 텍스트 목록에서 날짜 형식이 들어 있는 첫 텍스트"""
+    for text in texts:
+        if DATE_RE.search(text):
+            return text
+    return default
+
+def _absolute_link(href, site_url, list_url):
+    """목록의 href를 절대 URL로 변환"""
+    if href.startswith('/'):
+        return urljoin(site_url, href)
+    if href.startswith('http'):
+        return href
+    return urljoin(list_url, href)
+
+def extract_lh_row(row):
+    """LH 게시판 한 행에서 게시물 정보 추출 (게시물이 아니면 None)"""
+    cells = row.find_all(['td', 'th'])
+    if len(cells) < 3:
+        return None
+
+    link_tag = row.find('a')
+    if not link_tag:
+        return None
+
+    link_path = link_tag.get('href', '').strip()
+    onclick = link_tag.get('onclick', '')
+    final_link = ""
+
+    if link_path and not link_path.startswith('java') and link_path != '#' and link_path != '#none':
+        final_link = urljoin(LH_BASE_URL, link_path)
+    elif onclick:
+        # onclick에서 실제 링크 경로 추출
+        match = LH_ONCLICK_PATH_RE.search(onclick)
+        if match:
+            final_link = urljoin(LH_BASE_URL, match.group(1))
+        else:
+            # 폴백: list_no만 추출해서 링크 생성
+            match = LH_ONCLICK_LIST_NO_RE.search(onclick)
+            if match:
+                list_no = match.group(1)
+                final_link = f"{LH_BASE_URL}/board.es?mid={BOARD_MID}&bid={BOARD_BID}&act=view&list_no={list_no}&tag=&nPage=1"
+
+    if not final_link:
+        return None
+
+    # 셀 텍스트는 한 번만 계산
+    texts = [cell.get_text(strip=True) for cell in cells]
+
+    # 날짜 추출 (보통 뒤에서 두 번째 칸, 없으면 날짜 형식이 있는 첫 칸)
+    date_text = texts[-2]
+    if not DATE_RE.search(date_text):
+        date_text = _find_date_text(texts, date_text)
+
+    return {
+        'number': texts[0],
+        'title': link_tag.get_text(strip=True).replace('새글', '').strip(),
+        'date': date_text,
+        'link': final_link
+    }
+
+def extract_kams_row(row):
+    """KAMS 게시판 한 행에서 게시물 정보 추출 (게시물이 아니면 None)"""
+    cells = row.find_all('td')
+    if len(cells) < 4:  # 최소 4개 셀 필요
+        return None
+
+    # 제목과 링크 추출
+    link_tag = row.find('a')
+    if not link_tag:
+        return None
+
+    # "new" 이미지 텍스트 제거
+    title = KAMS_NEW_RE.sub('', link_tag.get_text(strip=True))
+    if not title:
+        return None
+
+    href = link_tag.get('href', '')
+    if not href or href == '#':
+        return None
+
+    texts = [cell.get_text(strip=True) for cell in cells]
+
+    return {
+        'number': texts[0],
+        'title': title,
+        # 날짜 패턴 찾기 (YYYY-MM-DD 또는 YYYY-MM-DD ~ MM-DD)
+        'date': _find_date_text(texts) or '날짜 없음',
+        'link': _absolute_link(href, KAMS_BASE_URL, KAMS_LIST_BASE_URL)
+    }
+
+def _archive_title(link_tag, min_length):
+    """archives/숫자 링크이고 의미있는 텍스트가 있으면 (href, 제목), 아니면 None"""
+    href = link_tag.get('href', '')
+    if not ARCHIVE_ID_RE.search(href):
+        return None
+    text = link_tag.get_text(strip=True)
+    if len(text) <= min_length:
+        return None
+    return href, text
+
+def extract_seoul_item(link_tag, list_url):
+    """서울 디자인 뉴스 목록의 링크 하나에서 게시물 정보 추출"""
+    found = _archive_title(link_tag, 5)
+    if not found:
+        return None
+    href, title = found
+
+    # 날짜 추출 (부모 요소에서 찾기)
+    date_text = '날짜 없음'
+    parent = link_tag.parent
+    if parent:
+        date_element = parent.select_one(SEOUL_DATE_SELECTOR)
+        if date_element:
+            date_text = date_element.get_text(strip=True)
+            if not date_text and date_element.get('datetime'):
+                date_text = date_element.get('datetime')
+        else:
+            # 텍스트에서 날짜 패턴 찾기
+            date_match = DATE_RE.search(parent.get_text())
+            if date_match:
+                date_text = date_match.group(0)
+
+    return {
+        'number': '',
+        'title': title,
+        'date': date_text,
+        'link': _absolute_link(href, SEOUL_BASE_URL, list_url)
+    }
+
+def extract_public_art_item(link_tag, list_url):
+    """서울 공공미술 소식 목록의 링크 하나에서 게시물 정보 추출"""
+    found = _archive_title(link_tag, 10)
+    if not found:
+        return None
+    href, title = found
+
+    # 날짜 찾기 (부모 요소에서)
+    date_text = '날짜 없음'
+    parent = link_tag.parent
+    if parent:
+        parent_text = parent.get_text()
+        # "등록일 : 2025-12-08" 형식 우선, 없으면 일반 날짜 패턴
+        date_match = REG_DATE_RE.search(parent_text)
+        if date_match:
+            date_text = date_match.group(1)
+        else:
+            date_match = DATE_RE.search(parent_text)
+            if date_match:
+                date_text = date_match.group(0)
+
+    return {
+        'number': '',
+        'title': title,
+        'date': date_text,
+        'link': _absolute_link(href, SEOUL_BASE_URL, list_url)
+    }
+
+def _extract_all(elements, extractor, *args):
+    """요소마다 추출 함수를 적용해 게시물을 하나씩 내보냄 (추출 실패한 항목은 건너뜀)"""
+    for element in elements:
+        try:
+            item = extractor(element, *args)
+        except Exception as e:
+            print(f"  ⚠️ 항목 파싱 오류: {e}")
+            continue
+        if item:
+            yield item
+
+def parse_board_table(html, spec, list_url):
+    """게시판 테이블형 목록: 행 선택자로 행을 찾아 행 추출 함수 적용"""
+    soup = make_soup(html, BOARD_TABLE_TAGS)
+    yield from _extract_all(soup.select(spec['rows']), spec['row'])
+
+def parse_archive_links(html, spec, list_url):
+    """서울시 archives 링크형 목록: 링크마다 항목 추출 함수 적용 (dedup이면 같은 링크는 한 번만)"""
+    seen_links = set()
+    for item in _extract_all(find_archive_links(html), spec['item'], list_url):
+        if spec.get('dedup'):
+            if item['link'] in seen_links:
+                continue
+            seen_links.add(item['link'])
+        yield item
+
+LH_LIST_NO_RE = re.compile(r'list_no=(\d+)')
+
+def lh_item_id(item):
+    """LH 게시물 번호 (상단 고정 공지처럼 번호 칸이 숫자가 아닌 글은 None)"""
+    if not item.get('number', '').isdigit():
+        return None
+    match = LH_LIST_NO_RE.search(item['link'])
+    return int(match.group(1)) if match else int(item['number'])
+
+def archive_item_id(item):
+    """서울시 archives 글 번호"""
+    match = ARCHIVE_ID_RE.search(item['link'])
+    return int(match.group(1)) if match else None
+
+# 추출 방식(kind) → 목록 파싱 함수
+LIST_PARSERS = {
+    'board_table': parse_board_table,
+    'archive_links': parse_archive_links,
+}
+
+# --- 소스 레지스트리 ---
+# 새 소스는 여기에 설정만 추가하면 같은 파이프라인(조건부 요청, 일괄 저장, 알림 묶음 발송,
+# 동시 크롤링)을 그대로 사용합니다.
+#   name: 알림 제목 / label: 로그 표시용 이름 / url: 목록 페이지
+#   extract: 추출 방식과 선택자, 행(항목) 추출 함수
+#   fallback_encoding: 인코딩 추정 실패 시 사용할 인코딩
+#   poll_interval: 기본 확인 주기(초) / digest_threshold: 요약 알림 기준 건수 (None이면 공통 기준)
+#   pagination: 2페이지 이후 URL 형식과 최대 페이지 수 (None이면 첫 페이지만)
+#   item_id: 게시물 → 증가하는 글 번호 (watermark 비교용)
+#   detail_body: 상세 페이지 본문 선택자 (앞에서부터 시도, 상세 페이지 보강용)
+MAX_PAGES = int(os.environ.get('CRAWLER_MAX_PAGES', '10'))
+
+SOURCES = {
+    'LH': {
+        'name': 'LH 공모 알림',
+        'label': 'LH',
+        'url': f"{LH_BASE_URL}/board.es?mid={BOARD_MID}&bid={BOARD_BID}",
+        'extract': {'kind': 'board_table', 'rows': 'table tbody tr', 'row': extract_lh_row},
+        'fallback_encoding': None,
+        'poll_interval': 4 * 3600,
+        'digest_threshold': None,
+        'pagination': {'url': f"{LH_BASE_URL}/board.es?mid={BOARD_MID}&bid={BOARD_BID}&nPage={{page}}", 'max_pages': MAX_PAGES},
+        'item_id': lh_item_id,
+        'detail_body': ".bbs_ViewA, .view_cont, .board_view, #contents",
+    },
+    'KAMS': {
+        'name': '예술경영지원센터 알림',
+        'label': 'KAMS',
+        'url': "https://gokams.or.kr/01_news/event_list.aspx",
+        'extract': {'kind': 'board_table', 'rows': 'table tbody tr, table tr', 'row': extract_kams_row},
+        'fallback_encoding': 'utf-8',
+        'poll_interval': 4 * 3600,
+        'digest_threshold': None,
+        'pagination': None,
+        'item_id': None,
+        'detail_body': ".board_view, .view_con, .bbs_view, #contents",
+    },
+    'Seoul': {
+        'name': '서울 공공디자인 알림',
+        'label': 'Seoul',
+        'url': "https://news.seoul.go.kr/culture/archives/category/design-news_c1/business_design_c1/news_design-news-n1",
+        'extract': {'kind': 'archive_links', 'item': extract_seoul_item, 'dedup': False},
+        'fallback_encoding': 'utf-8',
+        'poll_interval': 4 * 3600,
+        'digest_threshold': None,
+        'pagination': {'url': "https://news.seoul.go.kr/culture/archives/category/design-news_c1/business_design_c1/news_design-news-n1/page/{page}", 'max_pages': MAX_PAGES},
+        'item_id': archive_item_id,
+        'detail_body': ".post-content, .entry-content, article, #content",
+    },
+    'SeoulPublicArt': {
+        'name': '서울 공공미술 공모 알림',
+        'label': 'Seoul 공공미술 소식',
+        'url': "https://news.seoul.go.kr/culture/archives/category/design-news_c1/business_design_c1/public-art-news-n1",
+        'extract': {'kind': 'archive_links', 'item': extract_public_art_item, 'dedup': True},
+        'fallback_encoding': 'utf-8',
+        'poll_interval': 4 * 3600,
+        'digest_threshold': None,
+        'pagination': {'url': "https://news.seoul.go.kr/culture/archives/category/design-news_c1/business_design_c1/public-art-news-n1/page/{page}", 'max_pages': MAX_PAGES},
+        'item_id': archive_item_id,
+        'detail_body': ".post-content, .entry-content, article, #content",
+    },
+}
+
+def iter_listing(source, html):
+    """소스 설정에 따라 목록 페이지 HTML에서 게시물을 하나씩 추출"""
+    config = SOURCES[source]
+    spec = config['extract']
+    return LIST_PARSERS[spec['kind']](html, spec, config['url'])
+
+def parse_listing(source, html):
+    """소스 설정에 따라 목록 페이지 HTML → 게시물 목록"""
+    return list(iter_listing(source, html))
+
+# --- 스트리밍 파이프라인 ---
+# 가져오기/추출 단계는 별도 스레드에서 돌며 bounded queue로 저장 단계에 행을 넘깁니다.
+# 큐가 가득 차면 앞 단계가 기다리므로(backpressure) 페이지가 많아도 메모리 사용량이 일정하고,
+# 저장된 신규 글은 소스 크롤링이 끝나면 알림 발송 스레드(NotificationDispatcher)가 묶어서 발송합니다.
+PIPELINE_QUEUE_SIZE = 100    # 단계 사이 큐에 쌓아둘 최대 이벤트 수
+PIPELINE_BATCH_SIZE = 20     # 중복 확인/저장을 한 번에 처리할 행 수
+NOTIFY_LINGER = float(os.environ.get('CRAWLER_NOTIFY_LINGER', '2'))  # 알림을 모아 보내기 전 대기(초)
+NOTIFY_MAX_HOLD = float(os.environ.get('CRAWLER_NOTIFY_MAX_HOLD', '60'))  # 크롤링 중인 소스의 알림을 모아 둘 최대 시간(초)
+
+_STAGE_END = object()
+
+class _StageError:
+    def __init__(self, error):
+        self.error = error
+
+def run_stage(events, maxsize=PIPELINE_QUEUE_SIZE):
+    """제너레이터를 별도 스레드에서 실행하고 bounded queue를 통해 결과를 하나씩 내보냄
+
+    소비하는 쪽이 중간에 멈추면 생산 스레드도 멈춥니다.
+    생산 쪽에서 난 예외는 소비하는 쪽에서 다시 발생합니다.
+    """
+    return run_stages([events], maxsize)
+
+def run_stages(event_sources, maxsize=PIPELINE_QUEUE_SIZE, name='crawl-stage'):
+    """여러 제너레이터를 각각 스레드에서 동시에 실행하고 결과를 하나의 bounded queue로 합침
+
+    결과 순서는 생산 순서대로 섞입니다. 나머지 동작은 run_stage와 같습니다.
+    """
+    q = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
             try:
-                link_tag = item_data['link']
-                href = item_data['href']
-                title = item_data['text']
-                
-                if not title or not href:
-                    continue
-                
-                # 절대 URL로 변환
-                if href.startswith('/'):
-                    final_link = urljoin('https://news.seoul.go.kr', href)
-                elif href.startswith('http'):
-                    final_link = href
-                else:
-                    final_link = urljoin(list_url, href)
-                
-                # 날짜 추출 (부모 요소에서 찾기)
-                date_text = '날짜 없음'
-                parent = link_tag.parent
-                if parent:
-                    # 부모 요소에서 날짜 찾기
-                    date_elements = parent.select('.date, .post-date, time, [class*="date"], [datetime]')
-                    if date_elements:
-                        date_text = date_elements[0].get_text(strip=True)
-                        if not date_text and date_elements[0].get('datetime'):
-                            date_text = date_elements[0].get('datetime')
-                    else:
-                        # 텍스트에서 날짜 패턴 찾기
-                        text = parent.get_text()
-                        date_match = re.search(r'(\d{4}[.-]\d{2}[.-]\d{2})', text)
-                        if date_match:
-                            date_text = date_match.group(1)
-                
-                results.append({
-                    'number': '',
-                    'title': title,
-                    'date': date_text,
-                    'link': final_link
-                })
-            except Exception as e:
-                print(f"  ⚠️ 항목 파싱 오류: {e}")
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker(events):
+        try:
+            for event in events:
+                if not put(event):
+                    return
+        except Exception as e:
+            put(_StageError(e))
+        finally:
+            put(_STAGE_END)
+
+    remaining = 0
+    for index, events in enumerate(event_sources):
+        thread = threading.Thread(target=worker, args=(events,), name=f'{name}-{index}', daemon=True)
+        thread.start()
+        remaining += 1
+    try:
+        while remaining:
+            item = q.get()
+            if item is _STAGE_END:
+                remaining -= 1
                 continue
+            if isinstance(item, _StageError):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+
+def fetch_stage(source, cursor):
+    """가져오기 단계: 목록 페이지를 ('page', url, html, validators)로 내보냄
+
+    첫 페이지가 이전 실행과 같으면 아무것도 내보내지 않습니다.
+    페이지 설정이 있는 소스는 저장된 watermark(마지막으로 본 가장 큰 글 번호)에 닿을 때까지
+    다음 페이지로 넘어갑니다. 평소에는 첫 페이지에서 멈추고, 한 페이지를 넘는 신규 글이
+    쌓였을 때만 더 읽습니다. watermark가 없으면(첫 실행) 첫 페이지만 읽습니다.
+    최대 페이지까지 읽고도 watermark에 닿지 않으면 cursor['watermark_missed']를 표시합니다
+    (그 사이 글을 읽지 못했으므로 crawl_source가 watermark를 옮기지 않음).
+    """
+    config = SOURCES[source]
+    pagination = config.get('pagination')
+    watermark = state_store.get_watermark(source) if pagination else None
+    max_pages = pagination['max_pages'] if watermark is not None else 1
 
-        if results:
-            print(f"총 {len(results)}건의 Seoul 게시물을 처리합니다...")
-            db = init_firebase()
-            new_count = 0
-            for item in results:
-                if check_and_save(db, item, source='Seoul'):
-                    new_count += 1
-            print(f"\n=== Seoul 실행 완료: {new_count}건 신규 저장 및 알림 전송 ===")
+    for page in range(1, max_pages + 1):
+        if page == 1:
+            url = config['url']
+            html, validators = fetch_page(url, fallback_encoding=config['fallback_encoding'], source=source)
+            if html is None:
+                metrics.count('pages_unchanged', source)
+                print(f"✅ {config['label']} 목록에 변경이 없어 건너뜁니다.")
+                return
         else:
-            print("\nSeoul 게시물이 없습니다.")
+            url = pagination['url'].format(page=page)
+            html, validators = fetch_page(url, fallback_encoding=config['fallback_encoding'], conditional=False,
+                                          source=source)
+
+        cursor['reached_watermark'] = False
+        yield ('page', url, html, validators)
+
+        # extract_stage가 이 페이지를 다 읽은 뒤에 다음 페이지 여부를 판단
+        if cursor['reached_watermark'] or not cursor['last_page_rows']:
+            return
+        if page == max_pages and max_pages > 1:
+            cursor['watermark_missed'] = True
+            metrics.count('watermark_missed', source)
+            print(f"⚠️ {config['label']} 최대 {max_pages}페이지까지 읽었지만 watermark에 닿지 않았습니다. "
+                  f"읽지 못한 글이 있어 watermark를 유지합니다 (CRAWLER_MAX_PAGES를 늘려 보세요).")
+
+def extract_stage(source, pages, cursor):
+    """추출 단계: 페이지마다 ('row', 게시물)을 내보내고 끝에 ('page_done', url, validators, 행 수)
+
+    watermark 이하의 글 번호가 나오면 cursor에 표시해 가져오기 단계가 다음 페이지로 가지 않게 합니다.
+    """
+    config = SOURCES[source]
+    item_id = config.get('item_id')
+    watermark = state_store.get_watermark(source) if item_id else None
+
+    for _, url, html, validators in pages:
+        count = 0
+        for item in metrics.timed_iter(iter_listing(source, html), 'parse', source):
+            count += 1
+            if item_id:
+                number = item_id(item)
+                if number is not None:
+                    cursor['max_id'] = max(cursor.get('max_id') or 0, number)
+                    if watermark is not None and number <= watermark:
+                        cursor['reached_watermark'] = True
+            yield ('row', item)
+        cursor['last_page_rows'] = count
+        metrics.count('pages', source)
+        metrics.count('rows', source, value=count)
+        yield ('page_done', url, validators, count)
+
+def persist_stage(source, events):
+    """저장 단계: 행을 PIPELINE_BATCH_SIZE씩 모아 중복 확인/저장하고 알림 대기열에 추가
+
+    페이지의 행이 모두 저장된 뒤에만 그 페이지의 검증값을 기록합니다.
+    통계 dict(rows, new, pages, empty_pages, failed)를 반환합니다.
+    """
+    stats = {'rows': 0, 'new': 0, 'pages': 0, 'empty_pages': 0, 'failed': False}
+    batch = []
+
+    def flush():
+        if not batch:
+            return True
+        # 저장소는 로컬 seen 인덱스에 없는 글이 있을 때만 열림
+        new_count = check_and_save_batch(None, batch, source=source)
+        batch.clear()
+        if new_count is None:
+            return False
+        if new_count:
+            stats['new'] += new_count
+            wake_notification_dispatcher()
+        return True
+
+    for event in events:
+        if event[0] == 'row':
+            stats['rows'] += 1
+            batch.append(event[1])
+            if len(batch) >= PIPELINE_BATCH_SIZE and not flush():
+                stats['failed'] = True
+                return stats
+        elif event[0] == 'page_done':
+            _, url, validators, count = event
+            stats['pages'] += 1
+            if not flush():
+                stats['failed'] = True
+                return stats
+            if count:
+                remember_page(url, validators)
+            else:
+                stats['empty_pages'] += 1
+
+    if not flush():
+        stats['failed'] = True
+    return stats
+
+def crawl_source(source):
+    """소스 하나 크롤링: 가져오기 → 추출 → 중복 확인/저장 → 알림 (스트리밍)"""
+    config = SOURCES[source]
+    label = config['label']
+    print(f"--- {label} 크롤링 시작: {config['url']} ---")
+
+    # 이 소스의 첫 신규 글 알림은 바로, 나머지는 크롤링이 끝난 뒤 한 번에 묶어 발송
+    hold_notifications(source)
+    try:
+        cursor = {}
+        events = run_stage(extract_stage(source, fetch_stage(source, cursor), cursor))
+        stats = persist_stage(source, events)
+
+        # 모두 저장됐고 이전 watermark까지 빠짐없이 읽은 경우에만 watermark를 앞으로 옮김
+        if not stats['failed'] and not cursor.get('watermark_missed') and cursor.get('max_id'):
+            if cursor['max_id'] > (state_store.get_watermark(source) or 0):
+                state_store.set_watermark(source, cursor['max_id'])
+        if stats['pages'] > 1:
+            print(f"  📄 {label} {stats['pages']}페이지까지 확인")
+        if not stats['failed']:
+            interval = record_poll(source, stats['new'])
+            print(f"  🕒 {label} 다음 확인까지 {interval / 3600:.1f}시간")
+
+        if stats['failed']:
+            print(f"\n⚠️ {label} DB 저장 실패: 다음 실행에서 다시 확인합니다.")
+        elif stats['pages'] and not stats['rows']:
+            print(f"❌ {label} 게시물을 찾을 수 없습니다.")
+        elif stats['pages']:
+            print(f"\n=== {label} 실행 완료: {stats['rows']}건 중 {stats['new']}건 신규 저장 및 알림 전송 ===")
+        return stats
 
     except Exception as e:
-        print(f"Seoul 크롤링 에러 발생: {e}")
+        print(f"{label} 크롤링 에러 발생: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        release_notifications(source)
+
+def crawl_lh_notice():
+    return crawl_source('LH')
+
+def crawl_kams_notice():
+    """KAMS 예술경영지원센터 크롤링"""
+    return crawl_source('KAMS')
+
+def crawl_seoul_notice():
+    """서울 공공디자인 크롤링 (디자인 뉴스)"""
+    return crawl_source('Seoul')
 
 def crawl_seoul_public_art():
     """서울 공공미술 소식 크롤링"""
-    list_url = "https://news.seoul.go.kr/culture/archives/category/design-news_c1/business_design_c1/public-art-news-n1"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    
-    print(f"--- Seoul 공공미술 소식 크롤링 시작: {list_url} ---")
-    
+    return crawl_source('SeoulPublicArt')
+
+# --- 적응형 확인 주기 ---
+# 소스마다 신규 글이 발견된 시각과 건수를 기록하고, 관측 구간의 평균 도착 간격에
+# POLL_TARGET_RATIO를 곱한 값을 다음 확인 주기로 씁니다 (최소/최대 범위 안에서).
+# 글이 자주 올라오는 소스는 더 자주, 조용한 소스는 더 드물게 확인합니다.
+# 최소 주기는 GitHub Actions 예약 실행 간격(2시간)과 같게 둡니다.
+POLL_MIN_INTERVAL = float(os.environ.get('CRAWLER_POLL_MIN_INTERVAL', str(2 * 3600)))
+POLL_MAX_INTERVAL = float(os.environ.get('CRAWLER_POLL_MAX_INTERVAL', str(24 * 3600)))
+POLL_TARGET_RATIO = float(os.environ.get('CRAWLER_POLL_TARGET_RATIO', '0.5'))
+POLL_RATE_WINDOW = 14 * 24 * 3600  # 도착 간격을 계산할 최근 구간(초)
+POLL_MIN_OBSERVATION = 24 * 3600  # 이보다 짧게 관측했으면 기본 주기 사용
+POLL_DUE_SLACK = 5 * 60  # cron 실행 시각이 조금 이르게 잡혀도 확인 대상에 포함
+# 하루 확인 횟수 상한 (모든 소스 합계, 0이면 제한 없음)
+# 기본값은 적응형 주기 도입 전(4시간마다 모든 소스 확인)과 같은 소스당 하루 6회
+# 직접 정하지 않았으면 데몬 모드에서 최소 주기를 줄인 만큼 늘림 (configure_daemon)
+POLL_DAILY_BUDGET = float(os.environ.get('CRAWLER_POLL_DAILY_BUDGET', str(6 * len(SOURCES))))
+POLL_BUDGET_FROM_ENV = 'CRAWLER_POLL_DAILY_BUDGET' in os.environ
+
+def compute_poll_interval(source, tracking_since, now):
+    """관측된 신규 글 도착 간격으로 다음 확인 주기(초) 계산"""
+    window_start = max(now - POLL_RATE_WINDOW, tracking_since)
+    observed = now - window_start
+    if observed < POLL_MIN_OBSERVATION:
+        return SOURCES[source]['poll_interval']
+
+    arrived = sum(count for _, count in state_store.arrivals_since(source, window_start))
+    # 한 건도 없었다면 도착 간격은 최소한 관측 구간보다 김
+    mean_gap = observed / arrived if arrived else observed
+    return min(max(mean_gap * POLL_TARGET_RATIO, POLL_MIN_INTERVAL), POLL_MAX_INTERVAL)
+
+def apply_poll_budget(source, interval, schedules=None):
+    """모든 소스의 하루 확인 횟수 합계가 POLL_DAILY_BUDGET을 넘지 않도록 주기를 늘림
+
+    이 소스는 남은 횟수(상한 - 다른 소스의 저장된 주기 기준 횟수)까지 쓸 수 있고,
+    다른 소스가 상한을 다 써도 균등 배분(상한 / 소스 수)만큼은 확인합니다.
+    """
+    if POLL_DAILY_BUDGET <= 0:
+        return interval
+    schedules = state_store.get_schedules() if schedules is None else schedules
+    others = sum(
+        86400 / (schedules[other]['interval'] if other in schedules else config['poll_interval'])
+        for other, config in SOURCES.items() if other != source
+    )
+    allowed = max(POLL_DAILY_BUDGET / len(SOURCES), POLL_DAILY_BUDGET - others)
+    return min(max(interval, 86400 / allowed), POLL_MAX_INTERVAL)
+
+def record_poll(source, new_count, now=None):
+    """확인 결과를 기록하고 다음 확인 예정 시각을 정함 (다음 확인 주기 반환)
+
+    처음 확인할 때 발견한 글은 그동안 쌓인 과거 글이므로 도착 기록에 넣지 않습니다.
+    """
+    now = now or time.time()
+    schedule = state_store.get_schedule(source)
+    if schedule is None:
+        tracking_since = now
+    else:
+        tracking_since = schedule['tracking_since']
+        if new_count:
+            state_store.arrivals_add(source, now, new_count)
+    state_store.arrivals_prune(now - POLL_RATE_WINDOW)
+
+    interval = apply_poll_budget(source, compute_poll_interval(source, tracking_since, now))
+    state_store.save_schedule(source, tracking_since, now, interval, now + interval)
+    return interval
+
+def due_sources(now=None):
+    """확인 예정 시각이 지난 소스 목록 (기록이 없는 소스 포함)"""
+    now = now or time.time()
+    schedules = state_store.get_schedules()
+    return [
+        source for source in SOURCES
+        if source not in schedules or schedules[source]['next_due'] - POLL_DUE_SLACK <= now
+    ]
+
+def print_poll_schedule(now=None):
+    """소스별 확인 주기와 다음 확인까지 남은 시간 출력"""
+    now = now or time.time()
+    schedules = state_store.get_schedules()
+    for source in SOURCES:
+        schedule = schedules.get(source)
+        if schedule is None:
+            print(f"  - {source}: 기록 없음 (바로 확인)")
+        else:
+            remaining = max(schedule['next_due'] - now, 0)
+            print(f"  - {source}: 주기 {schedule['interval'] / 3600:.1f}시간, 다음 확인까지 {remaining / 3600:.1f}시간")
+
+def _run_source(source, crawl_func, started, finished):
+    """스레드 안에서 소스 하나를 실행하고 시작/종료 시각을 기록"""
+    started[source] = time.monotonic()
     try:
-        response = requests.get(list_url, headers=headers, timeout=15)
-        response.encoding = response.apparent_encoding or 'utf-8'
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 모든 링크에서 실제 게시물 링크 찾기 (archives/숫자 형태)
-        all_links = soup.find_all('a', href=True)
-        articles = []
-        
-        for link in all_links:
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
-            
-            # archives/숫자 형태의 링크만 (카테고리 링크 제외)
-            if '/archives/' in href:
-                # URL에서 숫자 ID 추출
-                parts = href.split('/archives/')
-                if len(parts) > 1:
-                    id_part = parts[1].split('?')[0].split('/')[0]
-                    # 숫자로만 이루어진 ID만 (카테고리 링크 제외)
-                    if id_part.isdigit() and text and len(text) > 10:
-                        # 중복 제거
-                        if not any(a['link'] == href for a in articles):
-                            # 날짜 찾기 (부모 요소에서)
-                            date_text = '날짜 없음'
-                            parent = link.parent
-                            if parent:
-                                # 부모의 텍스트에서 날짜 찾기
-                                parent_text = parent.get_text()
-                                # "등록일 : 2025-12-08" 형식 찾기
-                                date_match = re.search(r'등록일\s*:\s*(\d{4}[.-]\d{2}[.-]\d{2})', parent_text)
-                                if date_match:
-                                    date_text = date_match.group(1)
-                                else:
-                                    # 일반 날짜 패턴 찾기
-                                    date_match = re.search(r'(\d{4}[.-]\d{2}[.-]\d{2})', parent_text)
-                                    if date_match:
-                                        date_text = date_match.group(1)
-                            
-                            # 절대 URL로 변환
-                            if href.startswith('/'):
-                                final_link = urljoin('https://news.seoul.go.kr', href)
-                            elif href.startswith('http'):
-                                final_link = href
-                            else:
-                                final_link = urljoin(list_url, href)
-                            
-                            articles.append({
-                                'title': text,
-                                'link': final_link,
-                                'date': date_text
-                            })
-        
-        if not articles:
-            print("❌ Seoul 공공미술 소식 게시물을 찾을 수 없습니다.")
-            return
+        crawl_func()
+    finally:
+        finished[source] = time.monotonic()
 
-        results = []
-        for article in articles:
-            results.append({
-                'number': '',
-                'title': article['title'],
-                'date': article['date'],
-                'link': article['link']
-            })
+def run_all_sources(crawlers=None, max_workers=None, timeout=None):
+    """모든 소스를 동시에 크롤링 (소스별 타임아웃, 실패 격리)
+
+    한 소스가 느리거나 실패해도 나머지 소스는 영향을 받지 않으며,
+    전체 실행 시간은 가장 느린 소스의 시간에 가깝습니다.
+    """
+    global _dispatcher
+    if crawlers is None:
+        # 레지스트리의 모든 소스 (소스 키, 크롤링 함수)
+        crawlers = [(source, partial(crawl_source, source)) for source in SOURCES]
+    max_workers = max_workers or MAX_CONCURRENT_SOURCES
+    timeout = timeout if timeout is not None else SOURCE_TIMEOUT
+
+    started = {}
+    finished = {}
+    statuses = {}
+    run_start = time.monotonic()
+
+    print(f"=== {len(crawlers)}개 소스 동시 크롤링 시작 (최대 {max_workers}개 병렬, 소스별 제한 {timeout:.0f}초) ===")
+
+    # 제목 비교 기간이 지난 지문의 LSH 밴드 정리 (URL 지문은 유지)
+    state_store.fingerprints_prune(time.time() - NEAR_DUP_WINDOW)
+
+    # 크롤링과 동시에 신규 글 알림을 발송 (이전 실행에서 실패한 알림 포함)
+    # 데몬 모드처럼 이미 발송 스레드가 떠 있으면 그대로 사용
+    owns_dispatcher = _dispatcher is None
+    if owns_dispatcher:
+        _dispatcher = NotificationDispatcher().start()
+    _dispatcher.wake()
 
-        if results:
-            print(f"총 {len(results)}건의 Seoul 공공미술 소식 게시물을 처리합니다...")
-            db = init_firebase()
-            new_count = 0
-            for item in results:
-                if check_and_save(db, item, source='SeoulPublicArt'):
-                    new_count += 1
-            print(f"\n=== Seoul 공공미술 소식 실행 완료: {new_count}건 신규 저장 및 알림 전송 ===")
+    # 소스는 daemon 스레드에서 실행: 제한 시간을 넘겨 멈춰 있는 소스가 있어도
+    # 결과를 기다리지 않고 끝내며, 프로세스(GitHub Actions 작업) 종료도 막지 않음
+    jobs = queue.Queue()
+    for source, crawl_func in crawlers:
+        jobs.put((source, crawl_func))
+    results = queue.Queue()
+    cancelled = threading.Event()
+
+    def worker():
+        while not cancelled.is_set():
+            try:
+                source, crawl_func = jobs.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                _run_source(source, crawl_func, started, finished)
+                results.put((source, None))
+            except Exception as e:
+                results.put((source, e))
+
+    def start_worker():
+        threading.Thread(target=worker, name='crawl', daemon=True).start()
+
+    for _ in range(min(max_workers, len(crawlers))):
+        start_worker()
+
+    try:
+        while len(statuses) < len(crawlers):
+            try:
+                source, error = results.get(timeout=1)
+            except queue.Empty:
+                pass
+            else:
+                # 제한 시간을 넘긴 뒤에 끝난 소스는 이미 timeout으로 기록됨
+                if source not in statuses:
+                    if error is None:
+                        statuses[source] = 'ok'
+                    else:
+                        statuses[source] = 'error'
+                        print(f"⚠️ [{source}] 크롤링 실패 (다른 소스는 계속 진행): {error}")
+
+            # 실행 중인 소스 중 제한 시간을 넘긴 것은 더 기다리지 않고,
+            # 그 스레드 대신 새 작업자를 띄워 대기 중인 소스가 계속 실행되게 함
+            now = time.monotonic()
+            for source, _ in crawlers:
+                if source in started and source not in statuses and source not in finished \
+                        and now - started[source] > timeout:
+                    statuses[source] = 'timeout'
+                    print(f"⏱️ [{source}] {timeout:.0f}초 제한 초과로 결과를 기다리지 않습니다.")
+                    if not jobs.empty():
+                        start_worker()
+    finally:
+        # 아직 시작하지 않은 소스는 취소 (멈춘 스레드는 daemon이라 프로세스 종료 시 함께 끝남)
+        cancelled.set()
+
+    total_elapsed = time.monotonic() - run_start
+    print(f"\n=== 전체 크롤링 종료: {total_elapsed:.1f}초 ===")
+    for source, _ in crawlers:
+        status = statuses.get(source, 'cancelled')
+        if source in started:
+            end = finished.get(source, time.monotonic())
+            print(f"  - {source}: {status} ({end - started[source]:.1f}초)")
         else:
-            print("\nSeoul 공공미술 소식 게시물이 없습니다.")
+            print(f"  - {source}: {status}")
 
-    except Exception as e:
-        print(f"Seoul 공공미술 소식 크롤링 에러 발생: {e}")
-        import traceback
-        traceback.print_exc()
+    # 남은 알림을 모두 발송한 뒤 종료
+    if owns_dispatcher:
+        dispatcher, _dispatcher = _dispatcher, None
+        dispatcher.close()
+
+    # 단계별 지표 기록 (데몬 모드에서는 실행 사이에 보낸 알림이 다음 실행 지표에 포함됨)
+    metrics.write_run(statuses, time.monotonic() - run_start)
+    return statuses
+
+# --- 데몬 모드 ---
+# 프로세스를 계속 띄워 두고 소스별 확인 예정 시각에 맞춰 크롤링합니다.
+# Firebase 앱, HTTP 연결 풀, 상태 DB 연결, 알림 발송 스레드를 실행 사이에 재사용합니다.
+DAEMON_MIN_INTERVAL = float(os.environ.get('CRAWLER_DAEMON_MIN_INTERVAL', str(15 * 60)))
+DAEMON_MAX_SLEEP = 5 * 60  # 설정 변경/시계 변화에 대비해 최대 이만큼만 쉬고 다시 확인
+
+def _seconds_until_next_due(now, retry_at):
+    """다음으로 확인할 소스까지 남은 시간(초)"""
+    schedules = state_store.get_schedules()
+    due_times = []
+    for source in SOURCES:
+        if source in retry_at:
+            due_times.append(retry_at[source])
+        elif source in schedules:
+            due_times.append(schedules[source]['next_due'] - POLL_DUE_SLACK)
+        else:
+            due_times.append(now)
+    return max(min(due_times) - now, 0)
+
+def configure_daemon(min_interval=None):
+    """데몬 모드의 최소 확인 주기 적용 (하루 확인 횟수 상한도 같은 비율로 늘림)
+
+    기본 상한은 예약 실행(최소 주기 2시간) 기준이라 그대로 두면 자주 올라오는 소스도
+    최소 주기보다 훨씬 드물게 확인합니다. CRAWLER_POLL_DAILY_BUDGET을 직접 정했으면 그 값을 씁니다.
+    """
+    global POLL_MIN_INTERVAL, POLL_DAILY_BUDGET
+    daemon_interval = min_interval or DAEMON_MIN_INTERVAL
+    if POLL_DAILY_BUDGET > 0 and not POLL_BUDGET_FROM_ENV:
+        POLL_DAILY_BUDGET *= max(POLL_MIN_INTERVAL / daemon_interval, 1)
+    POLL_MIN_INTERVAL = daemon_interval
+
+def run_daemon(min_interval=None):
+    """데몬 모드: SIGINT/SIGTERM을 받을 때까지 확인 예정인 소스를 반복 크롤링
+
+    진행 중인 크롤링은 끝까지 마치고, 대기 중인 알림을 발송한 뒤 종료합니다.
+    """
+    import signal
+
+    global _dispatcher
+    configure_daemon(min_interval)
+    stop = threading.Event()
+
+    def handle_signal(signum, frame):
+        if stop.is_set():
+            raise KeyboardInterrupt
+        print(f"\n🛑 종료 신호({signal.Signals(signum).name}) 수신: 진행 중인 크롤링을 마치고 종료합니다.")
+        stop.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    print(f"=== 데몬 모드 시작 (최소 확인 주기 {POLL_MIN_INTERVAL / 60:.0f}분, "
+          f"하루 확인 상한 {POLL_DAILY_BUDGET:.0f}회) ===")
+    # 무거운 초기화는 한 번만
+    get_storage()
+    get_http_session()
+    _dispatcher = NotificationDispatcher().start()
+
+    try:
+        # 실패해서 확인 예정 시각이 갱신되지 않은 소스는 최소 주기 뒤에 다시 시도
+        retry_at = {}
+        while not stop.is_set():
+            now = time.time()
+            sources = [source for source in due_sources(now) if retry_at.get(source, 0) <= now]
+            if sources:
+                run_all_sources([(source, partial(crawl_source, source)) for source in sources])
+                still_due = set(due_sources())
+                for source in sources:
+                    if source in still_due:
+                        retry_at[source] = time.time() + POLL_MIN_INTERVAL
+                    else:
+                        retry_at.pop(source, None)
+                print_poll_schedule()
+            else:
+                # 확인할 소스가 없어도 실패한 알림은 다시 시도
+                _dispatcher.wake()
+            stop.wait(min(_seconds_until_next_due(time.time(), retry_at), DAEMON_MAX_SLEEP))
+    finally:
+        dispatcher, _dispatcher = _dispatcher, None
+        dispatcher.close()
+        state_store.close()
+        print("=== 데몬 모드 종료 ===")
+
+def rebuild_seen_index(store=None):
+    """저장된 글 전체로 로컬 seen 인덱스와 같은 글 판별용 지문을 다시 만들기"""
+    store = as_storage(store)
+    print("--- seen 인덱스 재구성 시작 ---")
+    state_store.seen_clear()
+    state_store.fingerprints_clear()
+
+    buffer = []
+    fingerprints = []
+    total = 0
+    since = time.time() - NEAR_DUP_WINDOW
+    for doc_id, data in store.iter_notices(['source', 'link', 'title', 'created_at']):
+        buffer.append((doc_id, data.get('source', '')))
+        if data.get('link'):
+            seen_at = data['created_at'].timestamp() if hasattr(data.get('created_at'), 'timestamp') else 0
+            # 제목 비교 기간이 지난 글은 URL 지문만
+            bands = title_bands(data.get('title', ''))[1] if seen_at >= since else []
+            fingerprints.append((doc_id, data.get('source', ''), canonical_url(data['link']),
+                                 data.get('title', ''), seen_at, bands))
+        if len(buffer) >= FIRESTORE_BATCH_LIMIT:
+            total += _flush_seen(buffer)
+            state_store.fingerprints_add(fingerprints)
+            fingerprints.clear()
+    total += _flush_seen(buffer)
+    state_store.fingerprints_add(fingerprints)
+    print(f"✅ seen 인덱스 재구성 완료: {total}건")
+    return total
+
+def rebuild_feeds(store=None):
+    """저장된 글 전체로 소스별 피드 문서를 다시 만들기 (피드 도입 전 글 채우기)
+
+    다 읽은 뒤 현재 피드와 합쳐 쓰므로, 읽는 동안 크롤러가 새로 넣은 글도 빠지지 않습니다.
+    """
+    store = as_storage(store)
+    print("--- 피드 재구성 시작 ---")
+    by_source = {}
+    fields = ['number', 'title', 'date', 'link', 'source', 'created_at']
+    for doc_id, data in store.iter_notices(fields):
+        source = data.get('source', 'LH')
+        by_source.setdefault(source, []).append(feed_item(doc_id, data.get('link', ''), data, data.get('created_at')))
+
+    for source, items in by_source.items():
+        items = by_source[source] = merge_feed([], items)
+        store.update_feed(source, partial(merge_feed, new_items=items))
+        print(f"  - {source}: {len(items)}건")
+    print(f"✅ 피드 재구성 완료: {len(by_source)}개 소스")
+    return {source: len(items) for source, items in by_source.items()}
+
+def _flush_seen(buffer):
+    by_source = {}
+    for doc_id, source in buffer:
+        by_source.setdefault(source, []).append(doc_id)
+    for source, doc_ids in by_source.items():
+        state_store.seen_add(doc_ids, source)
+    count = len(buffer)
+    buffer.clear()
+    return count
 
 if __name__ == "__main__":
-    # 모든 소스 크롤링 실행
-    crawl_lh_notice()
-    crawl_kams_notice()
-    crawl_seoul_notice()
-    crawl_seoul_public_art()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='공모/공지 크롤러')
+    parser.add_argument('--rebuild-seen', action='store_true',
+                        help='notices 컬렉션으로 로컬 seen 인덱스와 중복 판별 지문을 다시 만든 뒤 종료')
+    parser.add_argument('--rebuild-feeds', action='store_true',
+                        help='notices 컬렉션으로 소스별 피드 문서(feeds)를 다시 만든 뒤 종료')
+    parser.add_argument('--backfill-dates', action='store_true',
+                        help='기존 notices 문서에 정규화 날짜 필드(date_at, date_start, date_end)를 채운 뒤 종료')
+    parser.add_argument('--force', action='store_true',
+                        help='--backfill-dates에서 이미 날짜 필드가 있는 문서도 다시 계산')
+    parser.add_argument('--enrich', action='store_true',
+                        help='신규 글의 상세 페이지에서 본문/마감일/첨부파일도 저장 (CRAWLER_ENRICH=1과 같음)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='확인 예정 시각이 지난 소스만 크롤링 (소스별 적응형 확인 주기)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='종료 신호를 받을 때까지 계속 실행하며 소스별 주기에 맞춰 크롤링')
+    parser.add_argument('--min-interval', type=float, default=None,
+                        help=f'데몬 모드의 최소 확인 주기(초, 기본 {DAEMON_MIN_INTERVAL:.0f})')
+    parser.add_argument('--import-report', action='store_true',
+                        help='종료 전에 모듈 import 시간과 전체 실행 시간 출력')
+    args = parser.parse_args()
+    if args.enrich:
+        ENRICH_ENABLED = True
+
+    try:
+        if args.rebuild_seen:
+            rebuild_seen_index()
+        elif args.rebuild_feeds:
+            rebuild_feeds()
+        elif args.backfill_dates:
+            # 대량 갱신은 maintenance.py (파티션 병렬 읽기 + BulkWriter)
+            import maintenance
+            maintenance.backfill_dates(init_firebase(), force=args.force)
+        elif args.daemon:
+            run_daemon(args.min_interval)
+        elif args.adaptive:
+            print("=== 소스별 확인 주기 ===")
+            print_poll_schedule()
+            # 확인할 소스가 없어도 실행해서 대기 중인 알림은 발송
+            run_all_sources([(source, partial(crawl_source, source)) for source in due_sources()])
+        else:
+            # 모든 소스 동시 크롤링 실행
+            run_all_sources()
+    finally:
+        if args.import_report:
+            print_import_report()
+            print(f"  - 전체 실행: {(time.perf_counter() - _IMPORT_START) * 1000:.0f}ms")
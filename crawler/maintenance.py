@@ -0,0 +1,353 @@
+"""Firestore 대량 관리 도구
+
+  python maintenance.py stats                      # 소스별 문서 수, 점검 결과
+  python maintenance.py delete notices feeds --yes # 컬렉션 비우기
+  python maintenance.py export out.jsonl           # JSONL 내보내기 (.parquet이면 Parquet, pyarrow 필요)
+  python maintenance.py backfill dates [--force]   # 정규화 날짜 필드 채우기
+  python maintenance.py backfill doc-ids [--dry-run]  # 문서 ID를 md5(link)로 다시 맞추기
+
+읽기는 collection group 파티션 쿼리로 나눠 여러 스레드에서 동시에 하고,
+쓰기/삭제는 BulkWriter로 묶어 병렬 전송합니다 (재귀 없음, 문서 수와 관계없이 일정한 메모리).
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from functools import partial
+
+import main
+import state_store
+from date_parser import date_fields
+
+READ_PARTITIONS = int(os.environ.get('CRAWLER_READ_PARTITIONS', '8'))  # 병렬 읽기 파티션 수
+READ_QUEUE_SIZE = 1000
+BULK_MAX_ATTEMPTS = 5  # 문서 하나의 쓰기를 포기하기 전 최대 시도 횟수
+PARQUET_BATCH_ROWS = 5000  # Parquet 행 그룹 하나에 모아 쓸 행 수
+REHASH_CHUNK = main.FIRESTORE_BATCH_LIMIT  # ID를 옮길 문서를 한 번에 읽을 수
+
+def partition_queries(db, collection, partitions=None):
+    """컬렉션을 파티션 쿼리 목록으로 나누기 (나눌 수 없으면 컬렉션 전체 쿼리 하나)"""
+    partitions = partitions or READ_PARTITIONS
+    if partitions <= 1:
+        return [db.collection(collection)]
+    try:
+        return [partition.query() for partition in db.collection_group(collection).get_partitions(partitions)]
+    except Exception as e:
+        print(f"  ⚠️ 파티션 나누기 실패 (한 번에 읽음): {e}")
+        return [db.collection(collection)]
+
+def iter_documents(db, collection, fields=None, partitions=None):
+    """컬렉션의 문서 스냅샷을 파티션별로 동시에 읽어 내보냄 (순서는 보장하지 않음)
+
+    fields가 주어지면 그 필드만 읽습니다 (빈 목록이면 문서 ID만).
+    """
+    queries = partition_queries(db, collection, partitions)
+    if fields is not None:
+        queries = [query.select(fields) for query in queries]
+    streams = [query.stream() for query in queries]
+    return main.run_stages(streams, READ_QUEUE_SIZE, name=f'read-{collection}')
+
+class BulkWrites:
+    """BulkWriter로 쓰기/삭제를 모아 보내고 성공/실패 건수를 셈"""
+
+    def __init__(self, db):
+        self.succeeded = 0
+        self.failed = 0
+        self._lock = threading.Lock()  # 콜백은 BulkWriter의 전송 스레드에서 호출됨
+        self._writer = db.bulk_writer()
+        self._writer.on_write_result(self._on_result)
+        self._writer.on_write_error(self._on_error)
+
+    def _on_result(self, reference, result, writer):
+        with self._lock:
+            self.succeeded += 1
+
+    def _on_error(self, failure, writer):
+        # 일시적 오류는 BulkWriter가 백오프 후 다시 시도
+        if failure.attempts < BULK_MAX_ATTEMPTS:
+            return True
+        with self._lock:
+            self.failed += 1
+        print(f"  ❌ 쓰기 실패: {failure.operation} | {failure.message}")
+        return False
+
+    def set(self, reference, data, merge=False):
+        self._writer.set(reference, data, merge=merge)
+
+    def delete(self, reference):
+        self._writer.delete(reference)
+
+    def close(self):
+        self._writer.close()
+        return self.succeeded, self.failed
+
+def _progress(label, count, started):
+    elapsed = time.monotonic() - started
+    rate = count / elapsed if elapsed else 0
+    print(f"  … {label} {count:,}건 ({rate:,.0f}건/초)")
+
+# --- 삭제 ---
+
+def delete_collection(db, collection, partitions=None):
+    """컬렉션의 모든 문서 삭제 (문서 ID만 읽어 BulkWriter로 삭제)"""
+    started = time.monotonic()
+    writes = BulkWrites(db)
+    queued = 0
+    for snapshot in iter_documents(db, collection, fields=[], partitions=partitions):
+        writes.delete(snapshot.reference)
+        queued += 1
+        if queued % 5000 == 0:
+            _progress('삭제 요청', queued, started)
+    deleted, failed = writes.close()
+    print(f"✅ {collection}: {deleted:,}건 삭제 (실패 {failed}건, {time.monotonic() - started:.1f}초)")
+    return deleted, failed
+
+# --- 내보내기 ---
+
+def _plain(value):
+    """JSON으로 쓸 수 있는 값으로 변환 (Timestamp → ISO 문자열)"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+def export_collection(db, collection, path, partitions=None):
+    """컬렉션을 JSONL(.jsonl) 또는 Parquet(.parquet) 파일로 내보내기 (각 행에 문서 ID 'id' 포함)"""
+    started = time.monotonic()
+    rows = ({'id': snapshot.id, **(snapshot.to_dict() or {})}
+            for snapshot in iter_documents(db, collection, partitions=partitions))
+
+    if path.endswith('.parquet'):
+        count = _write_parquet(rows, path)
+    else:
+        count = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(_plain(row), ensure_ascii=False))
+                f.write('\n')
+                count += 1
+    print(f"✅ {collection}: {count:,}건 → {path} ({time.monotonic() - started:.1f}초)")
+    return count
+
+def _write_parquet(rows, path):
+    """행을 PARQUET_BATCH_ROWS씩 행 그룹으로 나눠 쓰기 (메모리는 한 묶음만큼만 사용)
+
+    스키마는 첫 묶음에서 정합니다. 이후 묶음에만 있는 필드는 버리고 경고합니다.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Parquet 내보내기에는 pyarrow가 필요합니다: pip install pyarrow")
+
+    writer = None
+    dropped = set()
+    count = 0
+    batch = []
+
+    def write_batch():
+        nonlocal writer
+        if writer is None:
+            table = pyarrow.Table.from_pylist(batch)
+            writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+        else:
+            extra = {key for row in batch for key in row} - set(writer.schema.names) - dropped
+            if extra:
+                print(f"  ⚠️ 첫 묶음에 없던 필드는 내보내지 않습니다: {', '.join(sorted(extra))}")
+                dropped.update(extra)
+            table = pyarrow.Table.from_pylist(batch, schema=writer.schema)
+        writer.write_table(table)
+
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= PARQUET_BATCH_ROWS:
+                write_batch()
+                count += len(batch)
+                batch.clear()
+        if batch or writer is None:
+            write_batch()
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+# --- 필드 다시 채우기 ---
+
+def backfill_dates(db, force=False, partitions=None):
+    """notices 문서에 정규화 날짜 필드 채우기 (force면 이미 있는 문서도 다시 계산)"""
+    started = time.monotonic()
+    notices_ref = db.collection('notices')
+    writes = BulkWrites(db)
+    skipped = 0
+    for snapshot in iter_documents(db, 'notices', ['date', 'created_at', 'date_at'], partitions):
+        data = snapshot.to_dict() or {}
+        if data.get('date_at') and not force:
+            skipped += 1
+            continue
+        writes.set(notices_ref.document(snapshot.id), date_fields(data.get('date', ''), data.get('created_at')), merge=True)
+    updated, failed = writes.close()
+    print(f"✅ 날짜 필드: {updated:,}건 갱신, {skipped:,}건 건너뜀 (실패 {failed}건, {time.monotonic() - started:.1f}초)")
+    print("   피드도 새 날짜로 정렬하려면 main.py --rebuild-feeds를 실행하세요.")
+    return updated, failed
+
+def rehash_doc_ids(db, dry_run=False, partitions=None):
+    """문서 ID가 md5(link)와 다른 notices 문서를 올바른 ID로 옮기기
+
+    link/source 필드만 스트리밍으로 읽고, ID가 다른 문서만 REHASH_CHUNK건씩 모아 올바른 ID의 존재 여부와
+    원본 내용을 읽어 옮깁니다 (메모리는 옮기는 문서 수에만 비례).
+    올바른 ID의 문서가 이미 있으면 잘못된 문서만 지웁니다 (같은 글의 중복).
+    옮긴 글이 들어 있던 소스 피드는 항목 ID를 새 ID로 바꿔 다시 씁니다.
+    """
+    started = time.monotonic()
+    notices_ref = db.collection('notices')
+    writes = None if dry_run else BulkWrites(db)
+    renamed = {}     # 옛 doc ID → 올바른 doc ID
+    created = set()  # 이번 실행에서 옮겨 만든 doc ID
+    sources = set()  # 피드를 고칠 소스
+    pending = []     # (옛 doc ID, 올바른 doc ID, source)
+    counts = {'total': 0, 'moved': 0, 'duplicates': 0}
+
+    def flush():
+        existing = {
+            snapshot.id for snapshot in db.get_all([notices_ref.document(expected) for _, expected, _ in pending])
+            if snapshot.exists
+        }
+        originals = {}
+        if writes:
+            originals = {
+                snapshot.id: snapshot.to_dict() or {}
+                for snapshot in db.get_all([notices_ref.document(old) for old, _, _ in pending])
+                if snapshot.exists
+            }
+        for old, expected, source in pending:
+            if expected in existing or expected in created:
+                counts['duplicates'] += 1
+            else:
+                if writes and old not in originals:
+                    continue  # 읽는 사이 지워진 문서
+                counts['moved'] += 1
+                created.add(expected)
+                if writes:
+                    writes.set(notices_ref.document(expected), originals[old])
+            if writes:
+                writes.delete(notices_ref.document(old))
+            renamed[old] = expected
+            sources.add(source)
+        pending.clear()
+
+    for snapshot in iter_documents(db, 'notices', ['link', 'source'], partitions):
+        counts['total'] += 1
+        data = snapshot.to_dict() or {}
+        link = (data.get('link') or '').strip()
+        if not link:
+            continue
+        expected = main.notice_doc_id(link)
+        if expected == snapshot.id:
+            continue
+        pending.append((snapshot.id, expected, data.get('source', 'LH')))
+        if len(pending) >= REHASH_CHUNK:
+            flush()
+    if pending:
+        flush()
+
+    label = '옮길 예정' if dry_run else '옮김'
+    if writes:
+        _, failed = writes.close()
+        print(f"   실패 {failed}건")
+        if renamed:
+            rename_feed_items(main.as_storage(db), sources, renamed)
+    print(f"✅ 문서 ID: {counts['total']:,}건 중 {counts['moved']:,}건 {label}, 중복 {counts['duplicates']:,}건 삭제"
+          f"{' 예정' if dry_run else ''} ({time.monotonic() - started:.1f}초)")
+    if renamed and not dry_run:
+        print("   로컬 seen 인덱스를 맞추려면 main.py --rebuild-seen을 실행하세요.")
+    return counts['moved'], counts['duplicates']
+
+def _renamed_feed(items, renamed):
+    """피드 항목의 옛 doc ID를 새 ID로 바꾸기 (같은 글이 된 항목은 하나만 남김)"""
+    return main.merge_feed([], [{**item, 'id': renamed.get(item['id'], item['id'])} for item in items])
+
+def rename_feed_items(store, sources, renamed):
+    """소스 피드 문서의 옛 doc ID를 새 ID로 바꿔 다시 쓰기 (현재 피드를 읽어 조건부로 씀)"""
+    for source in sorted(sources):
+        store.update_feed(source, partial(_renamed_feed, renamed=renamed))
+    print(f"   피드 {len(sources)}개 소스의 항목 ID를 새 ID로 바꿨습니다.")
+
+# --- 점검 ---
+
+def collection_stats(db, partitions=None):
+    """notices 소스별 문서 수와 점검 결과 (ID 불일치, 날짜 필드 없음)"""
+    started = time.monotonic()
+    by_source = {}
+    mismatched = 0
+    missing_dates = 0
+    total = 0
+    for snapshot in iter_documents(db, 'notices', ['source', 'link', 'date_at'], partitions):
+        data = snapshot.to_dict() or {}
+        total += 1
+        source = data.get('source', 'LH')
+        by_source[source] = by_source.get(source, 0) + 1
+        link = (data.get('link') or '').strip()
+        if link and main.notice_doc_id(link) != snapshot.id:
+            mismatched += 1
+        if not data.get('date_at'):
+            missing_dates += 1
+
+    print(f"=== notices {total:,}건 ({time.monotonic() - started:.1f}초) ===")
+    for source, count in sorted(by_source.items()):
+        print(f"  - {source}: {count:,}건")
+    print(f"  문서 ID 불일치: {mismatched:,}건 (backfill doc-ids)")
+    print(f"  날짜 필드 없음: {missing_dates:,}건 (backfill dates)")
+    return {'total': total, 'by_source': by_source, 'mismatched': mismatched, 'missing_dates': missing_dates}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Firestore 대량 관리 도구 (삭제/내보내기/필드 채우기/점검)')
+    parser.add_argument('--partitions', type=int, default=None,
+                        help=f'병렬 읽기 파티션 수 (기본 {READ_PARTITIONS})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('stats', help='소스별 문서 수와 점검 결과')
+
+    delete_parser = commands.add_parser('delete', help='컬렉션의 모든 문서 삭제')
+    delete_parser.add_argument('collections', nargs='*', default=['notices', main.FEED_COLLECTION])
+    delete_parser.add_argument('--yes', action='store_true', help='확인 없이 삭제')
+
+    export_parser = commands.add_parser('export', help='JSONL/Parquet으로 내보내기')
+    export_parser.add_argument('output', help='출력 파일 (.jsonl 또는 .parquet)')
+    export_parser.add_argument('--collection', default='notices')
+
+    backfill_parser = commands.add_parser('backfill', help='필드 다시 채우기')
+    backfill_parser.add_argument('field', choices=['dates', 'doc-ids'])
+    backfill_parser.add_argument('--force', action='store_true', help='dates: 이미 있는 문서도 다시 계산')
+    backfill_parser.add_argument('--dry-run', action='store_true', help='doc-ids: 바꾸지 않고 건수만 확인')
+
+    args = parser.parse_args()
+    db = main.init_firebase()
+
+    if args.command == 'stats':
+        collection_stats(db, args.partitions)
+    elif args.command == 'delete':
+        if not args.yes:
+            answer = input(f"{', '.join(args.collections)} 컬렉션을 모두 삭제합니다. 계속할까요? (y/N) ")
+            if answer.strip().lower() != 'y':
+                raise SystemExit("취소했습니다.")
+        for collection in args.collections:
+            delete_collection(db, collection, args.partitions)
+        if 'notices' in args.collections:
+            # 삭제된 글을 로컬 인덱스가 '이미 저장됨'으로 보거나, 304/watermark로 다시 크롤링하지 않거나,
+            # 지워진 글의 알림이 대기열에서 나가지 않도록 로컬 상태를 모두 비움
+            state_store.reset()
+            print("✅ 로컬 상태(seen 인덱스, 지문, 페이지 검증값, watermark, 알림 대기열, 확인 주기)도 비웠습니다. "
+                  "이제 main.py를 다시 실행하세요.")
+    elif args.command == 'export':
+        export_collection(db, args.collection, args.output, args.partitions)
+    elif args.command == 'backfill':
+        if args.field == 'dates':
+            backfill_dates(db, args.force, args.partitions)
+        else:
+            rehash_doc_ids(db, args.dry_run, args.partitions)
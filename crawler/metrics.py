@@ -0,0 +1,199 @@
+"""크롤링 실행 지표 (단계별 소요 시간, 행 수, 다운로드 바이트, RPC 수)
+
+단계(stage):
+  fetch   목록/상세 페이지 다운로드 (요청 하나마다)
+  parse   목록 페이지 파싱/행 추출 (페이지 하나마다)
+  enrich  신규 글 상세 페이지 보강 (batch 하나마다)
+  dedup   seen 인덱스/Firestore 존재 확인/같은 글 판별 (batch 하나마다)
+  write   Firestore batch 쓰기 (commit 하나마다)
+  notify  FCM send_each (호출 하나마다)
+
+실행이 끝나면 write_run()이 한 실행의 지표를 JSON 한 줄로 METRICS_FILE에 덧붙이고,
+PROMETHEUS_FILE이 설정되어 있으면 node_exporter textfile collector 형식으로도 씁니다.
+기록한 뒤에는 값을 비워 다음 실행(데몬 모드)을 새로 셉니다.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import state_store
+
+# 빈 문자열이면 기록하지 않음. 기본값은 상태 폴더라 GitHub Actions 캐시로 실행 간 이력이 유지됨
+METRICS_FILE = os.environ.get('CRAWLER_METRICS_FILE', os.path.join(state_store.STATE_DIR, 'metrics.jsonl'))
+METRICS_MAX_BYTES = 5 * 1024 * 1024  # 넘으면 오래된 절반을 버림
+PROMETHEUS_FILE = os.environ.get('CRAWLER_PROMETHEUS_FILE', '')
+PROMETHEUS_PREFIX = 'crawler'
+
+# 히스토그램 구간 상한(초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_lock = threading.Lock()
+_timings = {}   # (stage, source) → [초, ...]
+_counters = {}  # (name, source, ((label, value), ...)) → 합계
+
+def observe(stage, source, seconds):
+    """단계 소요 시간 한 건 기록"""
+    with _lock:
+        _timings.setdefault((stage, source or ''), []).append(seconds)
+
+@contextmanager
+def timer(stage, source=''):
+    """with 블록의 소요 시간을 stage로 기록 (예외가 나도 기록)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, source, time.perf_counter() - start)
+
+def timed_iter(iterable, stage, source=''):
+    """iterable의 다음 값을 만드는 데 걸린 시간만 합쳐 끝날 때 한 건으로 기록
+
+    값을 받아 간 쪽이 처리하는 시간(큐 대기 등)은 포함하지 않습니다.
+    """
+    iterator = iter(iterable)
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        observe(stage, source, elapsed)
+
+def count(name, source='', value=1, **labels):
+    """카운터 증가 (예: rows, bytes_downloaded, firestore_rpc method=get_all)"""
+    key = (name, source or '', tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def reset():
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+
+def _percentile(sorted_values, ratio):
+    index = min(len(sorted_values) - 1, max(0, round(ratio * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def snapshot():
+    """현재까지의 지표 {'stages': [...], 'counters': [...]}"""
+    with _lock:
+        timings = {key: sorted(values) for key, values in _timings.items()}
+        counters = dict(_counters)
+
+    stages = []
+    for (stage, source), values in sorted(timings.items()):
+        stages.append({
+            'stage': stage,
+            'source': source,
+            'count': len(values),
+            'sum': round(sum(values), 6),
+            'p50': round(_percentile(values, 0.5), 6),
+            'p95': round(_percentile(values, 0.95), 6),
+            'max': round(values[-1], 6),
+            # 구간별 누적 개수 (마지막은 전체)
+            'buckets': [sum(1 for v in values if v <= bound) for bound in LATENCY_BUCKETS],
+        })
+    return {
+        'stages': stages,
+        'counters': [
+            {'name': name, 'source': source, **dict(labels), 'value': value}
+            for (name, source, labels), value in sorted(counters.items())
+        ],
+    }
+
+def print_summary(data):
+    """단계별 합계 시간을 한 줄로 출력"""
+    totals = {}
+    for entry in data['stages']:
+        totals[entry['stage']] = totals.get(entry['stage'], 0) + entry['sum']
+    if totals:
+        print("  ⏱️ 단계별 시간: " + ', '.join(f"{stage} {seconds:.2f}초" for stage, seconds in totals.items()))
+
+def write_run(statuses, elapsed):
+    """한 실행의 지표를 JSONL(과 Prometheus textfile)로 기록한 뒤 비우기"""
+    data = snapshot()
+    reset()
+    record = {
+        'run_at': time.time(),
+        'elapsed': round(elapsed, 3),
+        'statuses': statuses,
+        **data,
+    }
+    print_summary(data)
+    try:
+        if METRICS_FILE:
+            _append_jsonl(METRICS_FILE, record)
+        if PROMETHEUS_FILE:
+            write_prometheus(PROMETHEUS_FILE, record)
+    except OSError as e:
+        # 지표 기록 실패로 크롤링 결과가 실패 처리되지 않도록
+        print(f"  ⚠️ 실행 지표 기록 실패: {e}")
+    return record
+
+def _append_jsonl(path, record):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if os.path.exists(path) and os.path.getsize(path) > METRICS_MAX_BYTES:
+        with open(path, encoding='utf-8') as f:
+            lines = f.readlines()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(lines[len(lines) // 2:])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False))
+        f.write('\n')
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+def write_prometheus(path, record):
+    """node_exporter textfile collector 형식으로 쓰기 (임시 파일에 쓴 뒤 교체)
+
+    값은 모두 마지막 실행 기준입니다.
+    """
+    p = PROMETHEUS_PREFIX
+    lines = [
+        f'# HELP {p}_stage_duration_seconds 마지막 실행의 단계별 소요 시간',
+        f'# TYPE {p}_stage_duration_seconds histogram',
+    ]
+    for entry in record['stages']:
+        labels = {'stage': entry['stage'], 'source': entry['source']}
+        for bound, cumulative in zip(LATENCY_BUCKETS, entry['buckets']):
+            lines.append(f"{p}_stage_duration_seconds_bucket{_labels(**labels, le=bound)} {cumulative}")
+        lines.append(f"{p}_stage_duration_seconds_bucket{_labels(**labels, le='+Inf')} {entry['count']}")
+        lines.append(f"{p}_stage_duration_seconds_sum{_labels(**labels)} {entry['sum']}")
+        lines.append(f"{p}_stage_duration_seconds_count{_labels(**labels)} {entry['count']}")
+
+    by_name = {}
+    for counter in record['counters']:
+        by_name.setdefault(counter['name'], []).append(counter)
+    for name, counters in sorted(by_name.items()):
+        lines.append(f'# TYPE {p}_run_{name} gauge')
+        for counter in counters:
+            labels = {key: value for key, value in counter.items() if key not in ('name', 'value')}
+            lines.append(f"{p}_run_{name}{_labels(**labels)} {counter['value']}")
+
+    lines.append(f'# TYPE {p}_source_up gauge')
+    for source, status in sorted(record['statuses'].items()):
+        lines.append(f"{p}_source_up{_labels(source=source, status=status)} {1 if status == 'ok' else 0}")
+    lines += [
+        f'# TYPE {p}_run_duration_seconds gauge',
+        f"{p}_run_duration_seconds {record['elapsed']}",
+        f'# TYPE {p}_last_run_timestamp_seconds gauge',
+        f"{p}_last_run_timestamp_seconds {record['run_at']:.0f}",
+    ]
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, path)
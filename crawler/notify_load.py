@@ -0,0 +1,144 @@
+"""알림 발송 경로 부하 테스트 (가짜 FCM, 실제 기기로 보내지 않음)
+
+  python notify_load.py --notices 5000
+  python notify_load.py --notices 5000 --error-rate 0.05 --fatal-rate 0.01 --latency 0.05
+  python notify_load.py --notices 20000 --http      # 로컬 HTTP 가짜 FCM 서버(fake_fcm.py) 경유
+  python notify_load.py --notices 3000 --digest     # 소스별 요약 알림 기준을 그대로 적용
+
+합성 공고를 알림 대기열(outbox)에 넣고, 대기열이 빌 때까지(최대 --rounds회) flush_notifications를 반복합니다.
+flush 한 번은 크롤러 실행 한 번의 발송과 같습니다 (재시도 가능한 오류로 남은 알림은 다음 flush에서 다시 보냄).
+처리량, send_each 묶음 크기, 재시도/포기 건수를 출력합니다. Firebase 프로젝트나 키 파일이 필요 없습니다.
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+# 실제 크롤러 상태(.cache)와 Firebase를 건드리지 않도록 임시 상태 폴더 + 로컬 저장소 사용
+# (CRAWLER_STATE_DIR이 이미 설정된 CI/데몬 환경에서도 덮어씀, state_store를 import하기 전에 정해야 함)
+_STATE_DIR = tempfile.mkdtemp(prefix='crawler-notify-load-')
+os.environ['CRAWLER_STATE_DIR'] = _STATE_DIR
+os.environ['CRAWLER_STORAGE'] = 'sqlite'
+os.environ['CRAWLER_SQLITE_PATH'] = os.path.join(_STATE_DIR, 'notices.sqlite3')
+os.environ['CRAWLER_METRICS_FILE'] = ''
+os.environ['CRAWLER_PROMETHEUS_FILE'] = ''
+
+import fake_fcm
+import main
+import metrics
+import state_store
+from fakes import FakeMessaging
+from keyword_matcher import keyword_topic
+
+# 합성 제목에 섞을 단어 (앞쪽 --keywords개를 소스별 키워드로 등록)
+TITLE_WORDS = ['행복주택', '공공임대', '매입임대', '전세임대', '공모', '전시', '디자인', '예술', '교육', '채용']
+
+def synthetic_notices(count, sources):
+    """(doc_id, title, link, source) 합성 공고 count건 (소스를 돌아가며 배정)"""
+    notices = []
+    for i in range(count):
+        source = sources[i % len(sources)]
+        link = f"https://example.invalid/{source}/{i}"
+        title = f"{i}번 {TITLE_WORDS[i % len(TITLE_WORDS)]} 모집 공고"
+        notices.append((hashlib.md5(link.encode('utf-8')).hexdigest(), title, link, source))
+    return notices
+
+def register_keywords(per_source, sources):
+    """소스마다 키워드 per_source개를 로컬 저장소에 등록 (구독자 1명)"""
+    words = TITLE_WORDS[:per_source]
+    main.get_storage().put_keyword_topics(
+        (keyword_topic(source, word), source, word, 1) for source in sources for word in words
+    )
+
+def run(args):
+    sources = list(main.SOURCES)
+    fake = FakeMessaging(args.latency, args.jitter, args.error_rate, args.fatal_rate,
+                         args.request_error_rate, args.seed)
+    server = None
+    if args.http:
+        server, url = fake_fcm.start_server(fake)
+        main.set_fcm_transport(fake_fcm.HttpMessaging(url))
+        transport = f"HTTP 가짜 FCM ({url})"
+    else:
+        main.set_fcm_transport(fake)
+        transport = "메모리 가짜 FCM"
+
+    if not args.digest:
+        # 한 실행에 수천 건이 쌓여도 요약 알림으로 합치지 않고 건별로 발송
+        main.DIGEST_THRESHOLD = args.notices + 1
+        main.DIGEST_THRESHOLDS.clear()
+        for config in main.SOURCES.values():
+            config.pop('digest_threshold', None)
+    main.FCM_RETRY_BACKOFF = args.retry_backoff
+    if args.keywords:
+        register_keywords(args.keywords, sources)
+
+    print(f"=== 알림 부하 테스트: 합성 공고 {args.notices:,}건, {transport} ===")
+    print(f"  지연 {args.latency}+{args.jitter}초, 일시적 오류 {args.error_rate:.0%}, 영구 오류 {args.fatal_rate:.0%}, "
+          f"요청 실패 {args.request_error_rate:.0%}, 키워드 소스당 {args.keywords}개, "
+          f"요약 알림 {'사용' if args.digest else '사용 안 함'}")
+
+    start = time.perf_counter()
+    state_store.outbox_add(synthetic_notices(args.notices, sources))
+    print(f"  대기열 적재: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    total_sent = 0
+    total_elapsed = 0.0
+    for round_number in range(1, args.rounds + 1):
+        pending = len(state_store.outbox_pending())
+        if not pending:
+            break
+        calls_before = fake.calls
+        start = time.perf_counter()
+        # 건별 실패 로그는 숨김
+        with contextlib.redirect_stdout(io.StringIO()):
+            sent, failed = main.flush_notifications()
+        elapsed = time.perf_counter() - start
+        total_sent += sent
+        total_elapsed += elapsed
+        print(f"  {round_number}회차: 대기 {pending:,}건 → 메시지 성공 {sent:,} / 실패 {failed:,}  "
+              f"send_each {fake.calls - calls_before}회  {elapsed:.2f}초 ({sent / elapsed if elapsed else 0:,.0f}건/초)")
+
+    remaining = len(state_store.outbox_pending())
+    batch_sizes = fake.batch_sizes or [0]
+    notify = [entry for entry in metrics.snapshot()['stages'] if entry['stage'] == 'notify']
+    print("\n=== 결과 ===")
+    print(f"  발송 메시지 {total_sent:,}건, 총 {total_elapsed:.2f}초 "
+          f"({total_sent / total_elapsed if total_elapsed else 0:,.0f}건/초)")
+    print(f"  send_each {fake.calls}회, 묶음 크기 최대 {max(batch_sizes)} / 평균 {sum(batch_sizes) / len(batch_sizes):.0f}")
+    if notify:
+        print(f"  send_each 소요: p50 {notify[0]['p50'] * 1000:.1f}ms, p95 {notify[0]['p95'] * 1000:.1f}ms, "
+              f"최대 {notify[0]['max'] * 1000:.1f}ms")
+    print(f"  주입된 오류: {fake.errors or '없음'}")
+    print(f"  대기열에 남은 알림(다음 실행에서 재시도): {remaining:,}건")
+
+    if server:
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    try:
+        parser = argparse.ArgumentParser(description='가짜 FCM으로 알림 발송 경로 부하 테스트 (실제 기기로 보내지 않음)')
+        parser.add_argument('--notices', type=int, default=5000, help='합성 공고 수')
+        parser.add_argument('--keywords', type=int, default=0, help=f'소스별로 등록할 키워드 수 (최대 {len(TITLE_WORDS)})')
+        parser.add_argument('--digest', action='store_true', help='소스별 요약 알림 기준을 그대로 적용')
+        parser.add_argument('--http', action='store_true', help='로컬 HTTP 가짜 FCM 서버를 띄워 경유')
+        parser.add_argument('--latency', type=float, default=0.0, help='send_each 호출마다 지연(초)')
+        parser.add_argument('--jitter', type=float, default=0.0, help='지연에 더할 무작위 시간 최대값(초)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='메시지별 일시적 오류 비율 (재시도 대상)')
+        parser.add_argument('--fatal-rate', type=float, default=0.0, help='메시지별 영구 오류 비율')
+        parser.add_argument('--request-error-rate', type=float, default=0.0, help='send_each 요청 전체 실패 비율')
+        parser.add_argument('--retry-backoff', type=float, default=0.05,
+                            help=f'재시도 백오프 기본값(초, 크롤러 기본값 {main.FCM_RETRY_BACKOFF})')
+        parser.add_argument('--rounds', type=int, default=main.FCM_MAX_ATTEMPTS, help='최대 flush 횟수 (크롤러 실행 횟수)')
+        parser.add_argument('--seed', type=int, default=1, help='오류 주입 난수 시드')
+        args = parser.parse_args()
+
+        run(args)
+    finally:
+        state_store.close()
+        shutil.rmtree(_STATE_DIR, ignore_errors=True)
@@ -1,26 +1,15 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
-import os
+import main
+import maintenance
+import state_store
 
-# 1. Firebase 초기화
-cred_path = os.path.join(os.path.dirname(__file__), 'serviceAccountKey.json')
-cred = credentials.Certificate(cred_path)
-firebase_admin.initialize_app(cred)
-db = firestore.client()
-
-def delete_collection(coll_ref, batch_size):
-    docs = coll_ref.limit(batch_size).stream()
-    deleted = 0
-
-    for doc in docs:
-        print(f'삭제 중: {doc.id}')
-        doc.reference.delete()
-        deleted += 1
-
-    if deleted >= batch_size:
-        return delete_collection(coll_ref, batch_size)
-
-# 2. 'notices' 컬렉션 싹 비우기
+# 'notices'와 소스별 피드 컬렉션 싹 비우기
+# 문서 ID만 읽어 BulkWriter로 병렬 삭제합니다 (maintenance.py delete와 같음).
+db = main.init_firebase()
 print("DB 초기화를 시작합니다...")
-delete_collection(db.collection('notices'), 10)
-print("✅ DB 초기화 완료! 이제 main.py를 다시 실행하세요.")
\ No newline at end of file
+for collection in ('notices', main.FEED_COLLECTION):
+    maintenance.delete_collection(db, collection)
+
+# 로컬 상태(seen 인덱스, 지문, 페이지 검증값, watermark, 알림 대기열, 확인 주기)도 비워야
+# 다음 실행에서 처음부터 다시 크롤링/저장됨
+state_store.reset()
+print("✅ DB 초기화 완료! 이제 main.py를 다시 실행하세요.")
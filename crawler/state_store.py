@@ -0,0 +1,438 @@
+"""크롤러 로컬 상태 저장소 (SQLite)
+
+실행과 실행 사이에 유지되어야 하는 값(이미 저장된 글 ID 등)을 보관합니다.
+GitHub Actions에서는 actions/cache로 STATE_DIR 폴더를 복원합니다.
+파일이 없어도 크롤러는 정상 동작하며, 이 경우 Firestore에서 다시 채워집니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+STATE_DIR = os.environ.get('CRAWLER_STATE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+STATE_DB_PATH = os.path.join(STATE_DIR, 'crawler_state.sqlite3')
+
+# SQLite IN 절에 한 번에 넣을 최대 파라미터 수
+_SQL_CHUNK = 500
+
+_SCHEMA = """
+-- reason: 저장하지 않고 같은 글로 판단해 건너뛴 글이면 그 이유 ('URL', '제목 (원본 소스)'), 저장된 글은 NULL
+CREATE TABLE IF NOT EXISTS seen (
+    doc_id TEXT PRIMARY KEY,
+    source TEXT,
+    reason TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS http_validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT,
+    updated_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    doc_id TEXT PRIMARY KEY,
+    title TEXT,
+    link TEXT,
+    source TEXT,
+    attempts INTEGER DEFAULT 0,
+    last_error TEXT,
+    created_at REAL
+);
+
+-- 글마다 발송을 끝낸(성공했거나 포기한) 대상 (소스 토픽, 키워드 토픽)
+CREATE TABLE IF NOT EXISTS notification_sent (
+    doc_id TEXT,
+    target TEXT,
+    PRIMARY KEY (doc_id, target)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    source TEXT PRIMARY KEY,
+    value INTEGER,
+    updated_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS arrivals (
+    source TEXT,
+    found_at REAL,
+    count INTEGER
+);
+CREATE INDEX IF NOT EXISTS arrivals_source_found_at ON arrivals (source, found_at);
+
+CREATE TABLE IF NOT EXISTS detail_pages (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT,
+    fetched_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS detail_content (
+    content_hash TEXT PRIMARY KEY,
+    extracted TEXT
+);
+
+CREATE TABLE IF NOT EXISTS fingerprints (
+    doc_id TEXT PRIMARY KEY,
+    source TEXT,
+    canonical_url TEXT,
+    title TEXT,
+    seen_at REAL
+);
+CREATE INDEX IF NOT EXISTS fingerprints_canonical_url ON fingerprints (canonical_url);
+
+CREATE TABLE IF NOT EXISTS fingerprint_bands (
+    band TEXT,
+    doc_id TEXT,
+    PRIMARY KEY (band, doc_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS poll_schedule (
+    source TEXT PRIMARY KEY,
+    tracking_since REAL,
+    last_checked REAL,
+    interval REAL,
+    next_due REAL
+);
+"""
+
+# 이전 버전 상태 DB에 없는 열 (GitHub Actions 캐시로 예전 파일이 복원될 수 있음): (테이블, 열, 타입)
+_ADDED_COLUMNS = (
+    ('seen', 'reason', 'TEXT'),
+)
+
+_conn = None
+_lock = threading.RLock()
+
+def get_connection():
+    """상태 DB 연결 (프로세스 전체에서 하나를 공유)"""
+    global _conn
+    with _lock:
+        if _conn is None:
+            os.makedirs(STATE_DIR, exist_ok=True)
+            conn = sqlite3.connect(STATE_DB_PATH, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            for table, column, column_type in _ADDED_COLUMNS:
+                if column not in {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}:
+                    conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+            _conn = conn
+        return _conn
+
+def close():
+    """상태 DB 연결 닫기"""
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+# --- 이미 저장된 글 인덱스 (doc ID = md5(link)) ---
+
+def seen_unknown(doc_ids):
+    """로컬 인덱스에 없는 doc ID만 입력 순서대로 반환"""
+    doc_ids = list(doc_ids)
+    if not doc_ids:
+        return []
+    known = set()
+    with _lock:
+        conn = get_connection()
+        for i in range(0, len(doc_ids), _SQL_CHUNK):
+            chunk = doc_ids[i:i + _SQL_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(f'SELECT doc_id FROM seen WHERE doc_id IN ({placeholders})', chunk)
+            known.update(row[0] for row in rows)
+    return [doc_id for doc_id in doc_ids if doc_id not in known]
+
+def seen_add(doc_ids, source='', reason=None):
+    """doc ID들을 로컬 인덱스에 추가 (reason: 같은 글로 판단해 건너뛴 이유, 저장한 글이면 None)"""
+    rows = [(doc_id, source, reason) for doc_id in doc_ids]
+    if not rows:
+        return
+    with _lock:
+        conn = get_connection()
+        conn.execute('BEGIN')
+        conn.executemany('INSERT OR IGNORE INTO seen (doc_id, source, reason) VALUES (?, ?, ?)', rows)
+        conn.execute('COMMIT')
+
+def seen_count():
+    """로컬 인덱스에 들어 있는 doc ID 수"""
+    with _lock:
+        return get_connection().execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+
+def seen_clear():
+    """로컬 인덱스 비우기"""
+    with _lock:
+        get_connection().execute('DELETE FROM seen')
+
+# --- 조건부 요청용 페이지 검증값 (ETag, Last-Modified, 본문 해시) ---
+
+def get_validators(url):
+    """URL에 저장된 검증값 (없으면 None)"""
+    with _lock:
+        row = get_connection().execute(
+            'SELECT etag, last_modified, body_hash FROM http_validators WHERE url = ?', (url,)
+        ).fetchone()
+    if row is None:
+        return None
+    return {'etag': row[0], 'last_modified': row[1], 'body_hash': row[2]}
+
+def save_validators(url, etag, last_modified, body_hash):
+    """URL의 검증값 저장 (기존 값 덮어쓰기)"""
+    with _lock:
+        get_connection().execute(
+            'INSERT OR REPLACE INTO http_validators (url, etag, last_modified, body_hash, updated_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (url, etag, last_modified, body_hash, time.time())
+        )
+
+# --- 알림 발송 대기열 (저장은 됐지만 아직 발송되지 않은 알림) ---
+
+def outbox_add(notifications):
+    """발송할 알림 추가 (doc_id, title, link, source 튜플 목록)"""
+    now = time.time()
+    rows = [(doc_id, title, link, source, now) for doc_id, title, link, source in notifications]
+    if not rows:
+        return
+    with _lock:
+        conn = get_connection()
+        conn.execute('BEGIN')
+        conn.executemany(
+            'INSERT OR IGNORE INTO notification_outbox (doc_id, title, link, source, created_at) '
+            'VALUES (?, ?, ?, ?, ?)', rows
+        )
+        conn.execute('COMMIT')
+
+def outbox_pending():
+    """발송 대기 중인 알림 목록 (오래된 순, sent: 이미 발송을 끝낸 대상 집합)"""
+    with _lock:
+        conn = get_connection()
+        rows = conn.execute(
+            'SELECT doc_id, title, link, source, attempts, created_at FROM notification_outbox '
+            'ORDER BY created_at, rowid'
+        ).fetchall()
+        sent = {}
+        for doc_id, target in conn.execute('SELECT doc_id, target FROM notification_sent'):
+            sent.setdefault(doc_id, set()).add(target)
+    return [
+        {'doc_id': r[0], 'title': r[1], 'link': r[2], 'source': r[3], 'attempts': r[4], 'created_at': r[5],
+         'sent': sent.get(r[0], set())}
+        for r in rows
+    ]
+
+def outbox_mark_sent(targets):
+    """발송을 끝낸 대상 기록 ((doc_id, target) 목록) - 다음 발송에서 이 대상은 건너뜀"""
+    targets = list(targets)
+    if not targets:
+        return
+    with _lock:
+        conn = get_connection()
+        conn.execute('BEGIN')
+        conn.executemany('INSERT OR IGNORE INTO notification_sent (doc_id, target) VALUES (?, ?)', targets)
+        conn.execute('COMMIT')
+
+def outbox_remove(doc_ids):
+    """모든 대상에 발송 완료(또는 포기)한 알림 삭제"""
+    doc_ids = list(doc_ids)
+    if not doc_ids:
+        return
+    with _lock:
+        conn = get_connection()
+        conn.execute('BEGIN')
+        conn.executemany('DELETE FROM notification_outbox WHERE doc_id = ?', [(d,) for d in doc_ids])
+        conn.executemany('DELETE FROM notification_sent WHERE doc_id = ?', [(d,) for d in doc_ids])
+        conn.execute('COMMIT')
+
+def outbox_mark_failed(failures):
+    """발송 실패 기록 ((doc_id, error) 목록) - 시도 횟수 증가"""
+    if not failures:
+        return
+    with _lock:
+        conn = get_connection()
+        conn.execute('BEGIN')
+        conn.executemany(
+            'UPDATE notification_outbox SET attempts = attempts + 1, last_error = ? WHERE doc_id = ?',
+            [(str(error)[:500], doc_id) for doc_id, error in failures]
+        )
+        conn.execute('COMMIT')
+
+# --- 소스별 high-water mark (마지막으로 확인한 가장 큰 글 번호) ---
+
+def get_watermark(source):
+    """소스의 watermark (없으면 None)"""
+    with _lock:
+        row = get_connection().execute('SELECT value FROM watermarks WHERE source = ?', (source,)).fetchone()
+    return row[0] if row else None
+
+def set_watermark(source, value):
+    """소스의 watermark 저장"""
+    with _lock:
+        get_connection().execute(
+            'INSERT OR REPLACE INTO watermarks (source, value, updated_at) VALUES (?, ?, ?)',
+            (source, value, time.time())
+        )
+
+# --- 소스별 신규 글 발견 기록과 확인 주기 (적응형 스케줄) ---
+
+def arrivals_add(source, found_at, count):
+    """한 번의 확인에서 발견한 신규 글 수 기록"""
+    with _lock:
+        get_connection().execute(
+            'INSERT INTO arrivals (source, found_at, count) VALUES (?, ?, ?)', (source, found_at, count)
+        )
+
+def arrivals_since(source, since):
+    """since 이후 기록된 (found_at, count) 목록 (오래된 순)"""
+    with _lock:
+        return get_connection().execute(
+            'SELECT found_at, count FROM arrivals WHERE source = ? AND found_at >= ? ORDER BY found_at',
+            (source, since)
+        ).fetchall()
+
+def arrivals_prune(before):
+    """before 이전의 발견 기록 삭제"""
+    with _lock:
+        get_connection().execute('DELETE FROM arrivals WHERE found_at < ?', (before,))
+
+def get_schedule(source):
+    """소스의 확인 주기 정보 (없으면 None)"""
+    with _lock:
+        row = get_connection().execute(
+            'SELECT tracking_since, last_checked, interval, next_due FROM poll_schedule WHERE source = ?', (source,)
+        ).fetchone()
+    if row is None:
+        return None
+    return {'tracking_since': row[0], 'last_checked': row[1], 'interval': row[2], 'next_due': row[3]}
+
+def save_schedule(source, tracking_since, last_checked, interval, next_due):
+    """소스의 확인 주기 정보 저장"""
+    with _lock:
+        get_connection().execute(
+            'INSERT OR REPLACE INTO poll_schedule (source, tracking_since, last_checked, interval, next_due) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (source, tracking_since, last_checked, interval, next_due)
+        )
+
+def get_schedules():
+    """모든 소스의 확인 주기 정보 {source: dict}"""
+    with _lock:
+        rows = get_connection().execute(
+            'SELECT source, tracking_since, last_checked, interval, next_due FROM poll_schedule'
+        ).fetchall()
+    return {
+        r[0]: {'tracking_since': r[1], 'last_checked': r[2], 'interval': r[3], 'next_due': r[4]}
+        for r in rows
+    }
+
+# --- 상세 페이지 캐시 (URL → 본문 해시 → 추출 결과) ---
+
+def detail_get(url):
+    """URL의 캐시된 추출 결과 (없으면 None)"""
+    with _lock:
+        row = get_connection().execute(
+            'SELECT c.extracted FROM detail_pages p JOIN detail_content c ON c.content_hash = p.content_hash '
+            'WHERE p.url = ?', (url,)
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+def detail_get_by_hash(content_hash):
+    """같은 본문 해시로 이미 추출한 결과 (없으면 None)"""
+    with _lock:
+        row = get_connection().execute(
+            'SELECT extracted FROM detail_content WHERE content_hash = ?', (content_hash,)
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+def detail_put(url, content_hash, extracted):
+    """상세 페이지 추출 결과 저장 (extracted는 JSON으로 저장 가능한 dict)"""
+    with _lock:
+        conn = get_connection()
+        conn.execute('BEGIN')
+        conn.execute(
+            'INSERT OR REPLACE INTO detail_content (content_hash, extracted) VALUES (?, ?)',
+            (content_hash, json.dumps(extracted, ensure_ascii=False))
+        )
+        conn.execute(
+            'INSERT OR REPLACE INTO detail_pages (url, content_hash, fetched_at) VALUES (?, ?, ?)',
+            (url, content_hash, time.time())
+        )
+        conn.execute('COMMIT')
+
+# --- 같은 글 판별용 지문 (정규화 URL, 제목 LSH 밴드) ---
+
+def fingerprint_by_url(canonical_url):
+    """같은 정규화 URL로 저장된 글의 doc ID (없으면 None)"""
+    with _lock:
+        row = get_connection().execute(
+            'SELECT doc_id FROM fingerprints WHERE canonical_url = ? LIMIT 1', (canonical_url,)
+        ).fetchone()
+    return row[0] if row else None
+
+def fingerprint_candidates(bands, since):
+    """LSH 밴드가 하나라도 겹치고 since 이후에 본 글 → [(doc_id, source, title)]"""
+    bands = list(bands)
+    if not bands:
+        return []
+    placeholders = ','.join('?' * len(bands))
+    with _lock:
+        rows = get_connection().execute(
+            'SELECT DISTINCT f.doc_id, f.source, f.title FROM fingerprint_bands b '
+            'JOIN fingerprints f ON f.doc_id = b.doc_id '
+            f'WHERE b.band IN ({placeholders}) AND f.seen_at >= ?', (*bands, since)
+        ).fetchall()
+    return rows
+
+def fingerprints_add(fingerprints):
+    """지문 저장. fingerprints: [(doc_id, source, canonical_url, title, seen_at, bands)]"""
+    if not fingerprints:
+        return
+    with _lock:
+        conn = get_connection()
+        conn.execute('BEGIN')
+        conn.executemany(
+            'INSERT OR REPLACE INTO fingerprints (doc_id, source, canonical_url, title, seen_at) VALUES (?, ?, ?, ?, ?)',
+            [f[:5] for f in fingerprints]
+        )
+        conn.executemany(
+            'INSERT OR IGNORE INTO fingerprint_bands (band, doc_id) VALUES (?, ?)',
+            [(band, f[0]) for f in fingerprints for band in f[5]]
+        )
+        conn.execute('COMMIT')
+
+def fingerprints_prune(before):
+    """before 이전에 본 글의 제목 밴드 삭제 (URL 지문은 유지)"""
+    with _lock:
+        get_connection().execute(
+            'DELETE FROM fingerprint_bands WHERE doc_id IN (SELECT doc_id FROM fingerprints WHERE seen_at < ?)',
+            (before,)
+        )
+
+def fingerprints_clear():
+    """지문 비우기"""
+    with _lock:
+        conn = get_connection()
+        conn.execute('DELETE FROM fingerprint_bands')
+        conn.execute('DELETE FROM fingerprints')
+
+# --- 초기화 ---
+
+# 저장된 글에 딸린 상태 (상세 페이지 캐시는 URL 내용 캐시라 남겨 둠)
+_RESET_TABLES = (
+    'seen', 'fingerprint_bands', 'fingerprints', 'http_validators', 'watermarks',
+    'notification_outbox', 'notification_sent', 'arrivals', 'poll_schedule',
+)
+
+def reset():
+    """DB를 비운 뒤 처음부터 다시 크롤링하도록 로컬 상태 비우기
+
+    seen 인덱스와 지문뿐 아니라 페이지 검증값과 watermark도 지워야 다음 실행이 304나
+    예전 watermark에서 멈추지 않고, 알림 대기열도 지워야 지워진 글의 알림이 나가지 않습니다.
+    """
+    with _lock:
+        conn = get_connection()
+        conn.execute('BEGIN')
+        for table in _RESET_TABLES:
+            conn.execute(f'DELETE FROM {table}')
+        conn.execute('COMMIT')
@@ -0,0 +1,330 @@
+"""공고 저장소 (Firestore / 로컬 SQLite)
+
+크롤러가 저장소에 요청하는 일은 다음이 전부입니다.
+  exists_many(doc_ids)          이미 저장된 doc ID 집합
+  get_feed(source)              소스 피드 항목 목록
+  put_many(source, notices, update_feed)  신규 글 저장과 피드 갱신을 함께
+  update_feed(source, update)   피드 문서만 갱신 (재구성용)
+  iter_notices(fields)          (doc_id, data) 전체 순회 (재구성용)
+  keyword_topics()              앱이 등록한 키워드 토픽 목록
+
+CRAWLER_STORAGE=sqlite이면 Firebase 프로젝트나 키 파일 없이 로컬 파일(WAL)에 저장하므로
+전체 파이프라인을 오프라인에서 대량으로 돌려볼 수 있습니다.
+CRAWLER_STORAGE_MIRROR=1이면 Firestore에 쓴 내용을 같은 로컬 파일에도 복사합니다.
+
+피드 문서는 여러 실행(예약 실행, 데몬, maintenance.py)이 함께 고치므로 읽고 쓰는 사이에
+다른 쓰기가 끼어들면 안 됩니다. update_feed는 현재 항목 목록을 받아 새 목록을 돌려주는 함수이며,
+저장소는 읽은 뒤 바뀌었으면 다시 읽어 적용합니다 (Firestore: update_time 조건부 쓰기, SQLite: 쓰기 잠금).
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import metrics
+import state_store
+
+STORAGE_BACKEND = os.environ.get('CRAWLER_STORAGE', 'firestore')  # firestore | sqlite
+STORAGE_MIRROR = os.environ.get('CRAWLER_STORAGE_MIRROR', '').lower() in ('1', 'true', 'yes')
+SQLITE_PATH = os.environ.get('CRAWLER_SQLITE_PATH', os.path.join(state_store.STATE_DIR, 'notices.sqlite3'))
+
+NOTICE_COLLECTION = 'notices'
+FEED_COLLECTION = 'feeds'
+KEYWORD_COLLECTION = 'keyword_topics'  # 앱이 등록한 키워드 (문서 ID = 키워드 토픽)
+FIRESTORE_BATCH_LIMIT = 500
+FEED_WRITE_ATTEMPTS = 5  # 피드를 읽은 뒤 다른 쓰기가 끼어들어 다시 시도할 최대 횟수
+
+class Storage:
+    """저장소 인터페이스"""
+
+    def exists_many(self, doc_ids, source=''):
+        """doc_ids 중 이미 저장된 doc ID 집합"""
+        raise NotImplementedError
+
+    def get_feed(self, source):
+        """소스 피드 항목 목록 (없으면 빈 목록)"""
+        raise NotImplementedError
+
+    def put_many(self, source, notices, update_feed=None):
+        """신규 글 {doc_id: data}를 저장하고 (주어지면) 소스 피드를 update_feed(현재 항목)로 갱신
+
+        created_at은 저장소가 채웁니다.
+        """
+        raise NotImplementedError
+
+    def update_feed(self, source, update):
+        """소스 피드를 update(현재 항목)의 결과로 갱신"""
+        return self.put_many(source, {}, update)
+
+    def iter_notices(self, fields=None):
+        """저장된 모든 글을 (doc_id, data)로 순회 (fields가 주어지면 그 필드만)"""
+        raise NotImplementedError
+
+    def keyword_topics(self):
+        """키워드 토픽 문서 목록 [{'source', 'keyword', 'subscribers'}]"""
+        raise NotImplementedError
+
+def feed_document(source, items):
+    return {
+        'source': source,
+        'items': items,
+        'count': len(items),
+    }
+
+# --- Firestore ---
+
+class FirestoreStorage(Storage):
+    """Firestore 저장소 (notices, feeds, keyword_topics 컬렉션)"""
+
+    def __init__(self, db):
+        from firebase_admin import firestore
+
+        self.db = db
+        self._server_timestamp = firestore.SERVER_TIMESTAMP
+
+    def exists_many(self, doc_ids, source=''):
+        notices_ref = self.db.collection(NOTICE_COLLECTION)
+        doc_ids = list(doc_ids)
+        existing = set()
+        for i in range(0, len(doc_ids), FIRESTORE_BATCH_LIMIT):
+            refs = [notices_ref.document(doc_id) for doc_id in doc_ids[i:i + FIRESTORE_BATCH_LIMIT]]
+            for snapshot in self.db.get_all(refs):
+                if snapshot.exists:
+                    existing.add(snapshot.id)
+            metrics.count('firestore_rpc', source, method='get_all')
+        return existing
+
+    def get_feed(self, source):
+        snapshot = self.db.collection(FEED_COLLECTION).document(source).get()
+        metrics.count('firestore_rpc', source, method='get')
+        return (snapshot.to_dict() or {}).get('items', []) if snapshot.exists else []
+
+    def put_many(self, source, notices, update_feed=None):
+        notices_ref = self.db.collection(NOTICE_COLLECTION)
+        doc_ids = list(notices)
+        # 피드 문서 자리 하나를 남기고 나눠, 피드는 마지막 batch에 함께 씀
+        chunk_size = FIRESTORE_BATCH_LIMIT - 1
+        chunks = [doc_ids[i:i + chunk_size] for i in range(0, len(doc_ids), chunk_size)] or [[]]
+
+        def add_notices(batch, chunk):
+            for doc_id in chunk:
+                batch.set(notices_ref.document(doc_id), {**notices[doc_id], 'created_at': self._server_timestamp})
+
+        for chunk in chunks[:-1]:
+            batch = self.db.batch()
+            add_notices(batch, chunk)
+            batch.commit()
+            metrics.count('firestore_rpc', source, method='commit')
+
+        if update_feed is None:
+            batch = self.db.batch()
+            add_notices(batch, chunks[-1])
+            batch.commit()
+            metrics.count('firestore_rpc', source, method='commit')
+            return
+
+        # 읽은 뒤 피드가 바뀌었으면(update_time 불일치 / 그 사이 다른 실행이 처음 만듦) batch 전체가 실패하므로
+        # 다시 읽어 적용 (글 쓰기는 같은 값이라 다시 써도 됨)
+        from google.api_core import exceptions as api_exceptions
+
+        for attempt in range(FEED_WRITE_ATTEMPTS):
+            batch = self.db.batch()
+            add_notices(batch, chunks[-1])
+            self._add_feed(batch, source, update_feed)
+            try:
+                batch.commit()
+            except (api_exceptions.FailedPrecondition, api_exceptions.Conflict, api_exceptions.Aborted) as e:
+                if attempt == FEED_WRITE_ATTEMPTS - 1:
+                    raise
+                metrics.count('feed_conflicts', source)
+                print(f"  🔁 [{source}] 피드가 그 사이 바뀌어 다시 합칩니다: {e}")
+                continue
+            finally:
+                metrics.count('firestore_rpc', source, method='commit')
+            return
+
+    def _add_feed(self, batch, source, update_feed):
+        """피드를 읽어 갱신한 값을 batch에 추가 (읽은 뒤 바뀌지 않았을 때만 쓰이도록 조건부)"""
+        ref = self.db.collection(FEED_COLLECTION).document(source)
+        snapshot = ref.get()
+        metrics.count('firestore_rpc', source, method='get')
+        items = (snapshot.to_dict() or {}).get('items', []) if snapshot.exists else []
+        data = {**feed_document(source, update_feed(items)), 'updated_at': self._server_timestamp}
+        if snapshot.exists:
+            batch.update(ref, data, option=self.db.write_option(last_update_time=snapshot.update_time))
+        else:
+            batch.create(ref, data)
+
+    def iter_notices(self, fields=None):
+        query = self.db.collection(NOTICE_COLLECTION)
+        if fields is not None:
+            query = query.select(fields)
+        for snapshot in query.stream():
+            yield snapshot.id, snapshot.to_dict() or {}
+
+    def keyword_topics(self):
+        return [snapshot.to_dict() or {} for snapshot in self.db.collection(KEYWORD_COLLECTION).stream()]
+
+# --- 로컬 SQLite ---
+# 필드 값은 JSON으로 저장하고 datetime은 {'$datetime': ISO 문자열}로 바꿔 둡니다.
+
+_SQLITE_CHUNK = 500
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notices (
+    doc_id TEXT PRIMARY KEY,
+    source TEXT,
+    created_at REAL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS notices_source_created_at ON notices (source, created_at);
+
+CREATE TABLE IF NOT EXISTS feeds (
+    source TEXT PRIMARY KEY,
+    data TEXT
+);
+
+CREATE TABLE IF NOT EXISTS keyword_topics (
+    topic TEXT PRIMARY KEY,
+    source TEXT,
+    keyword TEXT,
+    subscribers INTEGER DEFAULT 0
+);
+"""
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    raise TypeError(f"JSON으로 저장할 수 없는 값: {type(value).__name__}")
+
+def _json_object_hook(obj):
+    if len(obj) == 1 and '$datetime' in obj:
+        return datetime.fromisoformat(obj['$datetime'])
+    return obj
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+def _loads(text):
+    return json.loads(text, object_hook=_json_object_hook)
+
+class SQLiteStorage(Storage):
+    """로컬 SQLite 저장소 (WAL, 프로세스 안의 여러 스레드가 연결 하나를 공유)"""
+
+    def __init__(self, path=None):
+        self.path = path or SQLITE_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SQLITE_SCHEMA)
+
+    def exists_many(self, doc_ids, source=''):
+        doc_ids = list(doc_ids)
+        existing = set()
+        with self._lock:
+            for i in range(0, len(doc_ids), _SQLITE_CHUNK):
+                chunk = doc_ids[i:i + _SQLITE_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(f'SELECT doc_id FROM notices WHERE doc_id IN ({placeholders})', chunk)
+                existing.update(row[0] for row in rows)
+        return existing
+
+    def get_feed(self, source):
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM feeds WHERE source = ?', (source,)).fetchone()
+        return _loads(row[0]).get('items', []) if row else []
+
+    def put_many(self, source, notices, update_feed=None):
+        now = datetime.now(timezone.utc)
+        rows = [
+            (doc_id, data.get('source', source), now.timestamp(), _dumps({**data, 'created_at': now}))
+            for doc_id, data in notices.items()
+        ]
+        with self._lock:
+            # 피드를 읽기 전에 쓰기 잠금을 잡아 다른 프로세스의 쓰기가 끼어들지 않게 함
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO notices (doc_id, source, created_at, data) VALUES (?, ?, ?, ?)', rows
+                )
+                if update_feed is not None:
+                    row = self._conn.execute('SELECT data FROM feeds WHERE source = ?', (source,)).fetchone()
+                    items = _loads(row[0]).get('items', []) if row else []
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO feeds (source, data) VALUES (?, ?)',
+                        (source, _dumps({**feed_document(source, update_feed(items)), 'updated_at': now}))
+                    )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def iter_notices(self, fields=None):
+        # 순회하는 동안 다른 스레드가 쓸 수 있도록 잠금 없이 읽을 별도 연결 사용 (WAL 스냅샷)
+        conn = sqlite3.connect(self.path)
+        try:
+            for doc_id, data in conn.execute('SELECT doc_id, data FROM notices ORDER BY created_at'):
+                data = _loads(data)
+                if fields is not None:
+                    data = {key: data[key] for key in fields if key in data}
+                yield doc_id, data
+        finally:
+            conn.close()
+
+    def keyword_topics(self):
+        with self._lock:
+            rows = self._conn.execute('SELECT source, keyword, subscribers FROM keyword_topics').fetchall()
+        return [{'source': source, 'keyword': keyword, 'subscribers': subscribers}
+                for source, keyword, subscribers in rows]
+
+    def put_keyword_topics(self, topics):
+        """키워드 토픽 등록 (오프라인 테스트용). topics: [(topic, source, keyword, subscribers)]"""
+        with self._lock:
+            self._conn.execute('BEGIN')
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO keyword_topics (topic, source, keyword, subscribers) VALUES (?, ?, ?, ?)',
+                list(topics)
+            )
+            self._conn.execute('COMMIT')
+
+    def count(self, source=None):
+        """저장된 글 수 (source가 주어지면 그 소스만)"""
+        with self._lock:
+            if source is None:
+                return self._conn.execute('SELECT COUNT(*) FROM notices').fetchone()[0]
+            return self._conn.execute('SELECT COUNT(*) FROM notices WHERE source = ?', (source,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# --- Firestore + 로컬 복사본 ---
+
+class MirrorStorage(Storage):
+    """읽기는 primary에서, 쓰기는 primary에 한 뒤 mirror에도 복사 (복사 실패는 경고만)"""
+
+    def __init__(self, primary, mirror):
+        self.primary = primary
+        self.mirror = mirror
+
+    def exists_many(self, doc_ids, source=''):
+        return self.primary.exists_many(doc_ids, source)
+
+    def get_feed(self, source):
+        return self.primary.get_feed(source)
+
+    def put_many(self, source, notices, update_feed=None):
+        self.primary.put_many(source, notices, update_feed)
+        try:
+            self.mirror.put_many(source, notices, update_feed)
+        except Exception as e:
+            print(f"  ⚠️ 로컬 복사본 저장 실패: {e}")
+
+    def iter_notices(self, fields=None):
+        return self.primary.iter_notices(fields)
+
+    def keyword_topics(self):
+        return self.primary.keyword_topics()
@@ -1,11 +1,9 @@
-import firebase_admin
-from firebase_admin import credentials, messaging
-import os
+from firebase_admin import messaging
 
-# 1. Firebase 설정 (기존 키 파일 사용)
-cred_path = os.path.join(os.path.dirname(__file__), 'serviceAccountKey.json')
-cred = credentials.Certificate(cred_path)
-firebase_admin.initialize_app(cred)
+import main
+
+# 1. 발송 방식 준비 (기존 키 파일 사용, CRAWLER_FCM_TRANSPORT=fake면 실제 기기로 보내지 않음)
+transport = main.get_fcm_transport()
 
 # 2. 테스트 메시지 구성
 print("🔔 테스트 알림을 전송합니다...")
@@ -19,12 +17,13 @@ message = messaging.Message(
         'link': 'https://www.lh.or.kr',
         'type': 'test'
     },
-    topic='lh_notice',  # 앱에서 구독 중인 주제
+    # 크롤러가 LH 새 글을 보내는 대상과 같음 (현재 앱의 notice_LH 또는 이전 버전 앱의 lh_notice 구독 기기)
+    **main._topic_target(main.broadcast_topics('LH')),
 )
 
 # 3. 전송
 try:
-    response = messaging.send(message)
+    response = transport.send(message)
     print('✅ 성공! 메시지 ID:', response)
 except Exception as e:
-    print('❌ 실패:', e)
\ No newline at end of file
+    print('❌ 실패:', e)
@@ -0,0 +1,62 @@
+"""크롤러 테스트 공통 설정 (네트워크, Firebase 없이 실행)
+
+main을 import하기 전에 임시 상태 폴더, 로컬 SQLite 저장소, 가짜 FCM을 쓰도록 환경 변수를 정합니다.
+테스트마다 로컬 상태 DB를 비우고 새 SQLite 저장소를 씁니다.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+_STATE_DIR = tempfile.mkdtemp(prefix='crawler-test-')
+os.environ['CRAWLER_STATE_DIR'] = _STATE_DIR
+os.environ['CRAWLER_STORAGE'] = 'sqlite'
+os.environ['CRAWLER_METRICS_FILE'] = ''
+os.environ['CRAWLER_FCM_TRANSPORT'] = 'fake'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+import metrics  # noqa: E402
+import state_store  # noqa: E402
+import storage  # noqa: E402
+from fakes import FakeMessaging  # noqa: E402
+
+def pytest_sessionfinish(session, exitstatus):
+    state_store.close()
+    shutil.rmtree(_STATE_DIR, ignore_errors=True)
+
+@pytest.fixture(autouse=True)
+def clean_state(tmp_path, monkeypatch):
+    """로컬 상태 DB 비우기 + 테스트 전용 SQLite 저장소와 가짜 FCM"""
+    state_store.reset()
+    metrics.reset()
+    store = storage.SQLiteStorage(str(tmp_path / 'notices.sqlite3'))
+    monkeypatch.setattr(main, '_storage', store)
+    monkeypatch.setattr(main, '_keyword_cache', {'matchers': None, 'loaded_at': 0.0})
+    monkeypatch.setattr(main, '_crawling_sources', {})
+    monkeypatch.setattr(main, '_first_flushed', set())
+    monkeypatch.setattr(main, 'FCM_RETRY_BACKOFF', 0)
+    main.set_fcm_transport(FakeMessaging())
+    yield store
+    main.set_fcm_transport(None)
+    store.close()
+
+@pytest.fixture
+def store(clean_state):
+    """테스트 전용 SQLite 저장소 (main.get_storage()와 같은 객체)"""
+    return clean_state
+
+def pending_notification(doc_id, title, source='LH', sent=(), created_at=0.0):
+    """state_store.outbox_pending()과 같은 모양의 대기 알림"""
+    return {
+        'doc_id': doc_id,
+        'title': title,
+        'link': f'https://example.invalid/{source}/{doc_id}',
+        'source': source,
+        'attempts': 0,
+        'created_at': created_at,
+        'sent': set(sent),
+    }
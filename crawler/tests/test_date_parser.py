@@ -0,0 +1,31 @@
+"""게시판 날짜 문자열 정규화 (date_parser)"""
+from datetime import datetime
+
+from date_parser import KST, date_fields, parse_date_range
+
+def day(year, month, date):
+    return datetime(year, month, date, tzinfo=KST)
+
+def test_single_dates():
+    assert parse_date_range('2025.12.08') == (day(2025, 12, 8), day(2025, 12, 8))
+    assert parse_date_range('등록일 : 2025-12-08') == (day(2025, 12, 8), day(2025, 12, 8))
+    assert parse_date_range('2025. 3. 7') == (day(2025, 3, 7), day(2025, 3, 7))
+
+def test_range_without_end_year_rolls_into_next_year():
+    assert parse_date_range('2025-12-16 ~ 01-11') == (day(2025, 12, 16), day(2026, 1, 11))
+    assert parse_date_range('2025-03-02 ~ 03-20') == (day(2025, 3, 2), day(2025, 3, 20))
+    assert parse_date_range('2025-03-02 ~ 2025-04-01') == (day(2025, 3, 2), day(2025, 4, 1))
+
+def test_short_year():
+    assert parse_date_range('25.12.08') == (day(2025, 12, 8), day(2025, 12, 8))
+
+def test_unknown_dates():
+    assert parse_date_range('날짜 없음') == (None, None)
+    assert parse_date_range('') == (None, None)
+    assert parse_date_range(None) == (None, None)
+    assert parse_date_range('2025-13-40') == (None, None)
+
+def test_date_fields_fallback():
+    crawled_at = day(2025, 12, 1)
+    assert date_fields('날짜 없음', crawled_at) == {'date_at': crawled_at, 'date_start': None, 'date_end': None}
+    assert date_fields('2025.12.08', crawled_at)['date_at'] == day(2025, 12, 8)
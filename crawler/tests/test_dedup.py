@@ -0,0 +1,133 @@
+"""같은 글 판별 (URL 정규화, MinHash 후보, 제목 유사도 기준, 중복 건너뛰기)"""
+import sqlite3
+import time
+
+import pytest
+
+import main
+import state_store
+from dedup import canonical_url, jaccard, lsh_bands, minhash, title_bands, title_numbers, title_shingles
+
+# 블록 번호만 다른 LH 공고 (정규화 제목이 길어 문자 3-gram 유사도가 기준 0.9를 넘음)
+BLOCK_3 = '2025년 경기 남양주 왕숙 공공주택지구 A-3블록 공공분양주택 건축설계 공모 시행 공고 및 현장설명회 개최 안내 (참가등록 마감 연장에 따른 일정 변경)'
+BLOCK_4 = BLOCK_3.replace('A-3블록', 'A-4블록')
+
+def lh_link(list_no, page=1):
+    return f'https://www.lh.or.kr/board.es?mid=a10601020000&bid=0034&act=view&list_no={list_no}&tag=&nPage={page}'
+
+def remember(doc_id, source, link, title, seen_at=None):
+    """이미 저장된 글의 지문 기록 (저장 후 check_and_save_batch가 하는 것과 같음)"""
+    _, bands = title_bands(title)
+    state_store.fingerprints_add([(doc_id, source, canonical_url(link), title, seen_at or time.time(), bands)])
+
+def candidates_of(*rows):
+    return {main.notice_doc_id(link): (link, {'title': title}) for link, title in rows}
+
+def test_minhash_estimates_jaccard():
+    a = title_shingles(BLOCK_3)
+    b = title_shingles(BLOCK_4)
+    exact = jaccard(a, b)
+    agree = sum(x == y for x, y in zip(minhash(a), minhash(b))) / len(minhash(a))
+    assert exact >= main.NEAR_DUP_THRESHOLD
+    assert abs(agree - exact) < 0.15
+    assert set(lsh_bands(minhash(a))) & set(lsh_bands(minhash(b)))
+    assert minhash(a) == minhash(set(a))  # 실행마다 같은 서명
+
+def test_title_normalization():
+    assert title_shingles('[공모] 디자인 공모전') == title_shingles('디자인공모전!')
+    assert title_numbers('[2025] A-3블록') == ['3']  # 앞머리 태그는 숫자 비교에서도 빠짐
+    assert title_numbers(BLOCK_3) == ['2025', '3']
+    assert jaccard(set(), {'abc'}) == 0.0
+
+def test_canonical_url_drops_volatile_params():
+    onclick = 'https://www.lh.or.kr/board.es?mid=a10601020000&bid=0034&act=view&list_no=729895&tag=&nPage=1'
+    fallback = 'http://WWW.LH.OR.KR/board.es?list_no=729895&act=view&bid=0034&mid=a10601020000&nPage=3#top'
+    assert canonical_url(onclick) == canonical_url(fallback)
+    assert canonical_url(onclick) == 'https://www.lh.or.kr/board.es?act=view&bid=0034&list_no=729895&mid=a10601020000'
+
+def test_canonical_url_keeps_identity():
+    assert canonical_url('https://news.seoul.go.kr/culture/archives/123/?utm_source=x') == \
+        'https://news.seoul.go.kr/culture/archives/123'
+    assert canonical_url('https://example.org:8080/a') == 'https://example.org:8080/a'
+    assert canonical_url('https://example.org/board?no=1') != canonical_url('https://example.org/board?no=2')
+
+def test_same_source_block_numbers_are_not_duplicates():
+    remember('lh-3', 'LH', lh_link(3), BLOCK_3)
+    candidates = candidates_of((lh_link(4), BLOCK_4))
+    kept, duplicates, _ = main.find_duplicates('LH', list(candidates), candidates)
+    assert kept == list(candidates)
+    assert duplicates == {}
+
+def test_cross_source_titles_need_matching_numbers():
+    remember('lh-3', 'LH', lh_link(3), BLOCK_3)
+    link = 'https://news.seoul.go.kr/culture/archives/510001'
+    candidates = candidates_of((link, BLOCK_4))
+    kept, duplicates, _ = main.find_duplicates('Seoul', list(candidates), candidates)
+    assert kept == list(candidates) and duplicates == {}
+
+    candidates = candidates_of((link, f'[재공고] {BLOCK_3}'))
+    kept, duplicates, _ = main.find_duplicates('Seoul', list(candidates), candidates)
+    assert kept == []
+    assert duplicates == {main.notice_doc_id(link): ('lh-3', '제목 (LH)')}
+
+def test_title_match_outside_window_is_kept():
+    remember('lh-3', 'LH', lh_link(3), BLOCK_3, seen_at=time.time() - main.NEAR_DUP_WINDOW - 3600)
+    candidates = candidates_of(('https://news.seoul.go.kr/culture/archives/510001', BLOCK_3))
+    kept, _, _ = main.find_duplicates('Seoul', list(candidates), candidates)
+    assert kept == list(candidates)
+
+def test_url_duplicates_in_index_and_batch():
+    remember('lh-old', 'LH', lh_link(729895), '설계공모 시행 공고')
+    candidates = candidates_of(
+        (lh_link(729895, page=2), '설계공모 시행 공고'),
+        (lh_link(729900), '다른 공고'),
+        (lh_link(729900, page=3), '다른 공고'),
+    )
+    doc_ids = list(candidates)
+    kept, duplicates, fingerprints = main.find_duplicates('LH', doc_ids, candidates)
+    assert kept == [doc_ids[1]]
+    assert duplicates == {doc_ids[0]: ('lh-old', 'URL'), doc_ids[2]: (doc_ids[1], 'URL')}
+    assert [f[0] for f in fingerprints] == kept
+
+def test_duplicates_are_marked_seen_with_reason(store, monkeypatch):
+    remember('lh-3', 'LH', lh_link(3), BLOCK_3)
+    remember('lh-old', 'LH', lh_link(729895), '설계공모 시행 공고')
+    repost = {'title': f'[재공고] {BLOCK_3}', 'link': 'https://news.seoul.go.kr/culture/archives/510001'}
+    moved = {'title': '설계공모 시행 공고', 'link': lh_link(729895, page=2)}
+
+    assert main.check_and_save_batch(store, [repost], 'Seoul') == 0
+    assert main.check_and_save_batch(store, [moved], 'LH') == 0
+    assert store.count() == 0
+    rows = state_store.get_connection().execute('SELECT doc_id, reason FROM seen').fetchall()
+    assert dict(rows) == {main.notice_doc_id(repost['link']): '제목 (LH)', main.notice_doc_id(moved['link']): 'URL'}
+
+    # 제목 비교 기간이 지나 지문이 지워져도 목록에 남은 글을 다시 저장/발송하지 않고 저장소에 묻지도 않음
+    state_store.fingerprints_prune(time.time() + main.NEAR_DUP_WINDOW + 86400)
+    monkeypatch.setattr(store, 'exists_many', lambda *args, **kwargs: pytest.fail('저장소 조회'))
+    assert main.check_and_save_batch(store, [repost], 'Seoul') == 0
+    assert store.count() == 0
+    assert state_store.outbox_pending() == []
+
+def test_old_state_db_gains_reason_column(tmp_path, monkeypatch):
+    path = str(tmp_path / 'crawler_state.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE seen (doc_id TEXT PRIMARY KEY, source TEXT) WITHOUT ROWID')
+    conn.execute("INSERT INTO seen VALUES ('d1', 'LH')")
+    conn.commit()
+    conn.close()
+
+    state_store.close()
+    monkeypatch.setattr(state_store, 'STATE_DIR', str(tmp_path))
+    monkeypatch.setattr(state_store, 'STATE_DB_PATH', path)
+    try:
+        state_store.seen_add(['d2'], 'LH', 'URL')
+        assert state_store.seen_unknown(['d1', 'd2', 'd3']) == ['d3']
+    finally:
+        state_store.close()
+
+def test_new_rows_are_saved_once(store):
+    rows = [{'number': '4', 'title': BLOCK_4, 'date': '2025.12.10', 'link': lh_link(4)}]
+    assert main.check_and_save_batch(store, rows, 'LH') == 1
+    assert main.check_and_save_batch(store, rows, 'LH') == 0
+    assert store.count('LH') == 1
+    assert [n['doc_id'] for n in state_store.outbox_pending()] == [main.notice_doc_id(lh_link(4))]
@@ -0,0 +1,20 @@
+"""제목 키워드 매처 (Aho-Corasick)와 키워드 토픽 이름"""
+from keyword_matcher import KeywordMatcher, keyword_topic
+
+def test_overlapping_keywords():
+    matcher = KeywordMatcher(['주택', '행복주택', '행복', '공모'])
+    assert matcher.find('2025 행복주택 설계공모') == ['주택', '행복주택', '행복', '공모']
+    assert matcher.find('전시 안내') == []
+
+def test_keywords_ignore_case_and_keep_registered_form():
+    matcher = KeywordMatcher(['LH', ' Design '])
+    assert matcher.find('lh 공공DESIGN 공모') == ['LH', ' Design ']
+
+def test_duplicate_and_empty_keywords():
+    matcher = KeywordMatcher(['공모', '공모', '  ', ''])
+    assert matcher.keywords == ['공모']
+    assert matcher.find('공모 공모') == ['공모']
+    assert not KeywordMatcher([])
+
+def test_keyword_topic_is_percent_encoded():
+    assert keyword_topic('LH', ' 행복주택 ') == 'kw_LH_%ED%96%89%EB%B3%B5%EC%A3%BC%ED%83%9D'
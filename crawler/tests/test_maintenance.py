@@ -0,0 +1,80 @@
+"""대량 관리 도구 (문서 ID 다시 맞추기, 내보내기)와 로컬 상태 초기화"""
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import main
+import maintenance
+import state_store
+from fakes import FakeFirestore
+
+def link(number):
+    return f'https://www.lh.or.kr/board.es?act=view&list_no={number}'
+
+def notice(number):
+    return {'title': f'공고 {number}', 'date': f'2025.12.{number:02d}', 'link': link(number), 'source': 'LH'}
+
+@pytest.fixture
+def db():
+    """문서 ID가 md5(link)와 다른 글(1: 옮길 글, 2: 올바른 문서가 이미 있는 중복)이 섞인 가짜 Firestore"""
+    db = FakeFirestore()
+    notices = db.collection('notices')
+    notices.document('legacy-1').set(notice(1))
+    notices.document('legacy-2').set(notice(2))
+    notices.document(main.notice_doc_id(link(2))).set(notice(2))
+    notices.document(main.notice_doc_id(link(3))).set(notice(3))
+    now = datetime.now(timezone.utc)
+    items = [main.feed_item(doc_id, link(n), notice(n), now)
+             for doc_id, n in (('legacy-1', 1), ('legacy-2', 2), (main.notice_doc_id(link(2)), 2))]
+    main.as_storage(db).update_feed('LH', lambda _: main.merge_feed([], items))
+    return db
+
+def test_rehash_doc_ids_moves_documents_and_feed_items(db, monkeypatch):
+    monkeypatch.setattr(maintenance, 'REHASH_CHUNK', 1)
+    assert maintenance.rehash_doc_ids(db, partitions=2) == (1, 1)
+
+    notices = db.collections['notices']
+    assert set(notices) == {main.notice_doc_id(link(n)) for n in (1, 2, 3)}
+    assert notices[main.notice_doc_id(link(1))] == notice(1)
+    # 피드 항목도 새 ID로 바뀌고 같은 글이 된 항목은 하나만 남음
+    feed = main.as_storage(db).get_feed('LH')
+    assert [item['id'] for item in feed] == [main.notice_doc_id(link(2)), main.notice_doc_id(link(1))]
+
+def test_rehash_dry_run_changes_nothing(db):
+    before = json.dumps(db.collections, default=str, sort_keys=True)
+    assert maintenance.rehash_doc_ids(db, dry_run=True) == (1, 1)
+    assert json.dumps(db.collections, default=str, sort_keys=True) == before
+
+def test_export_jsonl(db, tmp_path):
+    path = str(tmp_path / 'notices.jsonl')
+    assert maintenance.export_collection(db, 'notices', path, partitions=2) == 4
+    with open(path, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert {row['id'] for row in rows} == set(db.collections['notices'])
+
+def test_export_parquet_in_batches(db, tmp_path, monkeypatch):
+    parquet = pytest.importorskip('pyarrow.parquet')
+    monkeypatch.setattr(maintenance, 'PARQUET_BATCH_ROWS', 3)
+    path = str(tmp_path / 'notices.parquet')
+    assert maintenance.export_collection(db, 'notices', path, partitions=2) == 4
+    table = parquet.read_table(path)
+    assert table.num_rows == 4
+    assert parquet.ParquetFile(path).num_row_groups == 2
+
+def test_reset_clears_notice_state():
+    state_store.seen_add(['d1'], 'LH')
+    state_store.set_watermark('LH', 100)
+    state_store.save_validators('https://example.invalid', 'etag', None, 'hash')
+    state_store.outbox_add([('d1', '공고', 'https://example.invalid/d1', 'LH')])
+    state_store.outbox_mark_sent([('d1', main.BROADCAST_TARGET)])
+    state_store.fingerprints_add([('d1', 'LH', 'https://example.invalid/d1', '공고', 0.0, ['0:ab'])])
+    state_store.save_schedule('LH', 0.0, 0.0, 3600, 3600)
+
+    state_store.reset()
+    assert state_store.seen_unknown(['d1']) == ['d1']
+    assert state_store.get_watermark('LH') is None
+    assert state_store.get_validators('https://example.invalid') is None
+    assert state_store.outbox_pending() == []
+    assert state_store.fingerprint_by_url('https://example.invalid/d1') is None
+    assert state_store.get_schedule('LH') is None
@@ -0,0 +1,199 @@
+"""알림 묶기(요약 알림)와 발송, 키워드 토픽과 대상별 발송 기록, 크롤링 중인 소스의 알림 보류"""
+import time
+
+import main
+import state_store
+from conftest import pending_notification
+from fakes import FakeMessaging, fcm_error
+from keyword_matcher import keyword_topic
+
+def register_keywords(store, source, *keywords):
+    store.put_keyword_topics((keyword_topic(source, keyword), source, keyword, 1) for keyword in keywords)
+
+def targets_of(units):
+    return [sorted(unit['targets']) for unit in units]
+
+def test_single_notifications_up_to_threshold(monkeypatch):
+    monkeypatch.setattr(main, 'DIGEST_THRESHOLD', 3)
+    pending = [pending_notification(f'd{i}', f'공고 {i}') for i in range(3)]
+    units = main.coalesce_notifications(pending)
+    assert targets_of(units) == [[(f'd{i}', main.BROADCAST_TARGET)] for i in range(3)]
+    assert units[0]['message'].condition == "'lh_notice' in topics || 'notice_LH' in topics"
+
+def test_digest_above_threshold(monkeypatch):
+    monkeypatch.setattr(main, 'DIGEST_THRESHOLD', 3)
+    monkeypatch.setitem(main.DIGEST_THRESHOLDS, 'KAMS', 10)
+    pending = [pending_notification(f'd{i}', f'공고 {i}') for i in range(4)]
+    pending += [pending_notification(f'k{i}', f'KAMS {i}', source='KAMS') for i in range(4)]
+    units = main.coalesce_notifications(pending)
+
+    digest = units[0]
+    assert digest['targets'] == [(f'd{i}', main.BROADCAST_TARGET) for i in range(4)]
+    assert digest['message'].data['type'] == 'digest'
+    assert digest['message'].data['count'] == '4'
+    assert digest['message'].data['ids'] == 'd0,d1,d2,d3'
+    assert digest['message'].notification.body == '새 공지 4건: 공고 0 외 3건'
+    # KAMS는 소스별 기준(10건) 이하라 건별 발송
+    assert len(units) == 5
+
+def test_digest_ids_are_truncated(monkeypatch):
+    monkeypatch.setattr(main, 'DIGEST_THRESHOLD', 1)
+    pending = [pending_notification(f'd{i}', f'공고 {i}') for i in range(main.DIGEST_MAX_IDS + 1)]
+    [digest] = main.coalesce_notifications(pending)
+    assert len(digest['message'].data['ids'].split(',')) == main.DIGEST_MAX_IDS
+    assert digest['message'].data['ids_truncated'] == '1'
+
+def test_flush_sends_digest_and_empties_outbox(monkeypatch):
+    monkeypatch.setattr(main, 'DIGEST_THRESHOLD', 2)
+    state_store.outbox_add([(f'd{i}', f'공고 {i}', f'https://example.invalid/{i}', 'LH') for i in range(3)])
+    fcm = main.get_fcm_transport()
+    assert main.flush_notifications() == (1, 0)
+    assert [message.data['count'] for message in fcm.sent] == ['3']
+    assert state_store.outbox_pending() == []
+
+def outbox_add(*doc_ids, source='LH'):
+    state_store.outbox_add([(doc_id, f'공고 {doc_id}', f'https://example.invalid/{doc_id}', source) for doc_id in doc_ids])
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, '시간 초과'
+        time.sleep(0.01)
+
+def test_first_notification_of_a_crawl_is_not_held():
+    fcm = main.get_fcm_transport()
+    main.hold_notifications('LH')
+    outbox_add('a')
+    assert main.flush_notifications(hold=True) == (1, 0)
+
+    # 첫 발송 뒤의 글은 크롤링이 끝날 때까지 모아 둠 (다른 소스는 바로 발송)
+    outbox_add('b', 'c')
+    outbox_add('k', source='KAMS')
+    assert main.flush_notifications(hold=True) == (1, 0)
+    assert [n['doc_id'] for n in state_store.outbox_pending()] == ['b', 'c']
+
+    main.release_notifications('LH')
+    assert main.flush_notifications(hold=True) == (2, 0)
+    assert len(fcm.sent) == 4
+
+    # 다음 크롤링의 첫 알림도 바로 발송
+    main.hold_notifications('LH')
+    outbox_add('d')
+    assert main.flush_notifications(hold=True) == (1, 0)
+    main.release_notifications('LH')
+
+def test_held_notifications_are_released_after_max_hold():
+    now = time.time()
+    pending = [pending_notification('a', '공고', created_at=now)]
+    main.hold_notifications('LH')
+    assert main.held_sources(pending, now) == {}
+
+    main._first_flushed.add('LH')
+    assert main.held_sources(pending, now) == {'LH': now + main.NOTIFY_MAX_HOLD}
+    # 가장 오래된 알림이 NOTIFY_MAX_HOLD를 넘기면 더 기다리지 않음
+    assert main.held_sources(pending, now + main.NOTIFY_MAX_HOLD + 1) == {}
+    main.release_notifications('LH')
+    assert main.held_sources(pending, now) == {}
+
+def test_dispatcher_sends_first_item_while_source_is_crawling(monkeypatch):
+    monkeypatch.setattr(main, 'DIGEST_THRESHOLD', 2)
+    fcm = main.get_fcm_transport()
+    dispatcher = main.NotificationDispatcher(linger=0).start()
+    monkeypatch.setattr(main, '_dispatcher', dispatcher)
+    try:
+        main.hold_notifications('LH')
+        outbox_add('a')
+        dispatcher.wake()
+        # 첫 글은 뒤에 올 행 수와 관계없이 크롤링이 끝나기 전에 발송
+        wait_until(lambda: len(fcm.sent) == 1)
+
+        outbox_add('b', 'c', 'd')
+        dispatcher.wake()
+        time.sleep(0.2)
+        assert len(fcm.sent) == 1
+
+        main.release_notifications('LH')
+        wait_until(lambda: len(fcm.sent) == 2)
+        assert fcm.sent[1].data['count'] == '3'
+    finally:
+        dispatcher.close()
+
+def test_keyword_topics_digest_and_condition(store, monkeypatch):
+    monkeypatch.setattr(main, 'DIGEST_THRESHOLD', 2)
+    register_keywords(store, 'LH', '행복주택', '설계')
+    pending = [
+        pending_notification('a', '행복주택 설계공모 1'),
+        pending_notification('b', '행복주택 공모 2'),
+        pending_notification('c', '행복주택 공모 3'),
+    ]
+    units = main.coalesce_notifications(pending)
+    by_label = {unit['label']: unit for unit in units}
+
+    happy = keyword_topic('LH', '행복주택')
+    design = keyword_topic('LH', '설계')
+    digest = by_label["LH 키워드 '행복주택' 요약 3건"]
+    assert digest['targets'] == [('a', happy), ('b', happy), ('c', happy)]
+    assert digest['message'].topic == happy
+    assert digest['message'].data['keywords'] == '행복주택'
+    # '설계'는 1건이라 건별 알림
+    single = by_label['행복주택 설계공모 1 (키워드: 설계)']
+    assert single['targets'] == [('a', design)]
+    assert len(units) == 3  # 소스 요약 1건 + 키워드 요약 1건 + 키워드 건별 1건
+
+def test_one_push_per_notice_for_several_keywords(store):
+    register_keywords(store, 'LH', '행복주택', '설계')
+    units = main.coalesce_notifications([pending_notification('a', '행복주택 설계공모')])
+    keyword_units = [unit for unit in units if unit['targets'][0][1] != main.BROADCAST_TARGET]
+    assert len(keyword_units) == 1
+    assert keyword_units[0]['message'].condition == (
+        f"'{keyword_topic('LH', '행복주택')}' in topics || '{keyword_topic('LH', '설계')}' in topics"
+    )
+
+def test_sent_targets_are_not_rebuilt(store):
+    register_keywords(store, 'LH', '행복주택')
+    pending = [pending_notification('a', '행복주택 공모', sent=[main.BROADCAST_TARGET])]
+    units = main.coalesce_notifications(pending)
+    assert targets_of(units) == [[('a', keyword_topic('LH', '행복주택'))]]
+
+class KeywordTopicsDown(FakeMessaging):
+    """키워드 토픽으로 가는 메시지만 일시적 오류로 실패시키는 가짜 FCM"""
+
+    def send_each(self, messages, dry_run=False):
+        batch = super().send_each(messages, dry_run)
+        for message, response in zip(messages, batch.responses):
+            if 'kw_' in (message.topic or message.condition or ''):
+                response.success = False
+                response.exception = fcm_error('UNAVAILABLE', '키워드 토픽 일시적 오류')
+        return batch
+
+def test_partial_send_retries_only_failed_target(store):
+    register_keywords(store, 'LH', '행복주택')
+    state_store.outbox_add([('a', '행복주택 공모', 'https://example.invalid/a', 'LH')])
+
+    main.set_fcm_transport(KeywordTopicsDown())
+    assert main.flush_notifications() == (1, 1)
+    [left] = state_store.outbox_pending()
+    assert left['sent'] == {main.BROADCAST_TARGET}
+    assert left['attempts'] == 1
+
+    fcm = FakeMessaging()
+    main.set_fcm_transport(fcm)
+    assert main.flush_notifications() == (1, 0)
+    assert [message.topic for message in fcm.sent] == [keyword_topic('LH', '행복주택')]
+    assert state_store.outbox_pending() == []
+
+def test_non_retryable_target_is_given_up_alone(store):
+    class Fatal(FakeMessaging):
+        def send_each(self, messages, dry_run=False):
+            batch = super().send_each(messages, dry_run)
+            for message, response in zip(messages, batch.responses):
+                if message.topic and message.topic.startswith('kw_'):
+                    response.success = False
+                    response.exception = fcm_error('INVALID_ARGUMENT', '잘못된 토픽')
+            return batch
+
+    register_keywords(store, 'LH', '행복주택')
+    state_store.outbox_add([('a', '행복주택 공모', 'https://example.invalid/a', 'LH')])
+    main.set_fcm_transport(Fatal())
+    assert main.flush_notifications() == (1, 1)
+    assert state_store.outbox_pending() == []
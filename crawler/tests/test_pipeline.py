@@ -0,0 +1,72 @@
+"""목록 페이지 watermark 멈춤"""
+import pytest
+
+import main
+import metrics
+import state_store
+
+def lh_page(numbers):
+    """LH 게시판 목록 페이지 (글 번호 목록, 맨 위에 번호 없는 고정 공지)"""
+    rows = ["<tr class='notice'><td>공지</td><td class='subject'><a href='/board.es?act=view&list_no=1'>운영기준</a>"
+            "</td><td>2024.03.04</td><td>1</td></tr>"]
+    for number in numbers:
+        rows.append(f"<tr><td>{number}</td><td class='subject'>"
+                    f"<a href='/board.es?mid={main.BOARD_MID}&bid={main.BOARD_BID}&act=view&list_no={number}'>"
+                    f"설계공모 {number}</a></td><td>2025.12.10</td><td>1</td></tr>")
+    return f"<table><tbody>{''.join(rows)}</tbody></table>"
+
+@pytest.fixture
+def lh_site(monkeypatch):
+    """LH 목록 페이지 번호 → 글 번호 목록을 돌려주는 가짜 fetch_page (요청한 URL을 기록)"""
+    pagination = main.SOURCES['LH']['pagination']
+    pages = {
+        main.SOURCES['LH']['url']: list(range(130, 120, -1)),
+        **{pagination['url'].format(page=page): list(range(130 - 10 * (page - 1), 120 - 10 * (page - 1), -1))
+           for page in range(2, 6)},
+    }
+    fetched = []
+
+    def fetch_page(url, timeout=main.HTTP_TIMEOUT, fallback_encoding=None, conditional=True, source=''):
+        fetched.append(url)
+        return lh_page(pages[url]), ({'etag': None, 'last_modified': None, 'body_hash': url} if conditional else None)
+
+    monkeypatch.setattr(main, 'fetch_page', fetch_page)
+    return fetched
+
+def test_first_run_reads_first_page_only(lh_site, store):
+    stats = main.crawl_source('LH')
+    assert lh_site == [main.SOURCES['LH']['url']]
+    assert stats['new'] == 11  # 고정 공지 포함
+    assert state_store.get_watermark('LH') == 130
+
+def test_stops_at_page_with_watermark(lh_site, store):
+    state_store.set_watermark('LH', 105)
+    stats = main.crawl_source('LH')
+    # 1페이지 130~121, 2페이지 120~111, 3페이지 110~101에서 watermark(105)에 닿음
+    assert len(lh_site) == 3
+    assert stats['pages'] == 3
+    assert stats['new'] == 31
+    assert state_store.get_watermark('LH') == 130
+    assert len(state_store.outbox_pending()) == 31
+
+def test_watermark_not_advanced_when_save_fails(lh_site, store, monkeypatch):
+    state_store.set_watermark('LH', 125)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('저장 실패')
+
+    monkeypatch.setattr(store, 'put_many', fail)
+    stats = main.crawl_source('LH')
+    assert stats['failed']
+    assert state_store.get_watermark('LH') == 125
+    assert state_store.outbox_pending() == []
+
+def test_page_limit_keeps_old_watermark(lh_site, store, monkeypatch):
+    monkeypatch.setitem(main.SOURCES['LH'], 'pagination', {**main.SOURCES['LH']['pagination'], 'max_pages': 2})
+    state_store.set_watermark('LH', 105)
+    stats = main.crawl_source('LH')
+    # 2페이지(120~111)까지만 읽어 110~106은 읽지 못함 → 다음 실행에서 다시 찾도록 watermark를 옮기지 않음
+    assert len(lh_site) == 2
+    assert stats['new'] == 21
+    assert state_store.get_watermark('LH') == 105
+    assert {c['name']: c['value'] for c in metrics.snapshot()['counters'] if c['source'] == 'LH'}['watermark_missed'] == 1
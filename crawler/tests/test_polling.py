@@ -0,0 +1,76 @@
+"""소스별 적응형 확인 주기와 하루 확인 횟수 상한"""
+import time
+
+import pytest
+
+import main
+import state_store
+
+def busy_history(source, now, days=2, gap=600):
+    """days일 동안 gap초마다 신규 글 1건이 올라온 기록"""
+    state_store.save_schedule(source, now - days * 86400, now - gap, gap, now)
+    for found_at in range(int(now - days * 86400), int(now), gap):
+        state_store.arrivals_add(source, found_at, 1)
+
+def test_poll_budget(monkeypatch):
+    monkeypatch.setattr(main, 'POLL_DAILY_BUDGET', 24)
+    others = [source for source in main.SOURCES if source != 'LH']
+    busy = {source: {'interval': 2 * 3600} for source in others}    # 다른 소스가 하루 36회
+    quiet = {source: {'interval': 24 * 3600} for source in others}  # 다른 소스가 하루 3회
+
+    # 다른 소스가 상한을 넘게 써도 균등 배분(24 / 4 = 하루 6회)은 보장
+    assert main.apply_poll_budget('LH', 3600, busy) == 4 * 3600
+    assert main.apply_poll_budget('LH', 3600, quiet) == pytest.approx(86400 / 21)
+    # 상한 안이면 계산된 주기 그대로
+    assert main.apply_poll_budget('LH', 6 * 3600, quiet) == 6 * 3600
+    monkeypatch.setattr(main, 'POLL_DAILY_BUDGET', 0)
+    assert main.apply_poll_budget('LH', 3600, busy) == 3600
+
+def quiet_others(source, now):
+    """다른 소스는 하루 한 번 확인"""
+    for other in main.SOURCES:
+        if other != source:
+            state_store.save_schedule(other, now - 86400, now, 86400, now + 86400)
+
+def test_busy_source_is_polled_at_min_interval():
+    now = time.time()
+    busy_history('LH', now)
+    quiet_others('LH', now)
+    # 평균 도착 간격 10분 × 0.5 → 최소 주기(예약 실행 간격 2시간)
+    assert main.record_poll('LH', 1, now) == main.POLL_MIN_INTERVAL
+    assert state_store.get_schedule('LH')['next_due'] == now + main.POLL_MIN_INTERVAL
+
+def test_busy_source_is_capped_by_daily_budget():
+    now = time.time()
+    busy_history('LH', now)
+    # 다른 소스가 기본 주기(4시간, 하루 18회)면 남은 횟수는 균등 배분(하루 6회)
+    assert main.record_poll('LH', 1, now) == 86400 / (main.POLL_DAILY_BUDGET / len(main.SOURCES))
+
+def test_first_poll_uses_default_interval():
+    now = time.time()
+    assert main.record_poll('KAMS', 30, now) == main.SOURCES['KAMS']['poll_interval']
+    # 처음 확인할 때 발견한 글은 도착 기록에 넣지 않음
+    assert state_store.arrivals_since('KAMS', 0) == []
+
+@pytest.fixture
+def daemon_defaults(monkeypatch):
+    """예약 실행 기본값에서 시작 (configure_daemon이 바꾼 값은 테스트 뒤 되돌림)"""
+    monkeypatch.setattr(main, 'POLL_MIN_INTERVAL', 2 * 3600)
+    monkeypatch.setattr(main, 'POLL_DAILY_BUDGET', 6 * len(main.SOURCES))
+    monkeypatch.setattr(main, 'POLL_BUDGET_FROM_ENV', False)
+
+def test_daemon_polls_busy_source_within_the_hour(daemon_defaults):
+    main.configure_daemon(15 * 60)
+    now = time.time()
+    busy_history('LH', now)
+    # 다른 소스가 기본 주기여도 데몬의 최소 주기(15분)로 확인
+    assert main.record_poll('LH', 1, now) == 15 * 60
+
+    quiet_others('LH', now)
+    assert main.record_poll('LH', 1, now + 60) == 15 * 60
+
+def test_daemon_keeps_explicit_budget(daemon_defaults, monkeypatch):
+    monkeypatch.setattr(main, 'POLL_BUDGET_FROM_ENV', True)
+    main.configure_daemon(15 * 60)
+    assert main.POLL_DAILY_BUDGET == 6 * len(main.SOURCES)
+    assert main.POLL_MIN_INTERVAL == 15 * 60
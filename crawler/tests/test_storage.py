@@ -0,0 +1,70 @@
+"""저장소 백엔드 (SQLite 왕복, 다른 실행과 동시에 써도 피드 항목이 빠지지 않음)"""
+from datetime import datetime, timezone
+from functools import partial
+
+import main
+import storage
+from date_parser import date_fields
+from fakes import FakeFirestore
+
+def notice(number, date='2025.12.10'):
+    link = f'https://www.lh.or.kr/board.es?act=view&list_no={number}'
+    return {'number': str(number), 'title': f'공고 {number}', 'date': date, 'link': link, 'source': 'LH',
+            **date_fields(date)}
+
+def feed_items(*numbers):
+    now = datetime.now(timezone.utc)
+    return [main.feed_item(f'd{n}', f'https://example.invalid/{n}', {'title': f'공고 {n}', 'date': f'2025.12.{n:02d}'},
+                           now) for n in numbers]
+
+def test_sqlite_round_trip(store):
+    store.put_many('LH', {'d1': notice(1), 'd2': notice(2, '날짜 없음')})
+    assert store.exists_many(['d1', 'd2', 'd3'], 'LH') == {'d1', 'd2'}
+    assert store.count('LH') == 2 and store.count('KAMS') == 0
+
+    saved = dict(store.iter_notices())
+    assert saved['d1']['date_at'] == notice(1)['date_at']
+    assert saved['d1']['date_at'].tzinfo is not None
+    assert saved['d2']['date_start'] is None
+    assert isinstance(saved['d1']['created_at'], datetime)
+    assert dict(store.iter_notices(fields=['title'])) == {'d1': {'title': '공고 1'}, 'd2': {'title': '공고 2'}}
+
+def test_sqlite_feed_merges_with_current_items(tmp_path):
+    store = storage.SQLiteStorage(str(tmp_path / 'feed.sqlite3'))
+    other = storage.SQLiteStorage(str(tmp_path / 'feed.sqlite3'))  # 같은 파일을 쓰는 다른 실행
+    try:
+        store.put_many('LH', {'d1': notice(1)}, partial(main.merge_feed, new_items=feed_items(1)))
+        other.update_feed('LH', partial(main.merge_feed, new_items=feed_items(3, 2)))
+        store.update_feed('LH', partial(main.merge_feed, new_items=feed_items(2, 4), size=3))
+        feed = store.get_feed('LH')
+        assert [item['id'] for item in feed] == ['d4', 'd3', 'd2']
+        assert isinstance(feed[0]['date_at'], datetime)
+        assert store.get_feed('KAMS') == []
+    finally:
+        store.close()
+        other.close()
+
+def test_firestore_feed_write_retries_after_concurrent_change():
+    db = FakeFirestore()
+    first = storage.FirestoreStorage(db)
+    second = storage.FirestoreStorage(db)
+    first.update_feed('LH', partial(main.merge_feed, new_items=feed_items(1)))
+
+    def interleaved(items):
+        # 이 실행이 피드를 읽은 뒤 다른 실행이 먼저 씀 → 조건부 쓰기가 실패하고 다시 읽어 합침
+        if not any(item['id'] == 'd2' for item in items) and not interleaved.done:
+            interleaved.done = True
+            second.update_feed('LH', partial(main.merge_feed, new_items=feed_items(2)))
+        return main.merge_feed(items, feed_items(3))
+    interleaved.done = False
+
+    first.put_many('LH', {'d3': notice(3)}, interleaved)
+    assert [item['id'] for item in first.get_feed('LH')] == ['d3', 'd2', 'd1']
+    assert first.exists_many(['d3', 'd4']) == {'d3'}
+
+def test_new_notices_update_the_source_feed(store, monkeypatch):
+    monkeypatch.setattr(main, 'FEED_SIZE', 2)
+    rows = [{'number': str(n), 'title': f'공고 {n}', 'date': f'2025.12.{n:02d}',
+             'link': f'https://www.lh.or.kr/board.es?act=view&list_no={n}'} for n in (3, 1, 2)]
+    assert main.check_and_save_batch(store, rows, 'LH') == 3
+    assert [item['title'] for item in store.get_feed('LH')] == ['공고 3', '공고 2']